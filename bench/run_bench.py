@@ -0,0 +1,302 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+Download benchmarks for NBrouser and the MinecraftServer provisioning paths.
+
+Everything runs against `bench.standin` started as a child process (so its
+CPU time is not counted), without touching the real network.
+
+    python -m bench.run_bench                  # full run, JSON on stdout
+    python -m bench.run_bench --quick --out bench_output.json
+
+Each result records wall time, throughput, time-to-first-byte, client CPU
+seconds per MB and whether the downloaded bytes are correct.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import pathlib
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import nhostapi  # noqa: E402
+from bench import standin  # noqa: E402
+from utility.NBrouser import NBrouser  # noqa: E402
+from utility.PaperIndex import PaperIndex  # noqa: E402
+
+MB = 1024 * 1024
+
+
+@contextlib.contextmanager
+def standin_server() -> Iterator[str]:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "bench.standin"],
+        cwd=str(ROOT),
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        port = int(proc.stdout.readline())
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+@contextlib.contextmanager
+def scratch_dir() -> Iterator[pathlib.Path]:
+    """Temporary working directory; MinecraftServer uses cwd-relative paths."""
+    old = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="nhost-bench-") as tmp:
+        os.chdir(tmp)
+        try:
+            yield pathlib.Path(tmp)
+        finally:
+            os.chdir(old)
+
+
+def server_stats(base: str) -> Dict[str, int]:
+    with urllib.request.urlopen(f"{base}/_stats") as reply:
+        return json.loads(reply.read())
+
+
+def sha256_file(path: os.PathLike | str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as stream:
+        for chunk in iter(lambda: stream.read(MB), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def measure(fn: Callable[[Callable[[int, Optional[int]], None]], Any], size: int) -> Dict[str, Any]:
+    """Run `fn(on_progress)` and collect timing, TTFB and CPU figures."""
+    first_byte: List[float] = []
+
+    def on_progress(written: int, total: Optional[int]) -> None:
+        if not first_byte:
+            first_byte.append(time.perf_counter())
+
+    cpu0 = time.process_time()
+    t0 = time.perf_counter()
+    fn(on_progress)
+    wall = time.perf_counter() - t0
+    cpu = time.process_time() - cpu0
+
+    return {
+        "bytes": size,
+        "wall_s": round(wall, 4),
+        "throughput_mb_s": round(size / MB / wall, 2) if wall > 0 else None,
+        "ttfb_s": round(first_byte[0] - t0, 4) if first_byte else None,
+        "cpu_s_per_mb": round(cpu / (size / MB), 5) if size else None,
+    }
+
+
+# --- Scenarios ---
+
+def bench_download(base: str, name: str, size: int, query: str, **download_kwargs: Any) -> Dict[str, Any]:
+    url = f"{base}/blob/{name}.bin?size={size}&{query}"
+    expected = hashlib.sha256(standin.payload(size)).hexdigest()
+
+    with scratch_dir() as tmp:
+        browser = NBrouser()
+        destination = tmp if "cd=1" in query else tmp / f"{name}.bin"
+        result: Dict[str, Any] = {}
+
+        def run(on_progress):
+            result.update(browser.download(
+                url, destination, progress="none", on_progress=on_progress, **download_kwargs
+            ))
+
+        stats = measure(run, size)
+        stats["correct"] = sha256_file(result["path"]) == expected
+        stats["file"] = result["path"].name
+
+    return {"scenario": f"download/{name}", "query": query, **download_kwargs, **stats}
+
+
+def bench_resume(base: str, size: int, segments: int) -> Dict[str, Any]:
+    # Cut inside the first response: one segment, or 40% of a single stream
+    drop = size // (4 * segments) if segments > 1 else size * 2 // 5
+    drop_id = f"resume-{segments}-{time.time_ns()}"
+    url = f"{base}/blob/resume.bin?size={size}&drop={drop}&drop_id={drop_id}"
+    expected = hashlib.sha256(standin.payload(size)).hexdigest()
+
+    with scratch_dir() as tmp:
+        browser = NBrouser()
+        target = tmp / "resume.bin"
+        before = server_stats(base)["bytes_sent"]
+
+        interrupted = False
+        try:
+            browser.download(url, target, progress="none", segments=segments)
+        except Exception:
+            interrupted = True
+
+        # A segmented download retries the dropped range in place
+        t0 = time.perf_counter()
+        if interrupted:
+            browser.download(url, target, progress="none", segments=segments)
+        wall = time.perf_counter() - t0
+
+        sent = server_stats(base)["bytes_sent"] - before
+        correct = sha256_file(target) == expected
+
+    return {
+        "scenario": f"resume/segments={segments}",
+        "bytes": size,
+        "interrupted": interrupted,
+        "resume_wall_s": round(wall, 4),
+        "bytes_sent_total": sent,
+        "refetch_overhead": round(sent / size - 1, 4),
+        "correct": correct,
+    }
+
+
+def bench_ensure_downloaded(base: str, count: int, size: int, latency: float, workers: int) -> Dict[str, Any]:
+    files = [
+        (f"plugin{i}.jar", f"{base}/blob/plugin{i}.jar?size={size + i}&latency={latency}")
+        for i in range(count)
+    ]
+
+    with scratch_dir():
+        server = nhostapi.MinecraftServer(
+            {"world_name": "bench", "download_workers": workers}, "java -jar server.jar"
+        )
+        outcome: Dict[str, Any] = {}
+
+        def run(_on_progress):
+            paths, errors = server.ensure_downloaded_parallel(
+                download_dir="plugins", files=files, show_progress=False
+            )
+            outcome["paths"], outcome["errors"] = paths, errors
+
+        stats = measure(run, sum(size + i for i in range(count)))
+        stats.pop("ttfb_s")
+        stats["correct"] = not outcome["errors"] and all(
+            sha256_file(path) == hashlib.sha256(standin.payload(size + i)).hexdigest()
+            for i, path in enumerate(outcome["paths"])
+        )
+
+    return {
+        "scenario": f"ensure_downloaded/workers={workers}",
+        "files": count,
+        "latency_s": latency,
+        **stats,
+    }
+
+
+def bench_ensure_java(base: str) -> Dict[str, Any]:
+    os_name = "windows" if platform.system().lower().startswith("win") else "linux"
+    original = nhostapi.JAVA_DOWNLOADS[21][os_name]
+    nhostapi.JAVA_DOWNLOADS[21][os_name] = f"{base}/jre.tar.gz"
+    size = len(standin.jre_archive())
+
+    try:
+        with scratch_dir():
+            server = nhostapi.MinecraftServer({"world_name": "bench"}, "java -jar server.jar")
+            outcome: Dict[str, Any] = {}
+
+            def run(_on_progress):
+                outcome["java"] = server.ensure_java(21)
+
+            with contextlib.redirect_stdout(sys.stderr):
+                stats = measure(run, size)
+            stats.pop("ttfb_s")
+            modules = pathlib.Path("javas/java21/lib/modules")
+            stats["correct"] = (
+                modules.is_file()
+                and sha256_file(modules) == hashlib.sha256(standin.payload(4 * MB)).hexdigest()
+            )
+    finally:
+        nhostapi.JAVA_DOWNLOADS[21][os_name] = original
+
+    return {"scenario": "ensure_java", **stats}
+
+
+def bench_check_or_download_version(base: str) -> Dict[str, Any]:
+    original = PaperIndex.API_BASE
+    PaperIndex.API_BASE = f"{base}/paper/v2/projects"
+
+    try:
+        with scratch_dir():
+            server = nhostapi.MinecraftServer(
+                {"world_name": "bench", "version": standin.PAPER_VERSION}, "java -jar server.jar"
+            )
+            outcome: Dict[str, Any] = {}
+
+            def run(_on_progress):
+                outcome["jar"] = server.check_or_download_version()
+
+            with contextlib.redirect_stdout(sys.stderr):
+                stats = measure(run, standin.PAPER_JAR_SIZE)
+            stats.pop("ttfb_s")
+            stats["correct"] = (
+                sha256_file(outcome["jar"])
+                == hashlib.sha256(standin.payload(standin.PAPER_JAR_SIZE)).hexdigest()
+            )
+    finally:
+        PaperIndex.API_BASE = original
+
+    return {"scenario": "check_or_download_version", **stats}
+
+
+def run_all(base: str, quick: bool) -> List[Dict[str, Any]]:
+    size = (8 if quick else 64) * MB
+    slow = f"bw={(16 if quick else 32) * MB}"
+
+    results = [
+        bench_download(base, "plain", size, "range=1"),
+        bench_download(base, "no-range", size, "range=0"),
+        bench_download(base, "content-disposition", size, "cd=1"),
+        bench_download(base, "latency", size, "latency=0.1"),
+        bench_download(base, "bandwidth", size, slow),
+        bench_download(base, "bandwidth-segmented", size, slow, segments=4),
+        bench_resume(base, size, segments=1),
+        bench_resume(base, size, segments=4),
+        bench_ensure_downloaded(base, 8, MB, 0.1, workers=1),
+        bench_ensure_downloaded(base, 8, MB, 0.1, workers=4),
+        bench_check_or_download_version(base),
+        bench_ensure_java(base),
+    ]
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="NBrouser download benchmarks")
+    parser.add_argument("--quick", action="store_true", help="smaller payloads")
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    with standin_server() as base:
+        results = run_all(base, args.quick)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+
+    if args.out:
+        pathlib.Path(args.out).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
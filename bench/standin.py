@@ -0,0 +1,295 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+Local HTTP stand-in for the download benchmarks.
+
+Serves synthetic payloads whose behaviour is picked per request through the
+query string, so one server covers every scenario:
+
+    /blob/<name>?size=N      payload of N deterministic bytes
+        &range=0|1           honour Range requests (default 1)
+        &cd=0|1              send Content-Disposition (default 0)
+        &latency=S           delay before the first byte, seconds
+        &bw=B                throttle to B bytes per second
+        &drop=N&drop_id=X    close the socket after N bytes, once per X
+    /paper/...               minimal PaperMC v2 API (see PaperIndex)
+    /jre.tar.gz              small JRE-shaped archive for ensure_java
+    /repo.tar.gz, /repo.zip  this checkout as a GitHub-style tarball/zipball
+                             (for `update.py --archive-url`)
+    /_stats                  JSON counters: requests, bytes_sent
+
+Run standalone: `python -m bench.standin` prints the port on stdout.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import pathlib
+import random
+import re
+import sys
+import tarfile
+import threading
+import time
+import urllib.parse
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+# Not part of a GitHub archive: VCS data, caches and user data
+REPO_SKIP = {".git", "__pycache__", "servers", "versions", "plugins", "javas", ".logs", "artifacts", "snapshots"}
+
+PAPER_VERSION = "1.21.1"
+PAPER_BUILD = 7
+PAPER_JAR_SIZE = 8 * 1024 * 1024
+SEND_BLOCK = 64 * 1024
+
+_payload_cache: Dict[int, bytes] = {}
+_payload_lock = threading.Lock()
+
+
+def payload(size: int) -> bytes:
+    """Deterministic pseudo-random bytes, cached per size."""
+    with _payload_lock:
+        data = _payload_cache.get(size)
+        if data is None:
+            # Incompressible, so gzip'd archives keep a realistic size
+            data = random.Random(size).randbytes(size)
+            _payload_cache[size] = data
+        return data
+
+
+def jre_archive() -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        files = [
+            ("jdk-21.0.0+0-jre/bin/java", b"#!/bin/sh\necho standin\n", 0o755),
+            ("jdk-21.0.0+0-jre/lib/modules", payload(4 * 1024 * 1024), 0o644),
+            ("jdk-21.0.0+0-jre/release", b'JAVA_VERSION="21"\n', 0o644),
+        ]
+        for name, data, mode in files:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mode = mode
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def repo_archive(kind: str) -> bytes:
+    """REPO_ROOT packed like GitHub's tarball/zipball: one `<repo>-<sha>/` top folder."""
+    top = "NHostAPI-standin"
+    files = []
+    for dirpath, dirnames, filenames in os.walk(REPO_ROOT):
+        dirnames[:] = sorted(d for d in dirnames if d not in REPO_SKIP)
+        for name in sorted(filenames):
+            path = pathlib.Path(dirpath) / name
+            files.append((f"{top}/{path.relative_to(REPO_ROOT).as_posix()}", path))
+
+    buf = io.BytesIO()
+    if kind == "zip":
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name, path in files:
+                archive.write(path, name)
+    else:
+        with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+            for name, path in files:
+                tar.add(path, name)
+    return buf.getvalue()
+
+
+class StandinState:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.bytes_sent = 0
+        self.dropped: set[str] = set()
+        self._jre: Optional[bytes] = None
+
+    def jre(self) -> bytes:
+        with self.lock:
+            if self._jre is None:
+                self._jre = jre_archive()
+            return self._jre
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "StandinServer"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_HEAD(self) -> None:
+        self._serve(head=True)
+
+    def do_GET(self) -> None:
+        self._serve(head=False)
+
+    def _serve(self, head: bool) -> None:
+        state = self.server.state
+        with state.lock:
+            state.requests += 1
+
+        parsed = urllib.parse.urlsplit(self.path)
+        query = {k: v[-1] for k, v in urllib.parse.parse_qs(parsed.query).items()}
+        path = parsed.path
+
+        if path == "/_stats":
+            with state.lock:
+                body = json.dumps({"requests": state.requests, "bytes_sent": state.bytes_sent}).encode()
+            return self._send_simple(200, body, "application/json", head)
+
+        if path == f"/paper/v2/projects/paper/versions/{PAPER_VERSION}":
+            body = json.dumps({"builds": list(range(1, PAPER_BUILD + 1))}).encode()
+            return self._send_simple(200, body, "application/json", head)
+
+        if path.startswith("/paper/") and path.endswith(".jar"):
+            return self._send_payload(payload(PAPER_JAR_SIZE), path.rsplit("/", 1)[-1], query, head)
+
+        if path == "/jre.tar.gz":
+            return self._send_payload(state.jre(), "jre.tar.gz", query, head)
+
+        if path in ("/repo.tar.gz", "/repo.zip"):
+            kind = "zip" if path.endswith(".zip") else "tar"
+            return self._send_payload(repo_archive(kind), path[1:], query, head)
+
+        match = re.fullmatch(r"/blob/([\w.\-]+)", path)
+        if match:
+            size = int(query.get("size", 1024 * 1024))
+            return self._send_payload(payload(size), match.group(1), query, head)
+
+        self._send_simple(404, b"not found", "text/plain", head)
+
+    def _send_simple(self, status: int, body: bytes, content_type: str, head: bool) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _send_payload(self, data: bytes, name: str, query: Dict[str, str], head: bool) -> None:
+        ranges = query.get("range", "1") != "0"
+        etag = '"' + hashlib.sha256(data[:4096] + str(len(data)).encode()).hexdigest()[:16] + '"'
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        start, end = 0, len(data) - 1
+        status = 200
+        requested = self._parse_range(len(data)) if ranges else None
+        if self.headers.get("If-Range") not in (None, etag):
+            requested = None  # the client's partial copy is of another file
+        if requested == "invalid":
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{len(data)}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if requested:
+            start, end = requested
+            status = 206
+
+        latency = float(query.get("latency", 0))
+        if latency:
+            time.sleep(latency)
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/java-archive")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("ETag", etag)
+        if ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        if query.get("cd") == "1":
+            self.send_header("Content-Disposition", f'attachment; filename="{name}"')
+        self.end_headers()
+
+        if head:
+            return
+
+        self._write_body(data, start, end, query)
+
+    def _parse_range(self, size: int):
+        header = self.headers.get("Range")
+        if not header:
+            return None
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", header.strip())
+        if not match:
+            return None
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else size - 1
+        if start >= size or end < start:
+            return "invalid"
+        return start, min(end, size - 1)
+
+    def _write_body(self, data: bytes, start: int, end: int, query: Dict[str, str]) -> None:
+        state = self.server.state
+        bandwidth = float(query.get("bw", 0))
+        drop_after: Optional[int] = None
+        drop_id = query.get("drop_id")
+        if query.get("drop") and drop_id:
+            with state.lock:
+                if drop_id not in state.dropped:
+                    state.dropped.add(drop_id)
+                    drop_after = int(query["drop"])
+
+        sent = 0
+        began = time.monotonic()
+        view = memoryview(data)[start:end + 1]
+
+        while sent < len(view):
+            block = view[sent:sent + SEND_BLOCK]
+            if drop_after is not None and sent + len(block) > drop_after:
+                block = block[: max(0, drop_after - sent)]
+                self.wfile.write(block)
+                with state.lock:
+                    state.bytes_sent += len(block)
+                self.close_connection = True
+                self.connection.shutdown(2)
+                return
+
+            self.wfile.write(block)
+            sent += len(block)
+            with state.lock:
+                state.bytes_sent += len(block)
+
+            if bandwidth:
+                ahead = sent / bandwidth - (time.monotonic() - began)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int] = ("127.0.0.1", 0)) -> None:
+        super().__init__(address, StandinHandler)
+        self.state = StandinState()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def main() -> None:
+    server = StandinServer(("127.0.0.1", int(sys.argv[1]) if len(sys.argv) > 1 else 0))
+    print(server.server_address[1], flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
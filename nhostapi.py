@@ -15,23 +15,35 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>
 from __future__ import annotations
 
+import asyncio
 import os
 import platform
 import shutil
-import subprocess
-import threading
-import time
-import requests
 import yaml
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from packaging.version import Version
 from typing import (
         Any, Dict, Final, List, Optional, 
         Tuple, TypedDict ,Iterable
     )
 
-from utility.NBrouser import NBrouser
+from utility.ArchiveExtractor import ArchiveExtractor
+from utility.ArtifactStore import ArtifactStore
+from utility.CDSCache import CDSCache
+from utility.ConsolePipeline import ConsolePipeline
+from utility.FileLock import FileLock
+from utility.NBrouser import NBrouser, MultiProgress
+from utility.PaperclipCache import PaperclipCache
+from utility.PaperIndex import PaperIndex, PaperIndexError
+from utility.Pregenerator import Pregenerator, PregenError
+from utility.PluginManifest import PluginManifest
+from utility.Provisioner import Provisioner
+from utility.ReadyStamp import ReadyStamp
+from utility.Supervisor import Supervisor
+from utility.Trace import TRACER, traced
+from utility.VersionResolver import ResolverError, VersionResolver
+from utility.WorldSnapshot import SnapshotStore
 
 # --- Strong Typing for Configuration ---
 class ServerConfig(TypedDict, total=False):
@@ -48,22 +60,66 @@ class ServerConfig(TypedDict, total=False):
     view_distance: int
     java_address: str
     java_port: int
+    bedrock_port: int
+    metrics_port: Optional[int]
+    cds: bool
+    shared_paperclip: bool
+    pregen_radius: int
+    snapshot_interval: Optional[int]
+    snapshot_keep: int
     auth_type: str
     resource_pack_url: str
     resource_pack_hash: str
+    download_workers: int
+    cache_max_bytes: int
+    revalidate_ttl: Optional[int]
+    offline: bool
 
 
 # --- Constants & Mappings ---
-JAVA_MC_MAP: Final[Dict[int, Tuple[str, str]]] = {
-    8: ("1.8.0", "1.12"),
-    11: ("1.13", "1.16.5"),
-    16: ("1.17", "1.17.1"),
-    17: ("1.18", "1.20.4"),
-    21: ("1.20.5", "1.21.11"),
-}
+# Java runtime per Minecraft range (from, to, Java); PaperMC's published
+# minimum for a version can raise it, never lower it
+JAVA_MC_RANGES: Final[Tuple[Tuple[str, str, int], ...]] = (
+    ("1.8", "1.12.2", 8),
+    ("1.13", "1.16.5", 11),
+    ("1.17", "1.20.4", 17),
+    ("1.20.5", "1.21.11", 21),
+)
 
 LATEST_JAVA_LTS: Final[int] = 25
 
+DEFAULT_DOWNLOAD_WORKERS: Final[int] = 4
+
+# Parallel byte ranges used for the big Paper jar download
+LARGE_DOWNLOAD_SEGMENTS: Final[int] = 4
+
+# Shared content-addressed cache behind versions/, plugins/ and javas/
+ARTIFACTS_DIR: Final[str] = "artifacts"
+# "latest" URLs are revalidated (ETag / Last-Modified) once their cached
+# copy is older than this; `revalidate_ttl: None` turns revalidation off
+FLOATING_MAX_AGE: Final[int] = 24 * 60 * 60
+
+# Deduplicated world snapshots live in snapshots/<world>/
+SNAPSHOTS_DIR: Final[str] = "snapshots"
+DEFAULT_SNAPSHOT_KEEP: Final[int] = 24
+
+# ServerConfig keys used by NHostAPI itself, never written to server.properties
+INTERNAL_CONFIG_KEYS: Final[Tuple[str, ...]] = (
+    "world_name",
+    "version",
+    "download_workers",
+    "cache_max_bytes",
+    "revalidate_ttl",
+    "offline",
+    "bedrock_port",
+    "metrics_port",
+    "cds",
+    "shared_paperclip",
+    "pregen_radius",
+    "snapshot_interval",
+    "snapshot_keep",
+)
+
 JAVA_DOWNLOADS: Final[Dict[int, Dict[str, str]]] = {
     v: {
         "linux": f"https://api.adoptium.net/v3/binary/latest/{v}/ga/linux/x64/jre/hotspot/normal/eclipse",
@@ -99,6 +155,44 @@ CORE_PLUGINS_PLUS: Final[Dict[int, Tuple[str, str]]] = {
 }
 
 
+# Releases known to work, per plugin file, in order of preference. `java` is
+# the runtime a release needs; `from` / `to` bound the Minecraft versions.
+PLUGIN_COMPAT: Final[Dict[str, List[Dict[str, Any]]]] = {
+    "ViaVersion.jar": [
+        {"version": "5.7.0", "url": CORE_PLUGINS[1][1], "java": 17},
+        {
+            "version": "4.10.2",
+            "url": "https://github.com/ViaVersion/ViaVersion/releases/download/4.10.2/ViaVersion-4.10.2.jar",
+            "java": 8,
+        },
+    ],
+    "ViaBackwards.jar": [
+        {"version": "5.7.0", "url": CORE_PLUGINS[2][1], "java": 17},
+        {
+            "version": "4.10.2",
+            "url": "https://github.com/ViaVersion/ViaBackwards/releases/download/4.10.2/ViaBackwards-4.10.2.jar",
+            "java": 8,
+        },
+    ],
+    "ViaRewind.jar": [
+        {"version": "4.0.12", "url": CORE_PLUGINS[3][1], "java": 17},
+    ],
+    "Geyser-Spigot.jar": [
+        {"url": CORE_PLUGINS_PLUS[1][1], "java": 17, "from": "1.18"},
+    ],
+    "floodgate-spigot.jar": [
+        {"url": CORE_PLUGINS_PLUS[2][1], "java": 17, "from": "1.18"},
+    ],
+}
+
+# Modrinth projects consulted for releases beyond the ones pinned above
+MODRINTH_PROJECTS: Final[Dict[str, str]] = {
+    "ViaVersion.jar": "viaversion",
+    "ViaBackwards.jar": "viabackwards",
+    "ViaRewind.jar": "viarewind",
+}
+
+
 class MinecraftServer:
     def __init__(self, config: ServerConfig, command_to_run_jar_file: str) -> None:
         self.defaults: ServerConfig = {
@@ -114,6 +208,8 @@ class MinecraftServer:
         }
 
         self.config: ServerConfig = {**self.defaults, **config}
+        # Plugin releases are only resolved for a version the user chose, not the fallback
+        self.version_given: bool = bool(config.get("version"))
         self.command_to_run_jar_file: str = command_to_run_jar_file
 
         self.servers_dir: Path = Path("servers")
@@ -121,12 +217,63 @@ class MinecraftServer:
         self.plugins_cache: Path = Path("plugins")
         self.world_dir: Path = self.servers_dir / str(self.config["world_name"])
 
-        self.browser = NBrouser()
+        self.download_workers: int = max(
+            1, int(self.config.get("download_workers", DEFAULT_DOWNLOAD_WORKERS))
+        )
+        self.browser = NBrouser(
+            pool_size=max(self.download_workers, LARGE_DOWNLOAD_SEGMENTS)
+        )
+        # Offline: only cached jars, plugins and runtimes, no requests at all
+        self.offline: bool = bool(self.config.get("offline", False))
+        self.revalidate_ttl: Optional[int] = (
+            None if self.offline else self.config.get("revalidate_ttl", FLOATING_MAX_AGE)
+        )
+        self.artifacts = ArtifactStore(
+            ARTIFACTS_DIR,
+            max_bytes=int(
+                self.config.get("cache_max_bytes", ArtifactStore.DEFAULT_MAX_BYTES)
+            ),
+        )
+        self.paper_index = PaperIndex(
+            self.browser,
+            self.versions_dir / "paper_index.json",
+            offline=self.offline,
+        )
+        # Java runtime and plugin releases per Minecraft version
+        self.resolver = VersionResolver(
+            self.browser,
+            self.versions_dir / "compat_index.json",
+            java_ranges=JAVA_MC_RANGES,
+            available_java=JAVA_DOWNLOADS,
+            latest_java=LATEST_JAVA_LTS,
+            plugin_compat=PLUGIN_COMPAT,
+            modrinth_projects=MODRINTH_PROJECTS,
+            paper_index=self.paper_index,
+            ttl=self.revalidate_ttl,
+            offline=self.offline,
+        )
+        # Worlds get reflinks of cached jars where the filesystem allows; else
+        # server.jar is hardlinked (read-only to the JVM) and the rest copied
+        self.provisioner = Provisioner()
+        # Class-data-sharing archives, one per (jar, runtime, JVM flags)
+        self.cds = CDSCache(Path(ARTIFACTS_DIR) / "cds")
+        self._cds_finalize = None
+        # Command and jar of the last build, stamped for warm starts once booted
+        self._launch: Optional[Tuple[List[str], Path]] = None
+        # Built once and reused by pre-generation and the real boot
+        self._command: Optional[List[str]] = None
+        self.ready_stamp = ReadyStamp(self.world_dir)
+        # One patched Paper + libraries tree per build, shared by every world
+        self.paperclip = PaperclipCache(Path(ARTIFACTS_DIR) / "paperclip")
+        self.snapshots = SnapshotStore(
+            Path(SNAPSHOTS_DIR) / str(self.config["world_name"]), self.world_dir
+        )
 
         self._init_directories()
 
         self.jar_path: Optional[Path] = None
-        self.process: Optional[subprocess.Popen] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.console: Optional[ConsolePipeline] = None
 
     def _init_directories(self) -> None:
         for p in [
@@ -137,27 +284,46 @@ class MinecraftServer:
         ]:
             p.mkdir(parents=True, exist_ok=True)
 
+    @traced("paper.jar")
     def check_or_download_version(self) -> Path:
         """
         Ensure the PaperMC jar for the configured version exists.
-        Downloads it if missing, using NBrouser for safe, atomic download.
+        Resolves it through the artifact store, downloading only on a miss.
+        Another process resolving the same version is waited for, not raced.
         """
 
         version: str = str(self.config.get("version"))
-        jar_path: Path = self.versions_dir / f"paper-{version}.jar"
-
-        # Already downloaded
-        if jar_path.exists():
-            self.jar_path = jar_path
-            return jar_path
-
-        # Fetch latest build info
-        api_url = f"https://api.papermc.io/v2/projects/paper/versions/{version}"
+        jar_name: str = f"paper-{version}.jar"
+        jar_path: Path = self.versions_dir / jar_name
+
+        with FileLock(self.versions_dir / ".locks" / f"{jar_name}.lock", description=f"PaperMC {version}"):
+            self.artifacts.refresh()
+            return self._resolve_paper_jar(version, jar_name, jar_path)
+
+    def _resolve_paper_jar(self, version: str, jar_name: str, jar_path: Path) -> Path:
+        api_url = f"{PaperIndex.API_BASE}/paper/versions/{version}"
+
+        # Already in the store
+        digest = self.artifacts.find_by_name(jar_name)
+        if digest:
+            TRACER.annotate(cache="hit")
+            self.jar_path = self.artifacts.link(digest, jar_path)
+            return self.jar_path
+
+        # Downloaded before the store existed
+        if jar_path.is_file():
+            TRACER.annotate(cache="hit")
+            digest = self.artifacts.put(api_url, jar_name, jar_path, move=False)
+            self.jar_path = self.artifacts.link(digest, jar_path)
+            return self.jar_path
+
+        if self.offline:
+            raise RuntimeError(f"Offline mode: PaperMC {version} is not cached")
+
+        # Latest build from the local index (hits the API only when it is stale)
         try:
-            data = requests.get(api_url, timeout=10).json()
-            build = data["builds"][-1]
-            download_url = f"{api_url}/builds/{build}/downloads/paper-{version}-{build}.jar"
-        except Exception as e:
+            download_url, _ = self.paper_index.download(version)
+        except PaperIndexError as e:
             raise RuntimeError(f"Failed to fetch PaperMC build info: {e}")
 
         print(f"⬇ Downloading PaperMC {version}...")
@@ -165,30 +331,34 @@ class MinecraftServer:
         # Ensure versions directory exists
         self.versions_dir.mkdir(parents=True, exist_ok=True)
 
-        # Use NBrouser to download with progress and atomic tmp file
-        result = self.browser.download(
-            url=download_url,
-            destination=self.versions_dir,  # NBrouser treats this as directory
-            filename=f"paper-{version}.jar",
+        # NBrouser downloads into the store's staging area, then it is linked here
+        self.jar_path = self.artifacts.fetch(
+            self.browser,
+            download_url,
+            jar_name,
+            jar_path,
             show_progress=True,
+            segments=LARGE_DOWNLOAD_SEGMENTS,
         )
-
-        self.jar_path = result["path"]
+        TRACER.annotate(cache="miss", bytes=self.jar_path.stat().st_size)
         print(f"✔ PaperMC {version} downloaded to {self.jar_path}")
         return self.jar_path
 
+    @traced("setup_world")
     def setup_world(self) -> None:
         if not self.jar_path:
             self.check_or_download_version()
 
         if self.jar_path:
-            shutil.copy(self.jar_path, self.world_dir / "server.jar")
+            self.provisioner.place(self.jar_path, self.world_dir / "server.jar")
 
         with open(self.world_dir / "eula.txt", "w") as f:
             f.write("eula=true\n")
 
         props = {
-            k: v for k, v in self.config.items() if k not in ["world_name", "version"]
+            k: v
+            for k, v in self.config.items()
+            if k not in INTERNAL_CONFIG_KEYS
         }
         self.write_server_properties(props)
 
@@ -201,6 +371,7 @@ class MinecraftServer:
                 val = str(v).lower() if isinstance(v, bool) else str(v)
                 f.write(f"{k}={val}\n")
 
+    @traced("setup_geyser")
     def setup_geyser(self) -> None:
         geyser_config_path: Path = (
             self.world_dir / "plugins" / "Geyser-Spigot" / "config.yml"
@@ -219,7 +390,7 @@ class MinecraftServer:
             {
                 "enabled": True,
                 "address": "0.0.0.0",
-                "port": 19132,
+                "port": self.config.get("bedrock_port", 19132),
                 "motd1": self.config.get("motd", "GeyserMC Server"),
                 "motd2": self.config.get("world_name", "world"),
                 "auto-auth": False,
@@ -266,168 +437,463 @@ class MinecraftServer:
         resolved: list[Path] = []
 
         for name, url in files:
-            path = download_dir / name
-
-            if not path.exists():
-                print(f"⬇ Downloading {name}...")
-                result = self.browser.download(
-                    url=url,
-                    destination=download_dir,
-                    filename=name,
+            path = self._cached_artifact(name, url, download_dir)
+
+            if path is None:
+                if self.offline:
+                    raise RuntimeError(f"Offline mode: {name} is not cached")
+                if self.artifacts.entry(url, name):
+                    print(f"↻ Revalidating {name}...")
+                else:
+                    print(f"⬇ Downloading {name}...")
+                path = self.artifacts.fetch(
+                    self.browser,
+                    url,
+                    name,
+                    download_dir / name,
+                    max_age=self._max_age_for(url),
                     show_progress=show_progress,
                 )
-                path = result["path"]
 
             resolved.append(path)
 
         return resolved
 
+    def _max_age_for(self, url: str) -> Optional[int]:
+        """Pinned URLs never expire; floating "latest" ones are revalidated."""
+        return self.revalidate_ttl if "/latest/" in url else None
 
-    def safe_copy(self, src: Path, dst: Path, *, overwrite: bool = False) -> None:
-        """
-        Copy a file safely with Windows-lock tolerance.
-        """
-        src = Path(src)
-        dst = Path(dst)
+    def _cached_artifact(self, name: str, url: str, download_dir: Path) -> Optional[Path]:
+        """Link (name, url) into `download_dir` if the store has it, else None."""
+        view = download_dir / name
+        max_age = self._max_age_for(url)
 
-        if not src.exists():
-            raise FileNotFoundError(src)
+        digest = self.artifacts.lookup(url, name, max_age=max_age)
+        if digest:
+            with TRACER.span("artifact.link", file=name, cache="hit"):
+                return self.artifacts.link(digest, view)
 
-        if dst.exists() and not overwrite:
-            return
+        if max_age is None and view.is_file():
+            # Pre-store cache file: adopt it, no network needed
+            return self.artifacts.fetch(self.browser, url, name, view)
 
-        dst.parent.mkdir(parents=True, exist_ok=True)
+        return None
 
-        for _ in range(8):
-            try:
-                shutil.copy(src, dst)
-                return
-            except PermissionError:
-                time.sleep(0.25)
+    def ensure_downloaded_parallel(
+        self,
+        *,
+        download_dir: str | Path,
+        files: Iterable[Tuple[str, str]],
+        workers: Optional[int] = None,
+        show_progress: bool = True,
+    ) -> Tuple[list[Path], Dict[str, Exception]]:
+        """
+        Concurrent variant of `ensure_downloaded`.
+
+        Missing files are fetched by up to `workers` threads sharing the
+        pooled `self.browser` session. A failing file does not stop the
+        others; its exception is collected instead.
+
+        Returns (resolved paths in input order, {filename: error}).
+        """
+        download_dir = Path(download_dir)
+        download_dir.mkdir(parents=True, exist_ok=True)
+        workers = max(1, workers or self.download_workers)
+
+        # Links are recorded in the index once for the whole batch, not per file
+        with self.artifacts.batch():
+            files = list(files)
+            resolved: Dict[str, Path] = {}
+            missing: list[Tuple[str, str]] = []
+
+            for name, url in files:
+                path = self._cached_artifact(name, url, download_dir)
+                if path is not None:
+                    resolved[name] = path
+                else:
+                    missing.append((name, url))
+
+            errors: Dict[str, Exception] = {}
+
+            if missing and self.offline:
+                for name, _ in missing:
+                    errors[name] = RuntimeError("offline mode, not cached")
+                missing = []
+
+            if missing:
+                board = MultiProgress(len(missing)) if show_progress else None
+
+                def _fetch(name: str, url: str) -> Path:
+                    return self.artifacts.fetch(
+                        self.browser,
+                        url,
+                        name,
+                        download_dir / name,
+                        max_age=self._max_age_for(url),
+                        show_progress=False,
+                        on_progress=board.callback(name) if board else None,
+                    )
+
+                with ThreadPoolExecutor(max_workers=min(workers, len(missing))) as pool:
+                    futures = {
+                        pool.submit(_fetch, name, url): name for name, url in missing
+                    }
+                    for future in as_completed(futures):
+                        name = futures[future]
+                        try:
+                            resolved[name] = future.result()
+                        except Exception as e:
+                            errors[name] = e
+                        if board:
+                            board.finish(name, errors.get(name))
+
+                if board:
+                    board.close()
+
+            paths = [resolved[name] for name, _ in files if name in resolved]
+            return paths, errors
 
-        shutil.copy(src, dst)
+    def safe_copy(self, src: Path, dst: Path, *, overwrite: bool = False) -> None:
+        """
+        Place a cached file into a world with Windows-lock tolerance.
+        Reflinks where possible, else hardlinks server.jar and copies the
+        rest; skips files that already match.
+        """
+        self.provisioner.place(src, dst, overwrite=overwrite)
 
+    @traced("install_plugins")
     def install_plugins(
         self,
         extra_plugins: Optional[List[Tuple[str, str]]] = None,
         force_plus: bool = False,
     ) -> None:
+        """
+        Install the core plugins plus `extra_plugins` into the world. With
+        `extra_plugins` None (Quick Start, --supervise) the extras recorded
+        in the world's plugin manifest at Full Setup are kept.
+        """
         world_plugins = self.world_dir / "plugins"
         world_plugins.mkdir(parents=True, exist_ok=True)
 
         self.plugins_cache.mkdir(parents=True, exist_ok=True)
 
-        core = list(CORE_PLUGINS.values())
         plus = list(CORE_PLUGINS_PLUS.values())
+        core = list(CORE_PLUGINS.values()) + plus
+        manifest = PluginManifest(world_plugins)
+        if extra_plugins is None:
+            extra_plugins = manifest.extras
+            if extra_plugins is None:
+                # Manifest from before extras were kept: whatever is not core was one
+                core_names = {name for name, _ in core}
+                extra_plugins = [
+                    (name, entry["url"]) for name, entry in manifest.entries.items()
+                    if name not in core_names and entry.get("url")
+                ]
+        extra_plugins = list(extra_plugins)
+        files = core + extra_plugins
+
+        # Swap in releases that fit this version and runtime, drop the rest.
+        # Quick Start reuses the version chosen at Full Setup, never the
+        # built-in fallback; without either, plugins go in as listed.
+        mc_version = str(self.config["version"]) if self.version_given else manifest.mc_version
+        resolution = None
+        if mc_version:
+            try:
+                with TRACER.span("resolve_versions"):
+                    resolution = self.resolver.resolve(mc_version, files)
+            except ResolverError as e:
+                print(f"⚠ {e}; installing plugins as listed")
+                if not force_plus:
+                    files = [f for f in files if f not in plus]
+        if resolution is not None:
+            files = resolution.plugins
+            bedrock = {name for name, _ in plus}
+            for name, reason in resolution.skipped.items():
+                # Geyser/Floodgate are optional extras: leaving them out is silent
+                if name not in bedrock:
+                    print(f"⚠ Skipping plugin {name}: {reason}")
+            if force_plus:
+                files += [p for p in plus if p[0] in resolution.skipped]
+
+        if any(name == plus[0][0] for name, _ in files):
+            self.setup_geyser()
+
+        cached, errors = self.ensure_downloaded_parallel(
+            download_dir=self.plugins_cache,
+            files=files,
+        )
+
+        for name, error in errors.items():
+            print(f"⚠ Skipping plugin {name}: {error}")
+
+        self.sync_plugins(
+            world_plugins, files, cached, keep=errors, extras=extra_plugins, mc_version=mc_version
+        )
 
-        files = core
+    @traced("sync_plugins")
+    def sync_plugins(
+        self,
+        world_plugins: Path,
+        files: List[Tuple[str, str]],
+        cached: List[Path],
+        *,
+        keep: Iterable[str] = (),
+        extras: Optional[List[Tuple[str, str]]] = None,
+        mc_version: Optional[str] = None,
+    ) -> None:
+        """
+        Bring `world_plugins` in line with the cached jars through the world's
+        plugin manifest: only added or changed jars are placed and plugins
+        dropped from the list are removed. New jars are all staged before any
+        is renamed into place, and the manifest is written last, so an
+        interrupted sync is simply redone on the next run. `extras` and
+        `mc_version` are recorded as the world's chosen extra plugins and the
+        version their releases were resolved for.
+        """
+        paths = {path.name: path for path in cached}
+        wanted: Dict[str, Dict[str, Any]] = {}
+        for name, url in files:
+            if name not in paths:
+                continue
+            entry = self.artifacts.entry(url, name)
+            wanted[name] = {
+                "url": url,
+                "digest": entry["digest"] if entry else None,
+                "size": paths[name].stat().st_size,
+            }
+
+        manifest = PluginManifest(world_plugins)
+        diff = manifest.diff(wanted, keep=keep)
+
+        if diff.empty:
+            if (extras is not None and manifest.extras != list(extras)) or (
+                mc_version is not None and manifest.mc_version != mc_version
+            ):
+                manifest.record(wanted, diff, extras=extras, mc_version=mc_version)
+            print(f"✔ Plugins up to date ({len(diff.unchanged)} installed)")
+            return
 
+        staged = []
         try:
-            major_ver = float(str(self.config.get("version", "1.16")).rsplit(".", 1)[0])
-            if force_plus or major_ver >= 1.18:
-                files += plus
-                self.setup_geyser()
-        except (ValueError, IndexError):
-            pass
+            for name in diff.add + diff.update:
+                staged.append(self.provisioner.stage(paths[name], world_plugins / name))
+        except BaseException:
+            for placement in staged:
+                self.provisioner.discard(placement)
+            raise
+
+        for placement in staged:
+            self.provisioner.commit(placement)
+        for name in diff.remove:
+            (world_plugins / name).unlink(missing_ok=True)
+
+        manifest.record(wanted, diff, extras=extras, mc_version=mc_version)
+        print(f"✔ Plugins synced: {diff.summary()} | {self.provisioner.summary()}")
+
+    @traced("pregenerate")
+    def pregenerate(self, radius: Optional[int] = None, *, world: str = "world") -> Optional[Dict[str, Any]]:
+        """
+        Pre-generate chunks around spawn with Chunky before players join.
 
-        if extra_plugins:
-            files += list(extra_plugins)
+        `radius` defaults to the `pregen_radius` config key, or to the radius
+        of an unfinished earlier run, which is then resumed. Returns the
+        progress report, or None when there is nothing to do or the run
+        failed; a failed run keeps its state and is resumed next time.
+        """
+        pending = Pregenerator.pending(self.world_dir)
+        radius = radius or self.config.get("pregen_radius") or (pending or {}).get("radius")
+        if not radius:
+            return None
 
-        cached = self.ensure_downloaded(
-            self.browser,
-            download_dir=self.plugins_cache,
-            files=files,
-        )
+        plugins = self.world_dir / "plugins"
+        if not any(p.name.lower().startswith("chunky") for p in plugins.glob("*.jar")):
+            print("⚠ Skipping pre-generation: Chunky is not installed in this world")
+            return None
 
-        for path in cached:
-            self.safe_copy(path, world_plugins / path.name)
+        try:
+            return Pregenerator(self, int(radius), world=world).run()
+        except (PregenError, asyncio.TimeoutError) as e:
+            # Pre-generation is an optimization; the server starts without it
+            reason = str(e) or "timed out waiting for the server"
+            print(f"⚠ Pre-generation stopped ({reason}); it resumes on the next start")
+            return None
+
+    def snapshot(self, label: str = "") -> Dict[str, Any]:
+        """
+        Snapshot this world while the server is stopped. Running servers are
+        snapshotted by the Supervisor (`:snapshot`), which wraps the copy in
+        save-off / save-all flush / save-on.
+        """
+        report = self.snapshots.snapshot(label=label)
+        self.snapshots.prune(int(self.config.get("snapshot_keep", DEFAULT_SNAPSHOT_KEEP)))
+        return report
 
     def get_os_name(self)->str:
         return (
             "windows" if platform.system().lower().startswith("win") else "linux"
         )
     
+    @traced("ensure_java")
     def ensure_java(self, java_ver: int) -> str:
+        """
+        Install the Adoptium JRE for `java_ver` under javas/java<ver>.
+
+        The archive is unpacked while it downloads (tar.gz is streamed, zip is
+        spooled through the artifact store), the top-level folder is stripped
+        during extraction, and the finished tree is renamed into place so a
+        half-extracted runtime is never picked up. A lock file serializes
+        concurrent installs of the same version across processes.
+        """
         os_name = self.get_os_name()
         base_dir: Path = Path("javas") / f"java{java_ver}"
         java_bin: str = "bin/java.exe" if os_name == "windows" else "bin/java"
         java_path: Path = base_dir / java_bin
 
         if java_path.exists():
+            TRACER.annotate(cache="hit", java=java_ver)
             return str(java_path.absolute())
 
-        base_dir.mkdir(parents=True, exist_ok=True)
-        archive: Path = base_dir / "runtime_dl"
-
-        self.browser.download(JAVA_DOWNLOADS[java_ver][os_name], archive)
-
-        import tarfile
-        import zipfile
-
-        try:
-            with zipfile.ZipFile(archive) as z:
-                z.extractall(base_dir)
-        except zipfile.BadZipFile:
-            with tarfile.open(archive) as t:
-                t.extractall(base_dir)
-
-        archive.unlink()
-
-        inner_folder = next(base_dir.iterdir())
-        if inner_folder.is_dir():
-            for item in inner_folder.iterdir():
-                shutil.move(str(item), str(base_dir))
-            inner_folder.rmdir()
+        with FileLock(base_dir.parent / ".locks" / f"{base_dir.name}.lock", description=f"Java {java_ver}"):
+            # Whoever held the lock may have just installed it
+            if java_path.exists():
+                TRACER.annotate(cache="hit", java=java_ver)
+                return str(java_path.absolute())
+            self.artifacts.refresh()
+            self._install_java(java_ver, os_name, base_dir)
 
         return str(java_path.absolute())
 
+    def _install_java(self, java_ver: int, os_name: str, base_dir: Path) -> None:
+        java_url = JAVA_DOWNLOADS[java_ver][os_name]
+        name = f"jre{java_ver}-{os_name}"
+
+        staging_dir = base_dir.with_name(f".{base_dir.name}.partial")
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir)
+        staging_dir.mkdir(parents=True)
+
+        cached = self.artifacts.entry(java_url, name)
+        fresh = self.artifacts.lookup(java_url, name, max_age=self._max_age_for(java_url))
+
+        if self.offline and not cached:
+            shutil.rmtree(staging_dir)
+            raise RuntimeError(f"Offline mode: Java {java_ver} runtime is not cached")
+
+        if fresh or (self.offline and cached):
+            fresh = fresh or cached["digest"]
+            # Runtime archive is in the store: only the extraction is paid for
+            TRACER.annotate(cache="hit", java=java_ver)
+            with open(self.artifacts.blob_path(fresh), "rb") as source:
+                ArchiveExtractor.extract(source, staging_dir)
+        else:
+            print(f"⬇ Downloading and extracting Java {java_ver}...")
+            spool = self.artifacts.staging_path(java_url, name)
+            with self.browser.stream(
+                java_url, validators=cached.get("validators") if cached else None
+            ) as response:
+                if cached and response.status_code == 304:
+                    TRACER.annotate(cache="revalidated", java=java_ver)
+                    self.artifacts.touch(java_url, name)
+                    with open(self.artifacts.blob_path(cached["digest"]), "rb") as source:
+                        ArchiveExtractor.extract(source, staging_dir)
+                else:
+                    # Tee the stream into the store so the next install is offline
+                    with open(spool, "wb") as tee:
+                        ArchiveExtractor.extract(response.raw, staging_dir, tee=tee)
+                    TRACER.annotate(cache="miss", java=java_ver, bytes=spool.stat().st_size)
+                    self.artifacts.put(
+                        java_url,
+                        name,
+                        spool,
+                        validators=self.browser._extract_validators(response),
+                    )
+
+        if base_dir.exists():
+            shutil.rmtree(base_dir)
+        os.replace(staging_dir, base_dir)
+
     def mc_to_java(self, mc_version: str) -> int:
-        v = Version(mc_version)
-        for java, (start, end) in JAVA_MC_MAP.items():
-            if Version(start) <= v <= Version(end):
-                return java
-        highest_end = max(Version(end) for _, (_, end) in JAVA_MC_MAP.items())
-        return LATEST_JAVA_LTS if v > highest_end else 17
+        return self.resolver.java_for(mc_version)
 
     # Driver code: Doest not start my its self because It have never been called. 
 
-    def start(self) -> None:
+    @traced("build_command")
+    def build_command(self, extra_args: Iterable[str] = ()) -> List[str]:
+        """
+        The server command line with `java` resolved to the managed runtime,
+        plus `extra_args`. The runtime, Paperclip and CDS checks run on the
+        first call only; later launches reuse the result.
+        """
+        if self._command is None:
+            self._command = self._build_command()
+        return self._command + list(extra_args)
+
+    def _build_command(self) -> List[str]:
+        # Re-provisioned: the old stamp is stale until this command has booted
+        self.ready_stamp.clear()
         java_version_info: int = self.mc_to_java(str(self.config.get("version")))
         java_bin: str = self.ensure_java(java_version_info)
 
         command_to_run_jar_file_parts: List[str] = self.command_to_run_jar_file.split()
         command_to_run_jar_file_parts[0] = java_bin
 
-        # Setup for run as a process properly. 
-        # So if the this file process is killed then this will also killed with it
-        self.process = subprocess.Popen(
-            command_to_run_jar_file_parts,
-            cwd=str(self.world_dir),
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-        )
+        if "-jar" in command_to_run_jar_file_parts[:-1]:
+            jar_at = command_to_run_jar_file_parts.index("-jar")
+            jvm_flags = command_to_run_jar_file_parts[1:jar_at]
+            jar = self.world_dir / command_to_run_jar_file_parts[jar_at + 1]
+
+            launch = ["-jar", str(command_to_run_jar_file_parts[jar_at + 1])]
+            if self.config.get("shared_paperclip", True):
+                spec = self.paperclip.prepare(java_bin, jar)
+                if spec:
+                    launch = spec.args()
+
+            cds_options: List[str] = []
+            if self.config.get("cds", True):
+                cds_options, self._cds_finalize = self.cds.options(
+                    java_version_info, java_bin, jar, jvm_flags, launch
+                )
 
-        def _read_output() -> None:
-            if self.process and self.process.stdout:
-                for line in self.process.stdout:
-                    print(line, end="")
+            command_to_run_jar_file_parts[jar_at:jar_at + 2] = cds_options + launch
+            self._launch = (list(command_to_run_jar_file_parts), jar.absolute())
 
-        threading.Thread(target=_read_output, daemon=True).start()
+        return command_to_run_jar_file_parts
 
-        while self.process and self.process.poll() is None:
-            try:
-                user_input = input()
-                if user_input.lower() == "stop":
-                    self.process.stdin.write("stop\n")
-                    self.process.stdin.flush()
-                    break
-                self.process.stdin.write(user_input + "\n")
-                self.process.stdin.flush()
-            except (KeyboardInterrupt, EOFError):
-                if self.process.stdin:
-                    self.process.stdin.write("stop\n")
-                    self.process.stdin.flush()
-                break
\ No newline at end of file
+    def on_ready(self) -> None:
+        """
+        Called by the Supervisor (off the event loop) once the server reports
+        "Done": stamps the world so the next Quick Start can skip provisioning.
+        """
+        # A CDS recording boot is not reusable as-is; the next boot gets stamped
+        if self._launch is None or self._cds_finalize:
+            return
+        command, jar = self._launch
+        try:
+            self.ready_stamp.write(command, jar, snapshots=str(self.snapshots.root))
+        except OSError as e:
+            print(f"⚠ Could not write the warm-start stamp: {e}")
+
+    def after_exit(self, exit_code: int) -> None:
+        """Called by the Supervisor once the server process has exited."""
+        if self._cds_finalize:
+            self._cds_finalize(exit_code)
+            self._cds_finalize = None
+            # The recording boot is over: the next launch maps the archive instead
+            self._command = None
+
+    def start(self) -> None:
+        """
+        Run the server attached to this terminal until it stops.
+
+        A single-server Supervisor does the work: output goes through the
+        asyncio console pipeline (kept in `self.console`, logged under
+        .logs/servers/<world>/) and typed lines go to the server's stdin.
+        With `metrics_port` set, parsed metrics are served on localhost.
+        """
+        supervisor = Supervisor(metrics_port=self.config.get("metrics_port"))
+        supervisor.add(self, assign_port=False)
+        try:
+            supervisor.run()
+        except KeyboardInterrupt:
+            # serve() already sent "stop" and waited for the world to save
+            pass
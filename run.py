@@ -2,10 +2,20 @@
 #  Copyright (C) 2026 Nikhil Karmakar
 #  GNU GENERAL PUBLIC LICENSE v3
 
+import atexit
 import os
 import random
+import sys
 from pathlib import Path
-from nhostapi import MinecraftServer
+from typing import TYPE_CHECKING
+from utility.Pregenerator import Pregenerator
+from utility.ReadyStamp import ReadyStamp, WarmServer
+from utility.Supervisor import Supervisor
+from utility.Trace import TRACER
+
+# nhostapi pulls in requests and yaml; a warm Quick Start never imports it
+if TYPE_CHECKING:
+    from nhostapi import MinecraftServer
 
 def print_banner():
     print(r"""
@@ -22,6 +32,23 @@ def print_banner():
     print("by Nikhil Karmakar | GNU GENERAL PUBLIC LICENSE v3")
     print("Pre-Alpha v0.0.3\n")
 
+# `python run.py --offline` provisions only from cached jars and runtimes
+OFFLINE = "--offline" in sys.argv
+# `python run.py --supervise [world ...]` runs several worlds in this process
+SUPERVISE = "--supervise" in sys.argv
+# `--snapshot <world>` / `--restore <world> [id]` work on stopped worlds
+# `--metrics-port 9225` serves Prometheus metrics parsed from the console
+METRICS_PORT = (
+    int(sys.argv[sys.argv.index("--metrics-port") + 1])
+    if "--metrics-port" in sys.argv[:-1] else None
+)
+# `--trace [file.json]` times each provisioning and boot phase: a summary table
+# is printed once the server reports "Done", the Chrome trace goes to the file
+TRACE_PATH = None
+if "--trace" in sys.argv:
+    _after = sys.argv[sys.argv.index("--trace") + 1:][:1]
+    TRACE_PATH = _after[0] if _after and _after[0].endswith(".json") else str(Path(".logs") / "trace.json")
+
 MORE_PLUGINS = {
     1: ("EntityClearer.jar", "https://hangarcdn.papermc.io/plugins/Silverstone/EntityClearer/versions/4.1.3/PAPER/EntityClearer.jar"),
     2: ("TAB.jar", "https://cdn.modrinth.com/data/gG7VFbG0/versions/BQc9Xm3K/TAB%20v5.4.0.jar"),
@@ -89,7 +116,11 @@ def get_world_and_action(existing_worlds: list[str]) -> tuple[str, bool]:
     new_name = input("Enter new world name [my_new_world]: ").strip() or "my_new_world"
     return new_name, True
 
-def setup_server(config: dict) -> MinecraftServer:
+def setup_server(config: dict) -> "MinecraftServer":
+    from nhostapi import MinecraftServer
+
+    config.setdefault("offline", OFFLINE)
+    config.setdefault("metrics_port", METRICS_PORT)
     if "version" in config:
         max_ram = input("Max RAM [2G]: ").strip() or "2G"
     else:
@@ -98,6 +129,25 @@ def setup_server(config: dict) -> MinecraftServer:
     run_cmd = f"java -Xms1M -Xmx{max_ram} -XX:+UseG1GC -jar server.jar nogui --force"
     return MinecraftServer(config, run_cmd)
 
+def warm_start(world: str) -> bool:
+    """
+    Quick start straight from the world's ready stamp: no provisioning, no
+    network, no rewritten files. False when the stamp is missing or stale.
+    """
+    world_dir = Path("servers") / world
+    stamp = ReadyStamp(world_dir)
+    with TRACER.span("ready_stamp") as span:
+        command = stamp.check()
+        span.set(cache="hit" if command else "miss")
+    # An interrupted pre-generation is resumed by the normal path
+    if command is None or Pregenerator.pending(world_dir):
+        return False
+
+    print(f"\nStarting Minecraft Server: {world} (warm start)...")
+    config = {"world_name": world, "metrics_port": METRICS_PORT}
+    WarmServer(world_dir, stamp, command, config).start()
+    return True
+
 def select_plugins():
     print("\nAvailable Extra Plugins:")
     for idx, (name, _) in MORE_PLUGINS.items():
@@ -109,20 +159,79 @@ def select_plugins():
     except ValueError:
         return None
 
+def supervise(worlds: list[str]) -> None:
+    """Quick start several existing worlds under one supervisor."""
+    supervisor = Supervisor(metrics_port=METRICS_PORT)
+    for world in worlds:
+        print(f"\n Preparing: {world}...")
+        config = supervisor.allocate({"world_name": world, "revalidate_ttl": None})
+        server = setup_server(config)
+        server.install_plugins()
+        server.pregenerate()
+        supervisor.add(server)
+
+    print("\nConsole: '@world cmd', '@all cmd', ':use world', ':list', ':stopall'")
+    supervisor.run()
+
+def snapshot_tool(args: list[str]) -> None:
+    """Offline snapshot or restore of a stopped world."""
+    if not args:
+        print("⚠ Usage: --snapshot <world> | --restore <world> [snapshot id]")
+        return
+    server = setup_server({"world_name": args[0], "revalidate_ttl": None})
+
+    if "--restore" in sys.argv:
+        ids = server.snapshots.list()
+        snapshot_id = args[1] if len(args) > 1 else (ids[-1] if ids else None)
+        if snapshot_id not in ids:
+            print(f"⚠ No snapshot {snapshot_id} for {args[0]}. Available: {', '.join(ids) or 'none'}")
+            return
+        count = server.snapshots.restore(snapshot_id)
+        print(f"✔ Restored {args[0]} to snapshot {snapshot_id} ({count} files)")
+    else:
+        report = server.snapshot(label="manual")
+        print(f"✔ Snapshot {report['id']}: {report['changed']}/{report['files']} files changed, "
+              f"{report['new_bytes'] / 1024 / 1024:.1f} MB new")
+
 def main():
     print_banner()
+
+    if TRACE_PATH:
+        TRACER.enable(TRACE_PATH)
+        atexit.register(TRACER.flush)
+
+    for flag in ("--snapshot", "--restore"):
+        if flag in sys.argv:
+            snapshot_tool(sys.argv[sys.argv.index(flag) + 1:])
+            return
+
+    if SUPERVISE:
+        existing_worlds = check_existing_worlds()
+        args = sys.argv[sys.argv.index("--supervise") + 1:]
+        worlds = [w for w in args if not w.startswith("--") and not w.isdigit()] or existing_worlds
+        missing = [w for w in worlds if w not in existing_worlds]
+        if missing:
+            print(f"⚠ Not set up yet (run a Full Setup first): {', '.join(missing)}")
+        supervise([w for w in worlds if w in existing_worlds])
+        return
+
     existing_worlds = check_existing_worlds()
     
     # Corrected function call
     selected_world, should_configure = get_world_and_action(existing_worlds)
 
+    if not should_configure and warm_start(selected_world):
+        return
+
     if not should_configure:
-        config = {"world_name": selected_world}
+        # Quick start trusts the cached "latest" plugins: no revalidation requests
+        config = {"world_name": selected_world, "revalidate_ttl": None}
         print(f"\n Quick Starting: {selected_world}...")
-        server = setup_server(config)
+        with TRACER.span("setup_server"):
+            server = setup_server(config)
         
-        # This ensures Core and Core+ plugins are checked/installed automatically
-        server.install_plugins() 
+        # Core and Core+ plugins plus the extras chosen at Full Setup
+        server.install_plugins()
     else:
         # FULL CONFIG PATH
         print(f"\n⚙️ Configuring: {selected_world}...")
@@ -139,7 +248,21 @@ def main():
         
         # Install Core + Core+ + User Selected Plugins
         extra_plugins = select_plugins()
-        server.install_plugins(extra_plugins)
+
+        # Optional Chunky pre-generation before players join
+        radius = get_safe_int("Pre-generate radius in blocks (0 = skip)", 0)
+        if radius:
+            server.config["pregen_radius"] = radius
+            chunky = MORE_PLUGINS[7]
+            extra_plugins = extra_plugins or []
+            if chunky not in extra_plugins:
+                extra_plugins.append(chunky)
+
+        # An explicit list, so extras left out this time are removed
+        server.install_plugins(extra_plugins or [])
+
+    # Runs the configured radius, or resumes an interrupted one on Quick Start
+    server.pregenerate()
 
     print(f"\nStarting Minecraft Server: {selected_world}...")
     server.start()
@@ -0,0 +1,162 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+Archive mode of update.py against the local stand-in server: tar and zip
+installs into a temporary tree, user data left alone, and a swap cut
+short (killed or interrupted) rolled back.
+"""
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import threading
+
+import pytest
+
+import update
+from bench.standin import REPO_ROOT, StandinServer
+
+# One file per PRESERVED area that must come through an update untouched
+USER_DATA = {
+    "servers/world/level.dat": b"level",
+    "versions/paper-1.21.1-7.jar": b"paper",
+    "plugins/Chunky.jar": b"chunky",
+    "javas/java21/release": b'JAVA_VERSION="21"\n',
+    ".logs/keep.log": b"log",
+}
+
+
+@pytest.fixture(scope="module")
+def standin():
+    server = StandinServer()
+    # The killed-update test drops its connection mid-body; that is expected
+    server.handle_error = lambda request, address: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.base_url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def install(tmp_path, monkeypatch):
+    """An older install with user data and one file upstream has since dropped."""
+    for rel, data in USER_DATA.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    (tmp_path / "version.txt").write_text("0.0.1\n")
+    (tmp_path / "run.py").write_text("old\n")
+    (tmp_path / "utility").mkdir()
+    (tmp_path / "utility" / "Removed.py").write_text("old\n")
+    (tmp_path / update.MANIFEST_FILE).write_text(
+        json.dumps({"files": {"run.py": "", "utility/Removed.py": "", "version.txt": ""}})
+    )
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _assert_user_data(root: pathlib.Path) -> None:
+    for rel, data in USER_DATA.items():
+        assert (root / rel).read_bytes() == data, rel
+
+
+def _assert_old_tree(root: pathlib.Path) -> None:
+    assert (root / "version.txt").read_text() == "0.0.1\n"
+    assert (root / "run.py").read_text() == "old\n"
+    assert (root / "utility" / "Removed.py").is_file()
+    assert not (root / "nhostapi.py").exists()
+
+
+def _assert_no_leftovers(root: pathlib.Path) -> None:
+    for name in (update.STAGING_DIR, update.BACKUP_DIR, update.SWAP_JOURNAL):
+        assert not (root / name).exists(), name
+
+
+@pytest.mark.parametrize("url, content_type, expected", [
+    ("https://api.github.com/repos/o/r/tarball/master", "application/x-gzip", False),
+    ("https://api.github.com/repos/o/r/tarball/master", "application/gzip", False),
+    ("https://api.github.com/repos/o/r/zipball/master", "", True),
+    ("https://example.com/build", "application/zip; charset=binary", True),
+    ("https://example.com/build.zip", "application/octet-stream", True),
+])
+def test_archive_format(url, content_type, expected):
+    assert update._is_zip(url, content_type, False) is expected
+
+
+@pytest.mark.parametrize("archive", ["repo.tar.gz", "repo.zip"])
+def test_archive_install(standin, install, archive):
+    update.perform_archive_update(f"{standin}/{archive}")
+
+    assert (install / "version.txt").read_bytes() == (REPO_ROOT / "version.txt").read_bytes()
+    assert (install / "run.py").read_bytes() == (REPO_ROOT / "run.py").read_bytes()
+    assert (install / "utility" / "ArtifactStore.py").is_file()
+    assert not (install / "utility" / "Removed.py").exists()
+    _assert_user_data(install)
+    _assert_no_leftovers(install)
+
+    manifest = update.load_manifest()
+    assert manifest["update.py"] == update.git_blob_sha("update.py")
+
+
+def test_bad_archive_changes_nothing(standin, install):
+    with pytest.raises(Exception):
+        update.perform_archive_update(f"{standin}/missing.tar.gz")
+
+    _assert_old_tree(install)
+    _assert_user_data(install)
+    _assert_no_leftovers(install)
+
+
+def test_interrupted_swap_rolls_back(standin, install, monkeypatch):
+    real_replace = os.replace
+    renames = []
+
+    def interrupt(src, dst):
+        if not str(dst).startswith(update.SWAP_JOURNAL):
+            renames.append(dst)
+            if len(renames) == 3:
+                raise KeyboardInterrupt
+        real_replace(src, dst)
+
+    monkeypatch.setattr(update.os, "replace", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        update.perform_archive_update(f"{standin}/repo.tar.gz")
+
+    _assert_old_tree(install)
+    _assert_user_data(install)
+    _assert_no_leftovers(install)
+
+
+def test_killed_swap_recovered_on_next_run(standin, install):
+    # A real crash: the process dies between two renames, no cleanup runs
+    script = (
+        "import os, update\n"
+        "real, renames = os.replace, []\n"
+        "def crash(src, dst):\n"
+        "    if not str(dst).startswith(update.SWAP_JOURNAL):\n"
+        "        renames.append(dst)\n"
+        "        if len(renames) == 3:\n"
+        "            os._exit(9)\n"
+        "    real(src, dst)\n"
+        "update.os.replace = crash\n"
+        f"update.perform_archive_update({standin + '/repo.tar.gz'!r})\n"
+    )
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    result = subprocess.run([sys.executable, "-c", script], cwd=install, env=env)
+    assert result.returncode == 9
+    assert (install / update.SWAP_JOURNAL).is_file()
+
+    update.recover_interrupted_swap()
+    _assert_old_tree(install)
+    _assert_user_data(install)
+    assert not (install / update.BACKUP_DIR).exists()
+    assert not (install / update.SWAP_JOURNAL).exists()
+
+    update.perform_archive_update(f"{standin}/repo.tar.gz")
+    assert (install / "version.txt").read_bytes() == (REPO_ROOT / "version.txt").read_bytes()
+    _assert_user_data(install)
+    _assert_no_leftovers(install)
@@ -16,12 +16,21 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import os
+import shutil
 import sys
+import tarfile
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Any, Final, List, Optional, Tuple
+from typing import Any, Dict, Final, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # --- Configuration (Strongly Typed Constants) ---
 REPO_OWNER: Final[str] = "Karnikhil90"
@@ -36,6 +45,25 @@ RAW_BASE_URL: Final[str] = (
     f"https://raw.githubusercontent.com/{REPO_OWNER}/{REPO_NAME}/{BRANCH}"
 )
 VERSION_FILE_NAME: Final[str] = "version.txt"
+# Whole branch or tag as one download: .../tarball/<ref> or .../zipball/<ref>
+ARCHIVE_API_URL: Final[str] = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}"
+
+# Files last synced from GitHub (path -> blob SHA); only these are ever deleted
+MANIFEST_FILE: Final[str] = ".nhost-update.json"
+UPDATE_WORKERS: Final[int] = 8
+CHUNK_SIZE: Final[int] = 64 * 1024
+
+# Archive mode unpacks here, then swaps entries into place one rename each
+STAGING_DIR: Final[str] = ".update-staging"
+BACKUP_DIR: Final[str] = ".update-backup"
+# Entries being swapped; while it exists an interrupted swap is rolled back
+SWAP_JOURNAL: Final[str] = ".update-swap.json"
+# Never replaced or removed by an update
+PRESERVED: Final[Tuple[str, ...]] = (
+    "servers", "versions", "plugins", "javas", ".logs",
+    "artifacts", "snapshots", ".git", "setup_done.txt",
+    MANIFEST_FILE, STAGING_DIR, BACKUP_DIR, SWAP_JOURNAL,
+)
 
 # Local Paths
 LOG_DIR: Final[str] = ".logs"
@@ -57,10 +85,23 @@ def log_update(message: str) -> None:
     print(line)
 
 
+def make_session() -> requests.Session:
+    """One keep-alive session for every request of an update run."""
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=UPDATE_WORKERS, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+SESSION: Final[requests.Session] = make_session()
+
+
 def get_remote_version() -> str:
     """Fetch the version string from GitHub with error handling."""
     url: str = f"{RAW_BASE_URL}/{VERSION_FILE_NAME}"
-    response: requests.Response = requests.get(url, timeout=10)
+    response: requests.Response = SESSION.get(url, timeout=10)
     response.raise_for_status()
     return response.text.strip()
 
@@ -76,12 +117,41 @@ def get_local_version() -> Optional[str]:
         return None
 
 
-def download_file(relative_path: str, raw_url: str) -> None:
+def git_blob_sha(path: str) -> Optional[str]:
+    """SHA-1 git gives a file's content ("blob <size>\\0" + data), None if missing."""
+    try:
+        size: int = os.path.getsize(path)
+        digest = hashlib.sha1(f"blob {size}\0".encode())
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def load_manifest() -> Dict[str, str]:
+    try:
+        with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+            return json.load(f).get("files", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(files: Dict[str, str]) -> None:
+    temp_path: str = f"{MANIFEST_FILE}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"updated": _now_iso(), "files": files}, f, indent=1)
+    os.replace(temp_path, MANIFEST_FILE)
+
+
+def download_file(relative_path: str, raw_url: str, expected_sha: Optional[str] = None) -> int:
     """
     Downloads a file using a 'Atomic Write' strategy:
     1. Create directory structure.
-    2. Download to a .tmp file.
+    2. Download to a .tmp file, checking its git blob SHA when one is given.
     3. Rename .tmp to actual filename (prevents corruption on crash).
+    Returns the number of bytes written.
     """
     temp_path: str = f"{relative_path}.tmp"
 
@@ -90,57 +160,319 @@ def download_file(relative_path: str, raw_url: str) -> None:
     if dir_name:
         os.makedirs(dir_name, exist_ok=True)
 
-    response: requests.Response = requests.get(raw_url, timeout=15, stream=True)
-    response.raise_for_status()
-
-    # Write binary (prevents line-ending issues across Windows/Linux)
-    with open(temp_path, "wb") as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            f.write(chunk)
+    with SESSION.get(raw_url, timeout=15, stream=True) as response:
+        response.raise_for_status()
 
-    # Atomic swap: replace old file with new one
-    if os.path.exists(relative_path):
-        os.remove(relative_path)
-    os.rename(temp_path, relative_path)
+        # Write binary (prevents line-ending issues across Windows/Linux)
+        with open(temp_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
 
+    if expected_sha and git_blob_sha(temp_path) != expected_sha:
+        os.remove(temp_path)
+        raise RuntimeError(f"{relative_path}: content does not match the repository tree")
 
-def perform_full_update() -> None:
-    """Orchestrates the discovery and download of all repo files."""
+    # Atomic swap: replace old file with new one
+    size: int = os.path.getsize(temp_path)
+    os.replace(temp_path, relative_path)
+    return size
+
+
+def _safe_path(path: str) -> bool:
+    """Tree paths must stay inside the install directory, away from user data."""
+    parts: List[str] = path.replace("\\", "/").split("/")
+    return not (os.path.isabs(path) or ".." in parts or parts[0] in PRESERVED)
+
+
+def _remove_stale(previous: Dict[str, str], current: Dict[str, Any]) -> int:
+    """Delete files a previous update installed that upstream no longer has."""
+    deleted: int = 0
+    for path in sorted(set(previous) - set(current)):
+        if not _safe_path(path) or not os.path.isfile(path):
+            continue
+        os.remove(path)
+        deleted += 1
+        log_update(f"Removed: {path}")
+        # Drop directories the removal left empty
+        parent: str = os.path.dirname(path)
+        while parent and not os.listdir(parent):
+            os.rmdir(parent)
+            parent = os.path.dirname(parent)
+    return deleted
+
+
+def perform_delta_update() -> None:
+    """
+    Bring the install in line with the GitHub tree, transferring only what
+    changed: each local file's git blob SHA is compared with the tree's,
+    differing files are fetched in parallel over one pooled session, and
+    files a previous update installed but the tree no longer lists are
+    deleted. `version.txt` is written last, so an interrupted update is
+    simply retried on the next run.
+    """
     log_update("Syncing file structure with GitHub...")
 
-    response: requests.Response = requests.get(TREE_API_URL, timeout=10)
+    response: requests.Response = SESSION.get(TREE_API_URL, timeout=10)
     response.raise_for_status()
+    payload: Dict[str, Any] = response.json()
 
     # Parse the Git Tree
-    tree: List[dict[str, Any]] = response.json().get("tree", [])
-
-    # Filter for files (blobs) and exclude hidden git files if any
-    files_to_update: List[str] = [
-        item["path"] for item in tree if item["type"] == "blob"
+    tree: List[dict[str, Any]] = payload.get("tree", [])
+    remote: Dict[str, dict[str, Any]] = {
+        item["path"]: item
+        for item in tree
+        if item["type"] == "blob" and _safe_path(item["path"])
+    }
+
+    changed: List[str] = [
+        path for path, item in remote.items() if git_blob_sha(path) != item["sha"]
     ]
+    # The version file goes last: it marks the update as complete
+    last: List[str] = [p for p in changed if p == VERSION_FILE_NAME]
+    parallel: List[str] = [p for p in changed if p != VERSION_FILE_NAME]
+
+    def _fetch(path: str) -> int:
+        size: int = download_file(path, f"{RAW_BASE_URL}/{path}", remote[path]["sha"])
+        if remote[path].get("mode") == "100755" and os.name != "nt":
+            os.chmod(path, 0o755)
+        log_update(f"Synchronized: {path}")
+        return size
+
+    transferred: int = 0
+    failures: List[str] = []
+    if parallel:
+        with ThreadPoolExecutor(max_workers=min(UPDATE_WORKERS, len(parallel))) as pool:
+            futures = {pool.submit(_fetch, path): path for path in parallel}
+            for future in as_completed(futures):
+                try:
+                    transferred += future.result()
+                except Exception as e:
+                    failures.append(futures[future])
+                    log_update(f"Failed: {futures[future]} ({e})")
+
+    if failures:
+        raise RuntimeError(f"{len(failures)} file(s) failed to update; run the updater again")
+
+    for path in last:
+        transferred += _fetch(path)
+
+    deleted: int = 0
+    if payload.get("truncated"):
+        log_update("Tree listing was truncated; skipping deletions")
+    else:
+        deleted = _remove_stale(load_manifest(), remote)
+
+    save_manifest({path: item["sha"] for path, item in remote.items()})
+    log_update(
+        f"{len(changed)} changed ({transferred} bytes), {deleted} removed, "
+        f"{len(remote) - len(changed)} already current"
+    )
+
+
+def _archive_member(name: str) -> Optional[str]:
+    """Path inside the install for an archive entry ("<repo>-<sha>/x" -> "x")."""
+    parts: List[str] = name.replace("\\", "/").split("/", 1)
+    if len(parts) < 2 or not parts[1].strip("/"):
+        return None
+    rel: str = parts[1].rstrip("/")
+    return rel if _safe_path(rel) else None
+
+
+def _write_member(source, target: str, executable: bool) -> None:
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    with open(target, "wb") as f:
+        shutil.copyfileobj(source, f, CHUNK_SIZE)
+    if executable and os.name != "nt":
+        os.chmod(target, 0o755)
+
+
+def _extract_tar(stream, destination: str) -> None:
+    """Unpack a (gzipped) tar straight off the socket, no temporary archive."""
+    with tarfile.open(fileobj=stream, mode="r|*") as tar:
+        for member in tar:
+            rel: Optional[str] = _archive_member(member.name)
+            if rel is None or not member.isfile():
+                continue
+            _write_member(tar.extractfile(member), os.path.join(destination, rel), bool(member.mode & 0o111))
+
+
+def _extract_zip(stream, destination: str) -> None:
+    """Zip needs its central directory, so the body is spooled to a temp file first."""
+    with tempfile.TemporaryFile() as spool:
+        shutil.copyfileobj(stream, spool, CHUNK_SIZE)
+        spool.seek(0)
+        with zipfile.ZipFile(spool) as archive:
+            for info in archive.infolist():
+                rel: Optional[str] = _archive_member(info.filename)
+                if rel is None or info.is_dir():
+                    continue
+                with archive.open(info) as source:
+                    _write_member(source, os.path.join(destination, rel), bool((info.external_attr >> 16) & 0o111))
+
+
+def _is_zip(url: str, content_type: str, use_zip: bool) -> bool:
+    """
+    Zipball or tarball, from the request first and the exact media type
+    second ("application/x-gzip" must not count as zip).
+    """
+    if use_zip or url.lower().endswith(".zip") or "/zipball/" in url:
+        return True
+    media_type: str = content_type.split(";", 1)[0].strip().lower()
+    return media_type in ("application/zip", "application/x-zip-compressed")
+
+
+def _remove_entry(path: str) -> None:
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+
+def _roll_back_swap(names: List[str], existed: List[str]) -> None:
+    """
+    Put the entries of a swap back as they were. Works from any point of
+    the swap, since each entry is in one of three states: old one still
+    installed, old one in BACKUP_DIR, or newly added.
+    """
+    for name in names:
+        saved: str = os.path.join(BACKUP_DIR, name)
+        if os.path.lexists(saved):
+            _remove_entry(name)
+            os.replace(saved, name)
+        elif name not in existed:
+            _remove_entry(name)
+
+
+def recover_interrupted_swap() -> None:
+    """
+    Undo a swap that was cut short (crash, power loss, kill) before its
+    journal was removed; a BACKUP_DIR left without a journal belongs to a
+    swap that had finished and is just deleted.
+    """
+    if os.path.isfile(SWAP_JOURNAL):
+        with open(SWAP_JOURNAL, "r", encoding="utf-8") as f:
+            journal: Dict[str, List[str]] = json.load(f)
+        log_update("Rolling back an interrupted archive update...")
+        _roll_back_swap(journal["names"], journal["existed"])
+        os.remove(SWAP_JOURNAL)
+    shutil.rmtree(BACKUP_DIR, ignore_errors=True)
+
 
-    for file_path in files_to_update:
-        raw_url: str = f"{RAW_BASE_URL}/{file_path}"
-        log_update(f"Synchronizing: {file_path}")
-        download_file(file_path, raw_url)
+def _swap_into_place(names: List[str]) -> None:
+    """
+    Move each staged top-level entry over the installed one, keeping the old
+    one in BACKUP_DIR. SWAP_JOURNAL is written first and removed once every
+    rename succeeded: any failure here puts every entry back as it was, and
+    a crash is rolled back by the next run (`recover_interrupted_swap`).
+    """
+    existed: List[str] = [name for name in names if os.path.lexists(name)]
+    os.makedirs(BACKUP_DIR)
+    tmp: str = SWAP_JOURNAL + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"names": names, "existed": existed}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, SWAP_JOURNAL)
+
+    try:
+        for name in names:
+            if os.path.lexists(name):
+                os.replace(name, os.path.join(BACKUP_DIR, name))
+            os.replace(os.path.join(STAGING_DIR, name), name)
+    except BaseException:
+        _roll_back_swap(names, existed)
+        os.remove(SWAP_JOURNAL)
+        shutil.rmtree(BACKUP_DIR, ignore_errors=True)
+        raise
+    # The new tree is complete: from here on it is kept
+    os.remove(SWAP_JOURNAL)
+
+
+def perform_archive_update(url: Optional[str] = None, *, ref: str = BRANCH, use_zip: bool = False) -> None:
+    """
+    Install the whole branch or tag from one tarball (or zipball) download.
+
+    The archive is unpacked into STAGING_DIR while it streams in; then each
+    top-level entry replaces the installed one by rename, `version.txt`
+    last. PRESERVED entries (worlds, caches, logs) are never touched, and
+    the recorded blob SHAs let later updates run in delta mode.
+    """
+    url = url or f"{ARCHIVE_API_URL}/{'zipball' if use_zip else 'tarball'}/{ref}"
+    recover_interrupted_swap()
+    shutil.rmtree(STAGING_DIR, ignore_errors=True)
+    os.makedirs(STAGING_DIR)
+
+    try:
+        log_update(f"Downloading archive: {url}")
+        with SESSION.get(url, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            is_zip: bool = _is_zip(url, response.headers.get("Content-Type", ""), use_zip)
+            (_extract_zip if is_zip else _extract_tar)(response.raw, STAGING_DIR)
+
+        if not os.path.isfile(os.path.join(STAGING_DIR, VERSION_FILE_NAME)):
+            raise RuntimeError(f"Archive has no {VERSION_FILE_NAME}; nothing was changed")
+
+        files: Dict[str, str] = {}
+        for dirpath, _, filenames in os.walk(STAGING_DIR):
+            for name in filenames:
+                path: str = os.path.join(dirpath, name)
+                rel: str = os.path.relpath(path, STAGING_DIR).replace(os.sep, "/")
+                files[rel] = git_blob_sha(path) or ""
+
+        names: List[str] = sorted(os.listdir(STAGING_DIR), key=lambda name: name == VERSION_FILE_NAME)
+        _swap_into_place(names)
+    except BaseException:
+        # Nothing of a failed download or extraction is left behind
+        shutil.rmtree(STAGING_DIR, ignore_errors=True)
+        raise
+
+    deleted: int = _remove_stale(load_manifest(), files)
+    save_manifest(files)
+    shutil.rmtree(BACKUP_DIR, ignore_errors=True)
+    shutil.rmtree(STAGING_DIR, ignore_errors=True)
+    log_update(f"{len(files)} files installed from archive, {deleted} removed")
+
+
+def _option(flag: str) -> Optional[str]:
+    """Value following `flag` on the command line, if given."""
+    if flag in sys.argv:
+        at: int = sys.argv.index(flag)
+        if at + 1 < len(sys.argv):
+            return sys.argv[at + 1]
+    return None
 
 
 def main() -> None:
     """Main execution block with strict error boundaries."""
+    # --archive [--zip] [--ref TAG] [--archive-url URL]: reinstall from one archive
+    archive_url: Optional[str] = _option("--archive-url")
+    ref: str = _option("--ref") or BRANCH
+    use_zip: bool = "--zip" in sys.argv
+
     try:
+        recover_interrupted_swap()
+
+        if "--archive" in sys.argv or archive_url:
+            log_update("Installing from a single archive...")
+            perform_archive_update(archive_url, ref=ref, use_zip=use_zip)
+            log_update(f"Successfully installed version {get_local_version()}")
+            return
+
         log_update("Initializing update check...")
 
         remote_v: str = get_remote_version()
         local_v: Optional[str] = get_local_version()
 
         if local_v is None:
-            log_update("Fresh installation detected. Downloading all files...")
-            perform_full_update()
+            # One archive download instead of a request per file
+            log_update("Fresh installation detected. Downloading the repository archive...")
+            perform_archive_update(ref=ref, use_zip=use_zip)
             log_update(f"Successfully installed version {remote_v}")
 
         elif remote_v != local_v:
             log_update(f"Upgrade available: {local_v} -> {remote_v}")
-            perform_full_update()
+            perform_delta_update()
             log_update("Update completed successfully.")
 
         else:
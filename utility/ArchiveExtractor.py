@@ -0,0 +1,191 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+Streaming archive extraction for runtime installs.
+
+The archive format is detected from its first bytes, so a `.tar.gz` JRE can
+be unpacked straight from an HTTP body while it downloads. Zip archives
+(Windows JREs) keep their index at the end, so they are spooled to a file
+first. Leading path components (the `jdk-21.0.x+y-jre/` folder) are stripped
+while extracting instead of moving files afterwards.
+"""
+from __future__ import annotations
+
+import os
+import pathlib
+import shutil
+import tarfile
+import zipfile
+from typing import BinaryIO, Iterator, Optional
+
+
+class _PeekReader:
+    """File-like wrapper that can look at the first bytes without losing them."""
+
+    def __init__(self, raw: BinaryIO, sink: Optional[BinaryIO] = None) -> None:
+        self._raw = raw
+        self._sink = sink
+        self._buffer = b""
+
+    def peek(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            data = self._raw.read(size - len(self._buffer))
+            if not data:
+                break
+            if self._sink is not None:
+                self._sink.write(data)
+            self._buffer += data
+        return self._buffer[:size]
+
+    def read(self, size: int = -1) -> bytes:
+        if self._buffer:
+            count = len(self._buffer) if size < 0 else size
+            data, self._buffer = self._buffer[:count], self._buffer[count:]
+            if size < 0:
+                data += self._read_raw(-1)
+            return data
+        return self._read_raw(size)
+
+    def _read_raw(self, size: int) -> bytes:
+        data = self._raw.read(size) if size >= 0 else self._raw.read()
+        if data and self._sink is not None:
+            self._sink.write(data)
+        return data
+
+    def drain(self, chunk_size: int = 1024 * 1024) -> None:
+        """Read to EOF, so a tee sink holds the complete archive."""
+        self._buffer = b""
+        while self._read_raw(chunk_size):
+            pass
+
+
+class ArchiveExtractor:
+    FORMATS = ("tar.gz", "tar.xz", "tar.bz2", "tar", "zip")
+
+    @staticmethod
+    def detect_format(head: bytes) -> str:
+        """Archive format from the first bytes (at least 262 for plain tar)."""
+        if head.startswith(b"\x1f\x8b"):
+            return "tar.gz"
+        if head.startswith(b"\xfd7zXZ\x00"):
+            return "tar.xz"
+        if head.startswith(b"BZh"):
+            return "tar.bz2"
+        if head.startswith(b"PK\x03\x04") or head.startswith(b"PK\x05\x06"):
+            return "zip"
+        if head[257:262] == b"ustar":
+            return "tar"
+        raise ValueError("Unknown archive format")
+
+    @classmethod
+    def extract(
+        cls,
+        source: BinaryIO,
+        destination: os.PathLike | str,
+        *,
+        strip_components: int = 1,
+        tee: Optional[BinaryIO] = None,
+        spool_path: Optional[os.PathLike | str] = None,
+    ) -> str:
+        """
+        Extract the archive read from `source` into `destination`.
+
+        Everything read is also written to `tee` when given (the caller can
+        keep the archive without a second pass). Zip archives need a seekable
+        file: `source` itself if it is one, else `spool_path` (or the tee's
+        file). Returns the detected format.
+        """
+        destination = pathlib.Path(destination)
+        destination.mkdir(parents=True, exist_ok=True)
+
+        reader = _PeekReader(source, tee)
+        fmt = cls.detect_format(reader.peek(262))
+
+        if fmt != "zip":
+            mode = {"tar.gz": "r|gz", "tar.xz": "r|xz", "tar.bz2": "r|bz2", "tar": "r|"}[fmt]
+            with tarfile.open(fileobj=reader, mode=mode) as tar:
+                members = cls._strip_tar(tar, strip_components)
+                if hasattr(tarfile, "data_filter"):
+                    tar.extractall(destination, members=members, filter="data")
+                else:
+                    tar.extractall(destination, members=members)
+            reader.drain()
+            return fmt
+
+        if cls._seekable(source) and tee is None:
+            source.seek(0)
+            cls._extract_zip(source, destination, strip_components)
+            return fmt
+
+        if tee is not None and spool_path is None:
+            # The tee file already receives every byte; finish it and read it back
+            reader.drain()
+            tee.flush()
+            with open(tee.name, "rb") as spooled:
+                cls._extract_zip(spooled, destination, strip_components)
+            return fmt
+
+        if spool_path is None:
+            raise ValueError("zip archives from a stream need spool_path or tee")
+
+        spool_path = pathlib.Path(spool_path)
+        with open(spool_path, "wb") as spool:
+            shutil.copyfileobj(reader, spool, 1024 * 1024)
+        try:
+            with open(spool_path, "rb") as spooled:
+                cls._extract_zip(spooled, destination, strip_components)
+        finally:
+            spool_path.unlink(missing_ok=True)
+        return fmt
+
+    @staticmethod
+    def _seekable(stream: BinaryIO) -> bool:
+        try:
+            return bool(stream.seekable())
+        except (AttributeError, OSError):
+            return False
+
+    @staticmethod
+    def _strip_name(name: str, strip_components: int) -> Optional[str]:
+        parts = [p for p in name.replace("\\", "/").split("/") if p not in ("", ".")]
+        parts = parts[strip_components:]
+        if not parts or ".." in parts:
+            return None
+        return "/".join(parts)
+
+    @classmethod
+    def _strip_tar(cls, tar: tarfile.TarFile, strip_components: int) -> Iterator[tarfile.TarInfo]:
+        for member in tar:
+            name = cls._strip_name(member.name, strip_components)
+            if name is None:
+                continue
+            member.name = name
+            if member.islnk():
+                # Hardlink targets are archive paths and need the same stripping
+                linkname = cls._strip_name(member.linkname, strip_components)
+                if linkname is None:
+                    continue
+                member.linkname = linkname
+            yield member
+
+    @classmethod
+    def _extract_zip(cls, fileobj: BinaryIO, destination: pathlib.Path, strip_components: int) -> None:
+        root = destination.resolve()
+        with zipfile.ZipFile(fileobj) as archive:
+            for info in archive.infolist():
+                name = cls._strip_name(info.filename, strip_components)
+                if name is None:
+                    continue
+                target = (destination / name).resolve()
+                if root not in target.parents and target != root:
+                    continue
+                if info.is_dir():
+                    target.mkdir(parents=True, exist_ok=True)
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with archive.open(info) as src, open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+                mode = info.external_attr >> 16
+                if mode & 0o111:
+                    target.chmod(mode & 0o777)
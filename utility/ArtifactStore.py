@@ -0,0 +1,457 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+Content-addressed store for downloaded artifacts (Paper jars, plugins, JREs).
+
+Layout under `root`:
+    blobs/<aa>/<sha256>   file content, named by its SHA-256
+    staging/              in-flight downloads
+    locks/                one lock file per (url, logical name) being fetched
+    index.json            (url, logical name) -> digest, plus LRU bookkeeping
+
+`versions/`, `plugins/` and `javas/` keep their familiar file names, but the
+files there are hardlinks ("views") onto blobs, so the same jar is stored once
+no matter how many names point at it. Worlds get reflinks or copies of the
+views (see Provisioner), never the hardlinks themselves, and a blob whose
+size or mtime no longer matches the index is treated as missing.
+
+Several processes may share one store: `fetch` holds a per-entry file lock,
+so a file is downloaded once while the others wait and reuse it, and the
+index is merged with the copy on disk under `.index.lock` on every save.
+Linking a view and evicting blobs also run under `.index.lock`, so a blob
+is never removed between the check that it exists and the link. Inside
+`batch()` the view bookkeeping of `link` is written once at the end
+instead of rewriting the index per file.
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from utility.FileLock import FileLock
+from utility.Trace import TRACER
+
+
+class ArtifactStore:
+    INDEX_NAME = "index.json"
+    HASH_CHUNK = 1024 * 1024  # 1 MB
+    DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GB
+
+    def __init__(
+        self,
+        root: os.PathLike | str = "artifacts",
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.root = pathlib.Path(root)
+        self.blobs_dir = self.root / "blobs"
+        self.staging_dir = self.root / "staging"
+        self.locks_dir = self.root / "locks"
+        self.index_path = self.root / self.INDEX_NAME
+        self.max_bytes = max_bytes
+
+        self._lock = threading.RLock()
+        self._evicted: set[str] = set()  # digests dropped since the last save
+        self._batch_depth = 0
+        self._dirty = False  # link() bookkeeping waiting for the end of a batch
+
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        self._index = self._load_index()
+
+    # --- Lookup ---
+
+    @staticmethod
+    def _key(url: str, name: str) -> str:
+        return f"{name}|{url}"
+
+    @classmethod
+    def _key_id(cls, url: str, name: str) -> str:
+        return hashlib.sha256(cls._key(url, name).encode()).hexdigest()[:16]
+
+    def blob_path(self, digest: str) -> pathlib.Path:
+        return self.blobs_dir / digest[:2] / digest
+
+    def lookup(self, url: str, name: str, *, max_age: Optional[float] = None) -> Optional[str]:
+        """
+        Return the digest cached for (url, name), or None when it is missing,
+        damaged, or older than `max_age` seconds.
+        """
+        with self._lock:
+            entry = self._index["entries"].get(self._key(url, name))
+            if not entry:
+                return None
+            if max_age is not None and time.time() - entry["fetched"] > max_age:
+                return None
+            return entry["digest"] if self._blob_ok(entry["digest"]) else None
+
+    def entry(self, url: str, name: str) -> Optional[Dict[str, Any]]:
+        """Index entry for (url, name) regardless of age, if its blob is intact."""
+        with self._lock:
+            entry = self._index["entries"].get(self._key(url, name))
+            if entry and self._blob_ok(entry["digest"]):
+                return dict(entry)
+            return None
+
+    def touch(self, url: str, name: str) -> None:
+        """Mark (url, name) as freshly validated without changing its content."""
+        with self._lock:
+            entry = self._index["entries"].get(self._key(url, name))
+            if entry:
+                entry["fetched"] = time.time()
+                self._save_index()
+
+    def find_by_name(self, name: str) -> Optional[str]:
+        """Most recently fetched digest stored under logical `name`, any URL."""
+        with self._lock:
+            entries = [
+                e for e in self._index["entries"].values()
+                if e["name"] == name and self._blob_ok(e["digest"])
+            ]
+            if not entries:
+                return None
+            return max(entries, key=lambda e: e["fetched"])["digest"]
+
+    def _blob_ok(self, digest: str) -> bool:
+        """
+        The blob exists with the size and mtime it was stored with. Views are
+        hardlinks, so a tool writing into one in place changes the blob too;
+        the mtime catches that without re-hashing.
+        """
+        blob = self._index["blobs"].get(digest)
+        try:
+            st = self.blob_path(digest).stat()
+        except OSError:
+            return False
+        return (
+            bool(blob)
+            and st.st_size == blob["size"]
+            and blob.get("mtime_ns", st.st_mtime_ns) == st.st_mtime_ns
+        )
+
+    # --- Insert ---
+
+    def staging_path(self, url: str, name: str) -> pathlib.Path:
+        """Stable scratch path for a download, so NBrouser can resume it."""
+        return self.staging_dir / f"{self._key_id(url, name)}-{name}"
+
+    @classmethod
+    def hash_file(cls, path: os.PathLike | str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as stream:
+            for chunk in iter(lambda: stream.read(cls.HASH_CHUNK), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def put(
+        self,
+        url: str,
+        name: str,
+        file_path: os.PathLike | str,
+        *,
+        move: bool = True,
+        validators: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """
+        Add `file_path` to the store under (url, name) and return its digest.
+
+        With `move` the file is consumed; identical content already in the
+        store is reused and the new copy dropped. `validators` (ETag /
+        Last-Modified) are kept for later conditional refreshes.
+        """
+        file_path = pathlib.Path(file_path)
+        digest = self.hash_file(file_path)
+        blob = self.blob_path(digest)
+
+        with self._lock:
+            # Decided against the disk, not this process's view of the index:
+            # another process may have just stored the same blob and linked it
+            with self._index_lock():
+                self._merge(self._load_index())
+                if self._blob_reusable(digest):
+                    if move:
+                        file_path.unlink()
+                else:
+                    # Missing, or rewritten through a view: store a fresh inode
+                    blob.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = blob.with_name(f"{blob.name}.{os.getpid()}.tmp")
+                    if move:
+                        os.replace(file_path, tmp)
+                    else:
+                        shutil.copyfile(file_path, tmp)
+                    os.replace(tmp, blob)
+
+            now = time.time()
+            info = self._index["blobs"].setdefault(digest, {"views": []})
+            st = blob.stat()
+            info["size"] = st.st_size
+            info["mtime_ns"] = st.st_mtime_ns
+            info["last_used"] = now
+            self._index["entries"][self._key(url, name)] = {
+                "url": url,
+                "name": name,
+                "digest": digest,
+                "fetched": now,
+                "validators": validators or {},
+            }
+            self.evict(keep=[digest])
+            self._save_index()
+
+        return digest
+
+    def _blob_reusable(self, digest: str) -> bool:
+        """
+        The blob on disk can stand for `digest`: intact per the index, or
+        not indexed yet (stored by a process that has not saved its index)
+        and still holding that content.
+        """
+        if digest in self._index["blobs"]:
+            return self._blob_ok(digest)
+        blob = self.blob_path(digest)
+        return blob.is_file() and self.hash_file(blob) == digest
+
+    # --- Views ---
+
+    def link(self, digest: str, view: os.PathLike | str) -> pathlib.Path:
+        """
+        Expose blob `digest` at `view` (hardlink, copy as fallback) and mark
+        it as recently used. Raises FileNotFoundError if the blob is gone,
+        e.g. evicted by another process since it was looked up.
+        """
+        view = pathlib.Path(view)
+        blob = self.blob_path(digest)
+
+        # Under the index lock, so another process's evict cannot run between the check and the link
+        with self._lock, self._index_lock():
+            if not self._blob_ok(digest):
+                raise FileNotFoundError(f"artifact blob {digest} is missing or damaged")
+            if not (view.exists() and self._same_file(view, blob)):
+                view.parent.mkdir(parents=True, exist_ok=True)
+                tmp = view.with_name(f"{view.name}.{os.getpid()}.link")
+                tmp.unlink(missing_ok=True)
+                try:
+                    os.link(blob, tmp)
+                except OSError:
+                    shutil.copyfile(blob, tmp)
+                os.replace(tmp, view)
+
+            info = self._index["blobs"][digest]
+            info["last_used"] = time.time()
+            view_str = str(view.absolute())
+            if view_str not in info["views"]:
+                info["views"].append(view_str)
+            if self._batch_depth:
+                self._dirty = True
+            else:
+                self._write_index()
+
+        return view
+
+    @staticmethod
+    def _same_file(a: pathlib.Path, b: pathlib.Path) -> bool:
+        try:
+            return os.path.samefile(a, b)
+        except OSError:
+            return False
+
+    def fetch(
+        self,
+        browser,
+        url: str,
+        name: str,
+        view: os.PathLike | str,
+        *,
+        max_age: Optional[float] = None,
+        **download_kwargs: Any,
+    ) -> pathlib.Path:
+        """
+        Resolve (url, name) through the store and expose it at `view`.
+        Downloads with `browser` (an NBrouser) only on a cache miss.
+
+        An entry older than `max_age` is revalidated with a conditional
+        request; a 304 keeps the cached blob and costs no transfer.
+
+        Runs under the entry's file lock: a process that waited on another
+        one's download re-reads the index and finds the result there. A blob
+        evicted by another process before it is linked is fetched again.
+        """
+        view = pathlib.Path(view)
+
+        with self.lock(url, name), TRACER.span("artifact.fetch", file=name, cache="hit") as span:
+            for attempt in range(2):
+                self.refresh()
+                digest = self.lookup(url, name, max_age=max_age)
+
+                if digest is None and max_age is None and view.is_file() and not self._is_view(view):
+                    # File from before the store existed: adopt it instead of refetching
+                    digest = self.put(url, name, view, move=False)
+
+                if digest is None:
+                    stale = self.entry(url, name)
+                    staged = self.staging_path(url, name)
+                    result = browser.download(
+                        url,
+                        staged,
+                        validators=stale.get("validators") if stale else None,
+                        **download_kwargs,
+                    )
+                    if stale and result.get("not_modified"):
+                        self.touch(url, name)
+                        digest = stale["digest"]
+                        span.set(cache="revalidated")
+                    else:
+                        digest = self.put(url, name, staged, validators=result.get("validators"))
+                        span.set(cache="miss", bytes=result.get("size", 0))
+
+                try:
+                    return self.link(digest, view)
+                except FileNotFoundError:
+                    if attempt:
+                        raise
+                    span.set(cache="evicted")
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator["ArtifactStore"]:
+        """
+        Defer the index writes of `link` to a single one when the outermost
+        batch ends. Thread-safe; entries added by `put` are still saved at
+        once, so other processes waiting on them see them.
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth and self._dirty:
+                    self._save_index()
+
+    def lock(self, url: str, name: str) -> FileLock:
+        """Cross-process lock for the (url, name) entry; use as a context manager."""
+        return FileLock(self.locks_dir / f"{self._key_id(url, name)}.lock", description=name)
+
+    def _is_view(self, view: pathlib.Path) -> bool:
+        view_str = str(view.absolute())
+        with self._lock:
+            return any(view_str in b["views"] for b in self._index["blobs"].values())
+
+    # --- Eviction ---
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(b.get("size", 0) for b in self._index["blobs"].values())
+
+    def evict(self, *, keep: Iterable[str] = ()) -> int:
+        """
+        Drop least recently used blobs (and their views) until the store fits
+        in `max_bytes`. Returns the number of bytes freed.
+        """
+        keep = set(keep)
+        freed = 0
+
+        # Under the index lock so no other process links a blob while it is removed
+        with self._lock, self._index_lock():
+            # Pick up other processes' recent use before choosing what to drop
+            self._merge(self._load_index())
+            blobs = self._index["blobs"]
+            total = self.total_bytes()
+            for digest in sorted(blobs, key=lambda d: blobs[d].get("last_used", 0)):
+                if total <= self.max_bytes:
+                    break
+                if digest in keep:
+                    continue
+
+                info = blobs.pop(digest)
+                self._evicted.add(digest)
+                for view in info.get("views", []):
+                    view_path = pathlib.Path(view)
+                    if view_path.exists() and self._same_file(view_path, self.blob_path(digest)):
+                        view_path.unlink()
+                self.blob_path(digest).unlink(missing_ok=True)
+
+                self._index["entries"] = {
+                    k: e for k, e in self._index["entries"].items() if e["digest"] != digest
+                }
+                total -= info.get("size", 0)
+                freed += info.get("size", 0)
+
+            if freed:
+                self._write_index()
+
+        return freed
+
+    # --- Index persistence ---
+
+    def _load_index(self) -> Dict[str, Any]:
+        try:
+            index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            index = {}
+        index.setdefault("entries", {})
+        index.setdefault("blobs", {})
+        return index
+
+    def refresh(self) -> None:
+        """Pick up entries other processes have added since this one loaded the index."""
+        with self._lock:
+            self._merge(self._load_index())
+
+    def _merge(self, other: Dict[str, Any]) -> None:
+        """Fold `other` into the in-memory index; newer entries win, views are unioned."""
+        blobs = self._index["blobs"]
+        for digest, info in other["blobs"].items():
+            if digest in self._evicted:
+                continue
+            mine = blobs.get(digest)
+            if mine is None:
+                blobs[digest] = info
+                continue
+            mine["last_used"] = max(mine.get("last_used", 0), info.get("last_used", 0))
+            # A blob re-stored by another process is the newer write
+            if info.get("mtime_ns", 0) > mine.get("mtime_ns", 0):
+                mine["mtime_ns"] = info["mtime_ns"]
+            mine["views"] = mine.get("views", []) + [
+                v for v in info.get("views", []) if v not in mine.get("views", [])
+            ]
+
+        entries = self._index["entries"]
+        for key, entry in other["entries"].items():
+            if entry["digest"] in self._evicted:
+                continue
+            mine = entries.get(key)
+            if mine is None or entry["fetched"] > mine["fetched"]:
+                entries[key] = entry
+
+    def _index_lock(self) -> FileLock:
+        self.root.mkdir(parents=True, exist_ok=True)
+        return FileLock(self.root / ".index.lock", description="the artifact index")
+
+    def _save_index(self) -> None:
+        with self._index_lock():
+            self._write_index()
+
+    def _write_index(self) -> None:
+        """Write the index; the caller holds `_index_lock()` (FileLock is not reentrant)."""
+        # Another process may have saved since we loaded: merge, don't clobber
+        self._merge(self._load_index())
+        self._index["blobs"] = {
+            d: b for d, b in self._index["blobs"].items() if self.blob_path(d).is_file()
+        }
+        self._index["entries"] = {
+            k: e for k, e in self._index["entries"].items() if e["digest"] in self._index["blobs"]
+        }
+        self._evicted.clear()
+        self._dirty = False
+
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        tmp.write_text(json.dumps(self._index, indent=1), encoding="utf-8")
+        os.replace(tmp, self.index_path)
@@ -0,0 +1,477 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+AsyncNBrouser - asyncio counterpart of NBrouser.
+
+Built on `asyncio.open_connection` only (no third-party HTTP client), so many
+downloads can share one event loop instead of one thread each. It follows
+NBrouser's rules: `.tmp` file + atomic rename, Range resume, the same
+`_resolve_filename` logic and the same `on_progress(written, total)` callback.
+
+Usage:
+    async with AsyncNBrouser() as browser:
+        data = await browser.get_json(url)
+        paths, errors = await browser.download_many(
+            [(url, "plugins", "ViaVersion.jar"), ...], concurrency=4
+        )
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import pathlib
+import ssl
+import urllib.parse
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from requests.structures import CaseInsensitiveDict
+
+from utility.NBrouser import MultiProgress, NBrouser, ProgressReporter
+
+
+class AsyncHTTPError(Exception):
+    def __init__(self, status_code: int, url: str) -> None:
+        super().__init__(f"{status_code} Error for url: {url}")
+        self.status_code = status_code
+        self.url = url
+
+
+class AsyncResponse:
+    """Minimal HTTP/1.1 response, shaped like the parts of requests.Response NBrouser reads."""
+
+    def __init__(
+        self,
+        connection: "_Connection",
+        status_code: int,
+        headers: CaseInsensitiveDict,
+        url: str,
+        method: str,
+    ) -> None:
+        self._connection = connection
+        self.status_code = status_code
+        self.headers = headers
+        self.url = url
+        self._remaining: Optional[int] = None
+        self._chunked = False
+        self._done = False
+
+        if method == "HEAD" or status_code in (204, 304) or 100 <= status_code < 200:
+            self._done = True
+        elif "chunked" in headers.get("Transfer-Encoding", "").lower():
+            self._chunked = True
+        elif headers.get("Content-Length", "").isdigit():
+            self._remaining = int(headers["Content-Length"])
+            self._done = self._remaining == 0
+        else:
+            # Body runs until the server closes the connection
+            connection.reusable = False
+
+        if headers.get("Connection", "").lower() == "close":
+            connection.reusable = False
+
+    def __bool__(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise AsyncHTTPError(self.status_code, self.url)
+
+    async def iter_chunks(self, chunk_size: int):
+        reader = self._connection.reader
+        timeout = self._connection.timeout
+
+        while not self._done:
+            if self._chunked:
+                size_line = await asyncio.wait_for(reader.readline(), timeout)
+                size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    # Trailers end with an empty line
+                    while (await asyncio.wait_for(reader.readline(), timeout)).strip():
+                        pass
+                    self._done = True
+                    break
+                data = await asyncio.wait_for(reader.readexactly(size), timeout)
+                await asyncio.wait_for(reader.readexactly(2), timeout)
+                yield data
+            elif self._remaining is not None:
+                data = await asyncio.wait_for(reader.read(min(chunk_size, self._remaining)), timeout)
+                if not data:
+                    raise ConnectionError(f"Connection closed with {self._remaining} bytes left")
+                self._remaining -= len(data)
+                self._done = self._remaining == 0
+                yield data
+            else:
+                data = await asyncio.wait_for(reader.read(chunk_size), timeout)
+                if not data:
+                    self._done = True
+                    break
+                yield data
+
+    async def read(self) -> bytes:
+        return b"".join([chunk async for chunk in self.iter_chunks(NBrouser.CHUNK_SIZE)])
+
+    async def text(self) -> str:
+        return (await self.read()).decode("utf-8", errors="replace")
+
+    async def json(self) -> Any:
+        return json.loads(await self.read())
+
+    @property
+    def complete(self) -> bool:
+        return self._done
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, timeout: float) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.timeout = timeout
+        self.reusable = True
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class AsyncNBrouser:
+    """
+    Asyncio network utility with keep-alive connection pooling.
+
+    Features:
+      1. get / get_text / get_json helpers
+      2. Atomic `.tmp` downloads with resume, same naming rules as NBrouser
+      3. download_many with a concurrency limit and combined progress
+    """
+
+    TEMP_SUFFIX = NBrouser.TEMP_SUFFIX
+    CHUNK_SIZE = NBrouser.CHUNK_SIZE
+    MAX_REDIRECTS = 10
+    POOL_SIZE = NBrouser.POOL_SIZE
+
+    def __init__(
+        self,
+        *,
+        base_headers: Optional[Dict[str, str]] = None,
+        timeout: int = 20,
+        pool_size: int = POOL_SIZE,
+    ) -> None:
+        self._timeout = timeout
+        self._pool_size = pool_size
+        self._headers = CaseInsensitiveDict(
+            base_headers or {
+                "User-Agent": "NHostAPI-NBrouser/1.0 (asyncio)",
+                "Accept": "*/*",
+                "Accept-Language": "en-US,en;q=0.9",
+                "Connection": "keep-alive",
+            }
+        )
+        self._idle: Dict[Tuple[str, str, int], List[_Connection]] = {}
+        self._ssl = ssl.create_default_context()
+
+    async def __aenter__(self) -> "AsyncNBrouser":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        for conns in self._idle.values():
+            for conn in conns:
+                conn.close()
+        self._idle.clear()
+
+    # --- Connection pool ---
+
+    async def _acquire(self, scheme: str, host: str, port: int) -> _Connection:
+        idle = self._idle.get((scheme, host, port))
+        while idle:
+            conn = idle.pop()
+            if not conn.reader.at_eof() and not conn.writer.is_closing():
+                return conn
+            conn.close()
+
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                host,
+                port,
+                ssl=self._ssl if scheme == "https" else None,
+                server_hostname=host if scheme == "https" else None,
+                limit=self.CHUNK_SIZE * 4,
+            ),
+            self._timeout,
+        )
+        return _Connection(reader, writer, self._timeout)
+
+    def _release(self, key: Tuple[str, str, int], conn: _Connection, response: AsyncResponse) -> None:
+        idle = self._idle.setdefault(key, [])
+        if conn.reusable and response.complete and len(idle) < self._pool_size:
+            idle.append(conn)
+        else:
+            conn.close()
+
+    # --- Requests ---
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        allow_redirects: bool = True,
+    ) -> "_ResponseContext":
+        """Send a request; use the result as `async with` to release the connection."""
+        for _ in range(self.MAX_REDIRECTS + 1):
+            parsed = urllib.parse.urlsplit(url)
+            scheme = parsed.scheme.lower()
+            port = parsed.port or (443 if scheme == "https" else 80)
+            key = (scheme, parsed.hostname or "", port)
+            path = parsed.path or "/"
+            if parsed.query:
+                path += "?" + parsed.query
+
+            send_headers = CaseInsensitiveDict(self._headers)
+            send_headers.update(headers or {})
+            send_headers["Host"] = parsed.netloc.rsplit("@", 1)[-1]
+
+            conn = await self._acquire(*key)
+            try:
+                head = f"{method} {path} HTTP/1.1\r\n" + "".join(
+                    f"{k}: {v}\r\n" for k, v in send_headers.items()
+                ) + "\r\n"
+                conn.writer.write(head.encode("latin-1"))
+                await asyncio.wait_for(conn.writer.drain(), self._timeout)
+
+                status_line = await asyncio.wait_for(conn.reader.readline(), self._timeout)
+                if not status_line:
+                    raise ConnectionError(f"Empty reply from {parsed.netloc}")
+                status_code = int(status_line.split()[1])
+
+                resp_headers: CaseInsensitiveDict = CaseInsensitiveDict()
+                while True:
+                    line = await asyncio.wait_for(conn.reader.readline(), self._timeout)
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    resp_headers[name.strip()] = value.strip()
+            except BaseException:
+                conn.close()
+                raise
+
+            response = AsyncResponse(conn, status_code, resp_headers, url, method)
+
+            if allow_redirects and status_code in (301, 302, 303, 307, 308) and "Location" in resp_headers:
+                await response.read()
+                self._release(key, conn, response)
+                url = urllib.parse.urljoin(url, resp_headers["Location"])
+                if status_code == 303:
+                    method = "GET"
+                continue
+
+            return _ResponseContext(self, key, conn, response)
+
+        raise ConnectionError(f"Too many redirects for {url}")
+
+    async def get(self, url: str, **kwargs: Any) -> "_ResponseContext":
+        return await self.request("GET", url, **kwargs)
+
+    async def get_text(self, url: str, **kwargs: Any) -> str:
+        async with await self.get(url, **kwargs) as response:
+            response.raise_for_status()
+            return await response.text()
+
+    async def get_json(self, url: str, **kwargs: Any) -> Any:
+        async with await self.get(url, **kwargs) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def head(self, url: str) -> Optional[AsyncResponse]:
+        try:
+            async with await self.request("HEAD", url) as response:
+                response.raise_for_status()
+                return response
+        except (OSError, asyncio.TimeoutError, AsyncHTTPError, ValueError):
+            return None
+
+    # --- Downloads ---
+
+    async def download(
+        self,
+        url: str,
+        destination: os.PathLike | str = "",
+        *,
+        filename: Optional[str] = None,
+        resume: bool = True,
+        show_progress: bool = True,
+        on_progress: Optional[Callable[[int, Optional[int]], None]] = None,
+        progress: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Async `NBrouser.download`: same destination, naming and resume rules,
+        the same single GET (speculative `Range` with `If-Range`, name from the reply) and
+        the same throttled `progress` modes.
+        """
+        dest = pathlib.Path(destination) if destination else pathlib.Path.cwd()
+
+        directory: Optional[pathlib.Path] = None
+        target_path: Optional[pathlib.Path]
+
+        # If destination is a directory, we decide the filename.
+        if dest.exists() and dest.is_dir():
+            directory = dest
+            if filename and NBrouser._is_valid_filename(filename):
+                target_path = dest / NBrouser._sanitize_filename(filename)
+            else:
+                target_path = None
+        else:
+            target_path = dest
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+
+        headers = {}
+        written = 0
+
+        temp_path = NBrouser._temp_path(target_path) if target_path else None
+        if resume and temp_path:
+            written, resume_headers = NBrouser._resume_headers(temp_path, url)
+            headers.update(resume_headers)
+
+        reporter = ProgressReporter(
+            progress or ("line" if show_progress else "none"),
+            on_progress=on_progress,
+            label=target_path.name if target_path else None,
+        )
+
+        async with await self.get(url, headers=headers) as response:
+            if target_path is None:
+                target_path = directory / NBrouser._resolve_filename(url, filename, response=response)
+                temp_path = NBrouser._temp_path(target_path)
+
+            if written and (
+                response.status_code == 416
+                or (response.status_code == 206 and not NBrouser._continues(response, written))
+            ):
+                # Stale or unusable partial file: drop it and fetch everything
+                await response.read()
+                temp_path.unlink(missing_ok=True)
+                unusable = True
+            else:
+                unusable = False
+
+            if not unusable:
+                if response.status_code not in (200, 206):
+                    response.raise_for_status()
+
+                # 206 continues the partial file; 200 means the server ignored
+                # Range or If-Range found the file changed
+                if response.status_code == 206:
+                    mode = "ab"
+                else:
+                    written = 0
+                    mode = "wb"
+                    NBrouser._remember_partial(temp_path, url, response)
+
+                reporter.total = NBrouser._compute_total_size(response, written)
+                reporter.label = reporter.label or target_path.name
+
+                with open(temp_path, mode) as stream:
+                    async for chunk in response.iter_chunks(self.CHUNK_SIZE):
+                        stream.write(chunk)
+                        written += len(chunk)
+                        reporter.update(written)
+
+        if unusable:
+            return await self.download(
+                url,
+                target_path,
+                resume=False,
+                show_progress=show_progress,
+                on_progress=on_progress,
+                progress=progress,
+            )
+
+        temp_path.replace(target_path)
+        NBrouser._meta_path(temp_path).unlink(missing_ok=True)
+
+        reporter.finish(written)
+
+        elapsed = reporter.elapsed()
+        return {
+            "path": target_path,
+            "size": written,
+            "speed": written / elapsed if elapsed > 0 else 0,
+            "time": elapsed,
+        }
+
+    async def download_many(
+        self,
+        items: Iterable[Tuple[str, os.PathLike | str, Optional[str]]],
+        *,
+        concurrency: int = 4,
+        show_progress: bool = True,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, BaseException]]:
+        """
+        Download `items` of (url, destination, filename) with at most
+        `concurrency` transfers in flight.
+
+        Returns (results in input order for the successful ones, {url: error}).
+        """
+        items = list(items)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        board = MultiProgress(len(items)) if show_progress else None
+
+        async def _one(url: str, destination: os.PathLike | str, filename: Optional[str]):
+            label = filename or NBrouser._name_from_url(url) or url
+            async with semaphore:
+                try:
+                    result = await self.download(
+                        url,
+                        destination,
+                        filename=filename,
+                        show_progress=False,
+                        on_progress=board.callback(label) if board else None,
+                    )
+                except Exception as e:
+                    if board:
+                        board.finish(label, e)
+                    raise
+                if board:
+                    board.finish(label)
+                return result
+
+        outcomes = await asyncio.gather(
+            *(_one(url, dest, name) for url, dest, name in items), return_exceptions=True
+        )
+        if board:
+            board.close()
+
+        results: List[Dict[str, Any]] = []
+        errors: Dict[str, BaseException] = {}
+        for (url, _, _), outcome in zip(items, outcomes):
+            if isinstance(outcome, BaseException):
+                errors[url] = outcome
+            else:
+                results.append(outcome)
+        return results, errors
+
+
+class _ResponseContext:
+    """`async with` wrapper that returns the connection to the pool on exit."""
+
+    def __init__(self, browser: AsyncNBrouser, key: Tuple[str, str, int], conn: _Connection, response: AsyncResponse) -> None:
+        self._browser = browser
+        self._key = key
+        self._conn = conn
+        self.response = response
+
+    async def __aenter__(self) -> AsyncResponse:
+        return self.response
+
+    async def __aexit__(self, exc_type: Any, *exc_info: Any) -> None:
+        if exc_type is not None:
+            self._conn.close()
+        else:
+            self._browser._release(self._key, self._conn, self.response)
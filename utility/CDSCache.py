@@ -0,0 +1,139 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+Class-data-sharing (AppCDS) archives for faster server boots.
+
+One archive is kept per (server jar, Java runtime, JVM flags, launch mode)
+under `artifacts/cds/`. The key is built from file stats of the jar and the
+runtime's `lib/modules` plus the launch arguments (`-jar server.jar`, or
+Paperclip's `-cp <classpath> <main>`), so a new Paper build, a reinstalled
+JRE or a switch between launch modes gets a new archive automatically.
+
+    Java 19+   -XX:+AutoCreateSharedArchive: the JVM records, validates and
+               regenerates the archive itself
+    Java 13+   first boot records with -XX:ArchiveClassesAtExit into a
+               `.recording` file, which is promoted only after a clean exit;
+               later boots use -XX:SharedArchiveFile
+    older      no dynamic archives, nothing is added
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from utility.Trace import TRACER, traced
+
+Finalizer = Callable[[int], None]
+
+
+class CDSCache:
+    MIN_JAVA = 13  # -XX:ArchiveClassesAtExit
+    AUTO_JAVA = 19  # -XX:+AutoCreateSharedArchive
+    MAX_IDLE = 30 * 24 * 60 * 60  # prune archives unused for 30 days
+
+    def __init__(self, root: os.PathLike | str = "artifacts/cds") -> None:
+        self.root = pathlib.Path(root)
+
+    def key(
+        self,
+        java_bin: os.PathLike | str,
+        jar: os.PathLike | str,
+        jvm_flags: Sequence[str] = (),
+        launch: Sequence[str] = (),
+    ) -> str:
+        java_home = pathlib.Path(java_bin).resolve().parent.parent
+        parts = [
+            self._stat(java_home / "lib" / "modules"),
+            self._read(java_home / "release"),
+            self._stat(jar),
+            # Heap and GC flags must match for an archive to be mapped
+            sorted(f for f in jvm_flags if f.startswith("-XX:") or f.startswith("-Xm")),
+            # So must the classpath: an archive dumped for -jar is rejected under -cp
+            list(launch),
+        ]
+        return hashlib.sha256(json.dumps(parts).encode()).hexdigest()[:24]
+
+    def archive_path(self, key: str) -> pathlib.Path:
+        return self.root / f"{key}.jsa"
+
+    @traced("cds.options")
+    def options(
+        self,
+        java_major: int,
+        java_bin: os.PathLike | str,
+        jar: os.PathLike | str,
+        jvm_flags: Sequence[str] = (),
+        launch: Sequence[str] = (),
+    ) -> Tuple[List[str], Optional[Finalizer]]:
+        """
+        JVM options for this boot, plus a callback to run with the exit
+        code once the server stops (None when there is nothing to do).
+        `launch` is the `-jar ...` or `-cp ... <main>` part of the command.
+        """
+        if java_major < self.MIN_JAVA or not pathlib.Path(jar).is_file():
+            return [], None
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.prune()
+        archive = self.archive_path(self.key(java_bin, jar, jvm_flags, launch)).absolute()
+
+        TRACER.annotate(cache="hit" if archive.is_file() else "miss")
+        if java_major >= self.AUTO_JAVA:
+            self._touch(archive)
+            return ["-XX:+AutoCreateSharedArchive", f"-XX:SharedArchiveFile={archive}"], None
+
+        if archive.is_file():
+            self._touch(archive)
+            return [f"-XX:SharedArchiveFile={archive}", "-Xshare:auto"], None
+
+        # Unique per boot: several worlds on the same jar may be recording at once
+        recording = archive.with_name(f"{archive.name}.{os.getpid()}-{time.monotonic_ns()}.recording")
+        recording.unlink(missing_ok=True)
+
+        def _finalize(exit_code: int) -> None:
+            # A crashed or killed JVM may leave a truncated archive behind
+            if exit_code == 0 and recording.is_file() and recording.stat().st_size:
+                os.replace(recording, archive)
+            else:
+                recording.unlink(missing_ok=True)
+
+        return [f"-XX:ArchiveClassesAtExit={recording}"], _finalize
+
+    def prune(self, max_idle: float = MAX_IDLE) -> int:
+        """Delete archives not used for `max_idle` seconds; returns the count."""
+        removed = 0
+        cutoff = time.time() - max_idle
+        for path in self.root.glob("*.jsa"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+    @staticmethod
+    def _stat(path: os.PathLike | str) -> Optional[List[int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_size, st.st_mtime_ns]
+
+    @staticmethod
+    def _read(path: pathlib.Path) -> str:
+        try:
+            return path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return ""
+
+    @staticmethod
+    def _touch(path: pathlib.Path) -> None:
+        # mtime doubles as "last used" for prune()
+        if path.is_file():
+            os.utime(path)
@@ -0,0 +1,236 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+Asyncio console pipeline for a server's stdout.
+
+The reader drains the pipe in large chunks and never waits on anything
+downstream, so a chatty plugin cannot stall the JVM on a full pipe. Each
+batch of lines goes to:
+
+    ring buffer    the last `ring_size` lines, for `recent()` / `search()`
+    listeners      cheap synchronous callbacks (log parsers)
+    subscriptions  bounded async queues (terminal echo, TUI, sockets); a slow subscriber
+                   loses its oldest lines instead of slowing the reader
+    log file       batched, size-rotated writes done off the event loop
+"""
+from __future__ import annotations
+
+import asyncio
+import codecs
+import collections
+import os
+import pathlib
+import re
+from typing import Callable, Deque, List, Optional
+
+Listener = Callable[[List[str]], None]
+
+
+class RotatingLogFile:
+    """Append-only text log, rotated to `.1` ... `.<backups>` at `max_bytes`."""
+
+    def __init__(self, path: os.PathLike | str, *, max_bytes: int = 10 * 1024 * 1024, backups: int = 5) -> None:
+        self.path = pathlib.Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+
+    def write(self, data: str) -> None:
+        if self._size and self._size + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{i}")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backups > 0:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink(missing_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = 0
+
+
+class Subscription:
+    """Bounded async stream of console lines; iterate with `async for`."""
+
+    def __init__(self, pipeline: "ConsolePipeline", maxsize: int) -> None:
+        self._pipeline = pipeline
+        self._lines: Deque[Optional[str]] = collections.deque()
+        self._maxsize = maxsize
+        self._ready = asyncio.Event()
+        self.dropped = 0
+
+    def _push(self, lines: List[Optional[str]]) -> None:
+        self._lines.extend(lines)
+        overflow = len(self._lines) - self._maxsize
+        if overflow > 0:
+            for _ in range(overflow):
+                self._lines.popleft()
+            self.dropped += overflow
+        self._ready.set()
+
+    async def get(self) -> Optional[str]:
+        """Next line, or None once the server output has ended."""
+        while not self._lines:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._lines.popleft()
+
+    def drain(self) -> List[Optional[str]]:
+        """Every line buffered right now, without waiting (may end with None)."""
+        lines = list(self._lines)
+        self._lines.clear()
+        return lines
+
+    def close(self) -> None:
+        self._pipeline.unsubscribe(self)
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> str:
+        line = await self.get()
+        if line is None:
+            raise StopAsyncIteration
+        return line
+
+
+class ConsolePipeline:
+    READ_SIZE = 64 * 1024
+    RING_SIZE = 5000
+    FLUSH_INTERVAL = 0.5  # seconds between log writes
+    FLUSH_BYTES = 256 * 1024  # ...or sooner once this much is pending
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        log_path: Optional[os.PathLike | str] = None,
+        ring_size: int = RING_SIZE,
+        max_log_bytes: int = 10 * 1024 * 1024,
+        backups: int = 5,
+    ) -> None:
+        self.name = name
+        self.lines_seen = 0
+        self._ring: Deque[str] = collections.deque(maxlen=ring_size)
+        self._listeners: List[Listener] = []
+        self._subscriptions: List[Subscription] = []
+        self._log = (
+            RotatingLogFile(log_path, max_bytes=max_log_bytes, backups=backups)
+            if log_path else None
+        )
+        self._pending: List[str] = []
+        self._pending_bytes = 0
+        self._flush_now: Optional[asyncio.Event] = None
+        self._closed = False
+
+    # --- Consumers ---
+
+    def add_listener(self, listener: Listener) -> None:
+        """`listener(lines)` runs on the event loop for every batch; keep it cheap."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Listener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def subscribe(self, maxsize: int = 1000) -> Subscription:
+        subscription = Subscription(self, maxsize)
+        if self._closed:
+            subscription._push([None])
+        else:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+            subscription._push([None])
+
+    def recent(self, count: Optional[int] = None) -> List[str]:
+        lines = list(self._ring)
+        return lines if count is None else lines[-count:]
+
+    def search(self, pattern: str, *, limit: int = 100) -> List[str]:
+        """Buffered lines matching the regex `pattern`, newest last."""
+        regex = re.compile(pattern)
+        return [line for line in self._ring if regex.search(line)][-limit:]
+
+    # --- Producer ---
+
+    async def run(self, stream: asyncio.StreamReader) -> None:
+        """Consume `stream` until EOF, then flush and close everything."""
+        self._flush_now = asyncio.Event()
+        flusher = asyncio.create_task(self._flusher())
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        partial = ""
+
+        try:
+            while True:
+                chunk = await stream.read(self.READ_SIZE)
+                if not chunk:
+                    break
+                text = partial + decoder.decode(chunk)
+                *lines, partial = text.split("\n")
+                if lines:
+                    self.publish(lines)
+
+            tail = partial + decoder.decode(b"", final=True)
+            if tail:
+                self.publish([tail])
+        finally:
+            self._closed = True
+            self._flush_now.set()
+            await flusher
+            for subscription in self._subscriptions:
+                subscription._push([None])
+            self._subscriptions.clear()
+            if self._log:
+                self._log.close()
+
+    def publish(self, lines: List[str]) -> None:
+        lines = [line.rstrip("\r") for line in lines]
+        self.lines_seen += len(lines)
+        self._ring.extend(lines)
+
+        for listener in list(self._listeners):
+            listener(lines)
+        for subscription in self._subscriptions:
+            subscription._push(lines)
+
+        if self._log:
+            data = "\n".join(lines) + "\n"
+            self._pending.append(data)
+            self._pending_bytes += len(data)
+            if self._pending_bytes >= self.FLUSH_BYTES and self._flush_now:
+                self._flush_now.set()
+
+    async def _flusher(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), self.FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+
+            if self._pending and self._log:
+                data = "".join(self._pending)
+                self._pending, self._pending_bytes = [], 0
+                # File I/O happens on a worker thread, never on the reader's loop
+                await loop.run_in_executor(None, self._log.write, data)
+
+            if self._closed and not self._pending:
+                return
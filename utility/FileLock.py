@@ -0,0 +1,103 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+Cross-process exclusive locks on plain lock files.
+
+Used around cache entries (a Paper jar, a plugin, a JRE, a Paperclip patch)
+so that when several worlds are provisioned at once, one process does the
+download and the others wait and then reuse its result.
+
+    with FileLock("javas/.locks/java21.lock", description="Java 21"):
+        ...
+
+POSIX uses `fcntl.flock`, Windows `msvcrt.locking`. Both locks belong to
+the open file, so they also exclude other threads of the same process, and
+the OS drops them if the holder dies. Locks are not reentrant.
+"""
+from __future__ import annotations
+
+import os
+import pathlib
+import time
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class LockTimeout(TimeoutError):
+    pass
+
+
+class FileLock:
+    POLL_INTERVAL = 0.1
+
+    def __init__(
+        self,
+        path: os.PathLike | str,
+        *,
+        timeout: Optional[float] = None,
+        description: str = "",
+    ) -> None:
+        self.path = pathlib.Path(path)
+        self.timeout = timeout
+        self.description = description or self.path.stem
+        self._file = None
+
+    def acquire(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.path, "a+b")
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        announced = False
+
+        while True:
+            if self._try_lock(handle):
+                self._file = handle
+                return
+            if not announced:
+                print(f"⏳ Waiting for another process using {self.description}...")
+                announced = True
+            if deadline is not None and time.monotonic() >= deadline:
+                handle.close()
+                raise LockTimeout(f"Timed out waiting for lock {self.path}")
+            time.sleep(self.POLL_INTERVAL)
+
+    def release(self) -> None:
+        if self._file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+    @property
+    def locked(self) -> bool:
+        return self._file is not None
+
+    @staticmethod
+    def _try_lock(handle) -> bool:
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
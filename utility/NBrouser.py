@@ -33,10 +33,27 @@ import requests
 import urllib.parse
 import mimetypes
 import hashlib
+import json
 import time
 import sys
+import threading
 from typing import Optional, Callable, Dict, Any
 
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+from urllib3.util.retry import Retry
+
+from utility.Trace import traced
+
+
+def _trace_download(span, result: Dict[str, Any]) -> None:
+    unchanged = result.get("not_modified")
+    span.set(
+        file=pathlib.Path(result["path"]).name,
+        bytes=0 if unchanged else result.get("size", 0),
+        cache="revalidated" if unchanged else "miss",
+    )
+
 
 class NBrouser:
     """
@@ -46,20 +63,48 @@ class NBrouser:
       1. HTTP GET helpers
       2. Atomic downloads using `.tmp` files
       3. Deterministic, filename can be contomize sepratly 
+      4. Pooled session, safe to share between download threads
+      5. Segmented multi-connection downloads with per-segment resume
+      6. ETag / Last-Modified revalidation with a freshness TTL
     """
 
     DEFAULT_NAME = "download.bin"
     TEMP_SUFFIX = ".tmp"
+    PARTS_SUFFIX = ".parts"
+    VALIDATORS_SUFFIX = ".validators"
     CHUNK_SIZE = 64 * 1024  # 64 KB
+    MAX_CHUNK_SIZE = 1024 * 1024  # 1 MB, upper bound for adaptive chunk growth
+    MIN_SEGMENT_SIZE = 1024 * 1024  # 1 MB, smaller files use one stream
+    PROGRESS_INTERVAL = 0.1  # seconds, at most 10 progress updates per second
+    POOL_SIZE = 10
+    RETRIES = 3
+    SEGMENT_RETRIES = 3  # per range, after a mid-body failure
+    SEGMENT_BACKOFF = 0.5  # seconds, doubled per retry
 
     def __init__(
         self,
         *,
         base_headers: Optional[Dict[str, str]] = None,
         timeout: int = 20,
+        pool_size: int = POOL_SIZE,
     ):
         self._session = requests.Session()
         self._timeout = timeout
+
+        # One connection pool per host, big enough for every worker thread.
+        # Idempotent requests are retried on connection errors and 429/5xx.
+        retry = Retry(
+            total=self.RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET", "HEAD"),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
         self._session.headers.update(
             base_headers or {
                 "User-Agent": (
@@ -86,6 +131,24 @@ class NBrouser:
     def get_json(self, url: str, **kwargs) -> Any:
         return self.get(url, **kwargs).json()
 
+    def stream(self, url: str, *, validators: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        Open a streamed GET for callers that consume the body themselves
+        (`response.raw`). A 304 reply to `validators` is returned, not raised.
+        Use it as a context manager so the connection is released.
+        """
+        response = self._session.get(
+            url,
+            stream=True,
+            headers=self._conditional_headers(validators),
+            timeout=self._timeout,
+        )
+        if response.status_code != 304:
+            response.raise_for_status()
+        response.raw.decode_content = True
+        return response
+
+    @traced("nbrouser.download", on_result=_trace_download)
     def download(
     self,
     url: str,
@@ -94,93 +157,571 @@ class NBrouser:
     filename: Optional[str] = None,
     resume: bool = True,
     show_progress: bool = True,
-    on_progress: Optional[Callable[[int, Optional[int]], None]] = None
+    on_progress: Optional[Callable[[int, Optional[int]], None]] = None,
+    segments: int = 1,
+    validators: Optional[Dict[str, str]] = None,
+    conditional: bool = False,
+    max_age: Optional[float] = None,
+    probe: bool = False,
+    progress: Optional[str] = None,
 ) -> Dict[str, Any]:
+        """
+        Download `url` atomically into `destination`.
+
+        One GET does the work: the filename comes from its Content-Disposition
+        when `destination` is a directory and no `filename` is given, and an
+        existing `.tmp` is resumed with a speculative `Range` header guarded by
+        `If-Range` (kept on a 206 reply, restarted on a 200). A HEAD request is
+        only sent with `probe=True` or for segmented mode.
+
+        With `segments` > 1 and a server that advertises `Accept-Ranges: bytes`
+        and a `Content-Length`, the file is split into byte ranges fetched in
+        parallel over the pooled session. Otherwise a single stream is used.
+
+        Revalidation:
+          - `validators` ({"etag", "last_modified"}) are sent as
+            If-None-Match / If-Modified-Since; a 304 leaves the target as is.
+          - `conditional` keeps validators in a `.validators` file next to the
+            target and uses them when the target already exists. A target
+            checked less than `max_age` seconds ago is returned with no request.
+
+        The result has `not_modified` set when nothing was transferred, and
+        `validators` holding the ones the server sent.
+
+        `progress` picks the output: "line" (a `\\r` status line), "json" (one
+        JSON object per update, for logs and non-TTY use) or "none". It
+        defaults to "line" when `show_progress` is set. Output and `on_progress`
+        calls are throttled to PROGRESS_INTERVAL.
+        """
 
         dest = pathlib.Path(destination) if destination else pathlib.Path.cwd()
 
+        head_resp = None
+        cond_headers = self._conditional_headers(validators)
+        directory: Optional[pathlib.Path] = None
+        target_path: Optional[pathlib.Path]
+
         # If destination is a directory, we decide the filename.
         if dest.exists() and dest.is_dir():
-            dest.mkdir(parents=True, exist_ok=True)
-            head_resp = None
-            try:
-                head_resp = self._session.head(url, timeout=self._timeout, allow_redirects=True)
-                head_resp.raise_for_status()
-            except requests.RequestException:
-                pass
-
-            final_name = self._resolve_filename(url, filename, response=head_resp)
-            target_path = dest / final_name
+            directory = dest
+            # A valid user name fixes the target now; otherwise the reply names it
+            if filename and self._is_valid_filename(filename):
+                target_path = dest / self._sanitize_filename(filename)
+            else:
+                target_path = None
         else:
             # destination is a file path
             target_path = dest
             target_path.parent.mkdir(parents=True, exist_ok=True)
-            head_resp = None
 
-        temp_path = target_path.with_suffix(target_path.suffix + self.TEMP_SUFFIX)
+        if conditional and target_path is not None and target_path.exists():
+            stored = self._load_validators(self._meta_path(target_path))
+            if stored and stored.get("url") == url:
+                if max_age is not None and time.time() - stored.get("checked", 0) <= max_age:
+                    return self._unchanged_result(target_path, stored)
+                cond_headers = cond_headers or self._conditional_headers(stored)
+
+        if probe or segments > 1:
+            head_resp = self._head(url, headers=cond_headers)
+            if target_path is None:
+                target_path = directory / self._resolve_filename(url, filename, response=head_resp)
+
+        if head_resp is not None and head_resp.status_code == 304:
+            return self._finish_unchanged(target_path, url, head_resp, conditional)
 
-        supports_resume = False
+        supports_ranges = False
+        total_size: Optional[int] = None
         if head_resp:
-            supports_resume = head_resp.headers.get("Accept-Ranges", "").lower() == "bytes"
+            supports_ranges = head_resp.headers.get("Accept-Ranges", "").lower() == "bytes"
+            length = head_resp.headers.get("Content-Length")
+            total_size = int(length) if length and length.isdigit() else None
+
+        reporter = ProgressReporter(
+            progress or ("line" if show_progress else "none"),
+            on_progress=on_progress,
+            label=target_path.name if target_path else None,
+        )
 
-        headers = {}
-        mode = "wb"
-        written = 0
+        if (
+            segments > 1
+            and supports_ranges
+            and total_size
+            and total_size >= 2 * self.MIN_SEGMENT_SIZE
+        ):
+            temp_path = self._temp_path(target_path)
+            new_validators = self._extract_validators(head_resp)
+            written = self._download_segmented(
+                head_resp.url or url,
+                temp_path,
+                total_size,
+                segments=segments,
+                resume=resume,
+                reporter=reporter,
+                validators=new_validators,
+            )
+        else:
+            written, response, target_path = self._download_single(
+                url,
+                target_path,
+                directory=directory,
+                filename=filename,
+                resume=resume,
+                reporter=reporter,
+                headers=cond_headers,
+            )
+            if response.status_code == 304:
+                return self._finish_unchanged(target_path, url, response, conditional)
+            temp_path = self._temp_path(target_path)
+            new_validators = self._extract_validators(response)
 
-        if resume and supports_resume and temp_path.exists():
-            written = temp_path.stat().st_size
-            headers["Range"] = f"bytes={written}-"
-            mode = "ab"
+        temp_path.replace(target_path)
+        self._meta_path(temp_path).unlink(missing_ok=True)
 
-        start_time = time.time()
+        if conditional:
+            self._save_validators(self._meta_path(target_path), url, new_validators)
 
-        with self._session.get(url, stream=True, headers=headers, timeout=self._timeout) as response:
-            if response.status_code not in (200, 206):
-                response.raise_for_status()
+        reporter.finish(written)
 
-            total = self._compute_total_size(response, written)
+        elapsed = reporter.elapsed()
+        avg_speed = written / elapsed if elapsed > 0 else 0
 
-            with open(temp_path, mode) as stream:
-                for chunk in response.iter_content(self.CHUNK_SIZE):
-                    if not chunk:
-                        continue
+        return {
+            "path": target_path,
+            "size": written,
+            "speed": avg_speed,
+            "time": elapsed,
+            "not_modified": False,
+            "validators": new_validators,
+        }
 
-                    stream.write(chunk)
-                    written += len(chunk)
+    @classmethod
+    def _temp_path(cls, target_path: pathlib.Path) -> pathlib.Path:
+        return target_path.with_suffix(target_path.suffix + cls.TEMP_SUFFIX)
+
+    @classmethod
+    def _meta_path(cls, target_path: pathlib.Path) -> pathlib.Path:
+        return target_path.with_suffix(target_path.suffix + cls.VALIDATORS_SUFFIX)
+
+    def _head(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[requests.Response]:
+        try:
+            head_resp = self._session.head(
+                url, headers=headers, timeout=self._timeout, allow_redirects=True
+            )
+            head_resp.raise_for_status()
+            return head_resp
+        except requests.RequestException:
+            return None
 
-                    if on_progress:
-                        on_progress(written, total)
-                    elif show_progress:
-                        elapsed = time.time() - start_time
-                        speed = written / elapsed if elapsed > 0 else 0
+    # --- Resuming ---
 
-                        w_str = self.format_size_str(written)
-                        t_str = self.format_size_str(total) if total else "??"
-                        s_str = self.format_size_str(speed) + "/s"
+    @classmethod
+    def _resume_headers(cls, temp_path: pathlib.Path, url: str) -> tuple[int, Dict[str, str]]:
+        """
+        (bytes already in `temp_path`, Range + If-Range headers to continue it).
 
-                        if total:
-                            percent = written * 100 / total
-                            line = f"Downloading {w_str}/{t_str} ({percent:5.1f}%) @ {s_str}"
-                        else:
-                            line = f"Downloading {w_str} @ {s_str}"
+        If-Range carries the validator saved when the partial file was
+        started, so a URL that now serves a different file gets a full 200
+        instead of its tail being appended. A partial file with no saved
+        ETag or Last-Modified cannot be checked that way and is dropped.
+        """
+        try:
+            written = temp_path.stat().st_size
+        except OSError:
+            return 0, {}
+        if not written:
+            return 0, {}
+
+        stored = cls._load_validators(cls._meta_path(temp_path)) or {}
+        etag = stored.get("etag", "")
+        if stored.get("url") != url:
+            validator = None
+        elif etag and not etag.startswith("W/"):
+            validator = etag
+        else:
+            validator = stored.get("last_modified")
+
+        if not validator:
+            temp_path.unlink(missing_ok=True)
+            return 0, {}
+        return written, {"Range": f"bytes={written}-", "If-Range": validator}
+
+    @classmethod
+    def _remember_partial(cls, temp_path: pathlib.Path, url: str, response) -> None:
+        """Keep the validators of a fresh body next to its temp file for `_resume_headers`."""
+        meta_path = cls._meta_path(temp_path)
+        validators = cls._extract_validators(response)
+        if validators:
+            cls._save_validators(meta_path, url, validators)
+        else:
+            meta_path.unlink(missing_ok=True)
 
-                        print("\r" + line, end="", flush=True)
+    # --- Conditional requests ---
 
-        temp_path.replace(target_path)
+    @staticmethod
+    def _conditional_headers(validators: Optional[Dict[str, str]]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
 
-        if show_progress and not on_progress:
-            print()
+    @staticmethod
+    def _extract_validators(response: Optional[requests.Response]) -> Dict[str, str]:
+        if response is None:
+            return {}
+        validators = {}
+        if response.headers.get("ETag"):
+            validators["etag"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            validators["last_modified"] = response.headers["Last-Modified"]
+        return validators
 
-        elapsed = time.time() - start_time
-        avg_speed = written / elapsed if elapsed > 0 else 0
+    @staticmethod
+    def _load_validators(meta_path: pathlib.Path) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _save_validators(meta_path: pathlib.Path, url: str, validators: Dict[str, str]) -> None:
+        meta = {"url": url, "checked": time.time(), **validators}
+        meta_path.write_text(json.dumps(meta), encoding="utf-8")
 
+    def _finish_unchanged(
+        self,
+        target_path: pathlib.Path,
+        url: str,
+        response: requests.Response,
+        conditional: bool,
+    ) -> Dict[str, Any]:
+        """Handle a 304: keep the target, refresh the stored check time."""
+        validators = self._extract_validators(response)
+        if conditional:
+            meta_path = self._meta_path(target_path)
+            stored = self._load_validators(meta_path) or {}
+            stored.pop("url", None)
+            stored.pop("checked", None)
+            validators = {**stored, **validators}
+            self._save_validators(meta_path, url, validators)
+        return self._unchanged_result(target_path, validators)
+
+    @staticmethod
+    def _unchanged_result(target_path: pathlib.Path, validators: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "path": target_path,
-            "size": written,
-            "speed": avg_speed,
-            "time": elapsed
+            "size": target_path.stat().st_size if target_path.exists() else 0,
+            "speed": 0,
+            "time": 0,
+            "not_modified": True,
+            "validators": {
+                k: v for k, v in validators.items() if k in ("etag", "last_modified")
+            },
         }
 
+    def _download_single(
+        self,
+        url: str,
+        target_path: Optional[pathlib.Path],
+        *,
+        directory: Optional[pathlib.Path],
+        filename: Optional[str],
+        resume: bool,
+        reporter: "ProgressReporter",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> tuple[int, requests.Response, pathlib.Path]:
+        """
+        Stream `url` into the temp file of `target_path` over one connection.
+
+        When `target_path` is None it is named from the reply, inside
+        `directory`. Returns (bytes in temp file, response, target path);
+        nothing is written on a 304.
+        """
+        headers = dict(headers or {})
+        written = 0
+
+        temp_path = self._temp_path(target_path) if target_path else None
+        if resume and temp_path:
+            written, resume_headers = self._resume_headers(temp_path, url)
+            headers.update(resume_headers)
+
+        with self._session.get(url, stream=True, headers=headers, timeout=self._timeout) as response:
+            if target_path is None:
+                target_path = directory / self._resolve_filename(url, filename, response=response)
+                temp_path = self._temp_path(target_path)
+
+            if response.status_code == 304:
+                return written, response, target_path
+
+            if written and (
+                response.status_code == 416
+                or (response.status_code == 206 and not self._continues(response, written))
+            ):
+                # Stale or unusable partial file: drop it and fetch everything
+                temp_path.unlink(missing_ok=True)
+                response.close()
+                return self._download_single(
+                    url,
+                    target_path,
+                    directory=directory,
+                    filename=filename,
+                    resume=False,
+                    reporter=reporter,
+                    headers={k: v for k, v in headers.items() if k not in ("Range", "If-Range")},
+                )
+
+            if response.status_code not in (200, 206):
+                response.raise_for_status()
+
+            # 206 continues the partial file; 200 means the server ignored
+            # Range or If-Range found the file changed
+            if response.status_code == 206:
+                mode = "ab"
+            else:
+                written = 0
+                mode = "wb"
+                self._remember_partial(temp_path, url, response)
+
+            reporter.total = self._compute_total_size(response, written)
+            reporter.label = reporter.label or target_path.name
+
+            with open(temp_path, mode) as stream:
+                written = self._stream_to_file(response, stream, written, reporter.update)
+
+        return written, response, target_path
+
+    def _stream_to_file(
+        self,
+        response: requests.Response,
+        stream,
+        written: int,
+        report: Callable[[int], None],
+        limit: Optional[int] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> int:
+        """
+        Copy the response body into `stream`, returning the new byte count.
+
+        Uncompressed bodies are read with `readinto` into one preallocated
+        buffer; the read size starts at CHUNK_SIZE and doubles up to
+        MAX_CHUNK_SIZE while reads keep filling it. `limit` caps the bytes
+        copied (for range segments). A body shorter than its Content-Length
+        raises ConnectionError, so a dropped connection never completes a file.
+        """
+        raw = response.raw
+        encoding = response.headers.get("Content-Encoding", "identity").lower()
+
+        if encoding not in ("", "identity") or not hasattr(raw, "readinto"):
+            for chunk in response.iter_content(self.CHUNK_SIZE):
+                if cancel is not None and cancel.is_set():
+                    break
+                if limit is not None:
+                    chunk = chunk[:limit]
+                    limit -= len(chunk)
+                stream.write(chunk)
+                written += len(chunk)
+                report(written)
+                if limit == 0:
+                    break
+            return written
+
+        length = response.headers.get("Content-Length", "")
+        expected = int(length) if length.isdigit() else None
+        if limit is not None and expected is not None:
+            expected = min(expected, limit)
+        start = written
+
+        buffer = memoryview(bytearray(self.MAX_CHUNK_SIZE))
+        size = self.CHUNK_SIZE
+
+        while limit is None or limit > 0:
+            if cancel is not None and cancel.is_set():
+                break
+            want = size if limit is None else min(size, limit)
+            try:
+                n = raw.readinto(buffer[:want])
+            except (ProtocolError, ReadTimeoutError) as e:
+                raise requests.ConnectionError(e) from e
+            if not n:
+                break
+
+            stream.write(buffer[:n])
+            written += n
+            if limit is not None:
+                limit -= n
+            report(written)
+
+            if n == want and size < self.MAX_CHUNK_SIZE:
+                size *= 2
+
+        # Never let a short body pass as a complete one, whatever the urllib3
+        # version's content-length enforcement
+        stopped = cancel is not None and cancel.is_set()
+        if expected is not None and written - start < expected and not stopped:
+            raise requests.ConnectionError(
+                f"Connection closed after {written - start} of {expected} bytes"
+            )
+
+        return written
+
+    @staticmethod
+    def _continues(response: requests.Response, written: int) -> bool:
+        """True if a 206 reply's Content-Range picks up exactly at `written`."""
+        match = re.match(
+            r"\s*bytes\s+(\d+)-\d+/(\d+|\*)", response.headers.get("Content-Range", "")
+        )
+        if not match or int(match.group(1)) != written:
+            return False
+        return match.group(2) == "*" or written < int(match.group(2))
+
+    def _download_segmented(
+        self,
+        url: str,
+        temp_path: pathlib.Path,
+        total: int,
+        *,
+        segments: int,
+        resume: bool,
+        reporter: "ProgressReporter",
+        validators: Optional[Dict[str, str]] = None,
+    ) -> int:
+        """
+        Fetch `total` bytes of `url` as parallel byte ranges into a
+        preallocated `temp_path`.
+
+        A range whose connection drops is retried on its own from where it
+        stopped (SEGMENT_RETRIES, with backoff) while the others carry on.
+        Per-segment progress is kept in a `.parts` file next to the temp
+        file, so an interrupted download resumes every range where it stopped,
+        as long as the HEAD reply still carries the `validators` recorded there.
+        """
+        parts_path = temp_path.with_suffix(temp_path.suffix + self.PARTS_SUFFIX)
+
+        state = None
+        if resume and temp_path.exists() and parts_path.exists():
+            state = self._load_parts(parts_path, url, total, validators or {})
+        if state is None:
+            segments = max(1, min(segments, total // self.MIN_SEGMENT_SIZE))
+            step = total // segments
+            state = {
+                "url": url,
+                "size": total,
+                "validators": validators or {},
+                "segments": [
+                    [i * step, total - 1 if i == segments - 1 else (i + 1) * step - 1, 0]
+                    for i in range(segments)
+                ],
+            }
+            # Preallocate so each worker can seek to its own offset
+            with open(temp_path, "wb") as stream:
+                stream.truncate(total)
+
+        lock = threading.Lock()
+        cancel = threading.Event()
+        written = [sum(seg[2] for seg in state["segments"])]
+        reporter.total = total
+
+        def _fetch(seg: list) -> None:
+            seg_start, seg_end, done = seg
+            offset = seg_start + done
+            if offset > seg_end:
+                return
+
+            headers = {"Range": f"bytes={offset}-{seg_end}"}
+            with self._session.get(url, stream=True, headers=headers, timeout=self._timeout) as response:
+                if response.status_code != 206:
+                    response.raise_for_status()
+                    raise requests.HTTPError(
+                        f"Server ignored range request ({response.status_code})", response=response
+                    )
+
+                def _report(seg_written: int) -> None:
+                    with lock:
+                        written[0] += seg_written - seg[2]
+                        seg[2] = seg_written
+                        reporter.update(written[0])
+
+                with open(temp_path, "r+b") as stream:
+                    stream.seek(offset)
+                    self._stream_to_file(
+                        response,
+                        stream,
+                        done,
+                        _report,
+                        limit=seg_end + 1 - offset,
+                        cancel=cancel,
+                    )
+
+        errors: list = []
+        pool = [threading.Thread(target=self._run_segment, args=(_fetch, seg, cancel, errors), daemon=True)
+                for seg in state["segments"]]
+        try:
+            for worker in pool:
+                worker.start()
+            for worker in pool:
+                while worker.is_alive():
+                    worker.join(0.2)
+        finally:
+            cancel.set()
+            for worker in pool:
+                worker.join()
+            self._save_parts(parts_path, state)
+
+        incomplete = [seg for seg in state["segments"] if seg[0] + seg[2] <= seg[1]]
+        if incomplete:
+            raise requests.ConnectionError(
+                f"{len(incomplete)} of {len(state['segments'])} segments incomplete; retry to resume"
+            ) from (errors[0] if errors else None)
+
+        parts_path.unlink(missing_ok=True)
+        return written[0]
+
+    def _run_segment(
+        self,
+        fetch: Callable[[list], None],
+        seg: list,
+        cancel: threading.Event,
+        errors: list,
+    ) -> None:
+        """
+        Run `fetch(seg)`, retrying a dropped range from where it stopped.
+        Sibling segments keep going; a final error is appended to `errors`.
+        """
+        delay = self.SEGMENT_BACKOFF
+        for attempt in range(self.SEGMENT_RETRIES + 1):
+            try:
+                fetch(seg)
+                return
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                error = e
+            except Exception as e:
+                errors.append(e)
+                return
+            if attempt == self.SEGMENT_RETRIES or cancel.wait(delay):
+                break
+            delay *= 2
+        errors.append(error)
+
+    @staticmethod
+    def _load_parts(
+        parts_path: pathlib.Path, url: str, total: int, validators: Dict[str, str]
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            state = json.loads(parts_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if state.get("size") != total or state.get("url") != url:
+            return None
+        # Without validators a same-size new build could not be told apart
+        if not validators or state.get("validators") != validators:
+            return None
+        return state
+
+    @staticmethod
+    def _save_parts(parts_path: pathlib.Path, state: Dict[str, Any]) -> None:
+        parts_path.write_text(json.dumps(state), encoding="utf-8")
 
     @staticmethod
     def _compute_total_size(response: requests.Response, already_written: int) -> Optional[int]:
@@ -190,7 +731,8 @@ class NBrouser:
         size = int(length)
         return size + already_written if response.status_code == 206 else size
 
-    def _resolve_filename(self, url: str, user_name: Optional[str], response: Optional[requests.Response] = None) -> str:
+    @classmethod
+    def _resolve_filename(cls, url: str, user_name: Optional[str], response: Optional[requests.Response] = None) -> str:
         """
         Determine a safe, deterministic filename:
           1. User-supplied name (validated)
@@ -200,8 +742,8 @@ class NBrouser:
           5. Fallback: hashed name + extension from content-type
         """
         # 1. User-supplied
-        if user_name and self._is_valid_filename(user_name):
-            return self._sanitize_filename(user_name)
+        if user_name and cls._is_valid_filename(user_name):
+            return cls._sanitize_filename(user_name)
 
         # 2. From response headers
         header_name = None
@@ -217,21 +759,21 @@ class NBrouser:
                     match = re.search(r'filename\s*=\s*"?(.*?)"?($|;)', cd, flags=re.I)
                     if match:
                         header_name = match.group(1)
-            if header_name and self._is_valid_filename(header_name):
-                return self._sanitize_filename(header_name)
+            if header_name and cls._is_valid_filename(header_name):
+                return cls._sanitize_filename(header_name)
 
         # 3. From URL path
-        url_name = self._name_from_url(url)
-        if self._is_valid_filename(url_name):
-            return self._sanitize_filename(url_name)
+        url_name = cls._name_from_url(url)
+        if cls._is_valid_filename(url_name):
+            return cls._sanitize_filename(url_name)
 
         # 4. From query parameters
         parsed = urllib.parse.urlparse(url)
         query_name = urllib.parse.parse_qs(parsed.query).get("file")
         if query_name:
             query_name = query_name[0]
-            if self._is_valid_filename(query_name):
-                return self._sanitize_filename(query_name)
+            if cls._is_valid_filename(query_name):
+                return cls._sanitize_filename(query_name)
 
         # 5. Fallback: hash + extension from content type
         ext = ""
@@ -288,4 +830,153 @@ class NBrouser:
     @staticmethod
     def format_size_dict(size_bytes: int | float) -> dict:
         value, unit = NBrouser._compute_size(size_bytes)
-        return {"value": value, "unit": unit}
\ No newline at end of file
+        return {"value": value, "unit": unit}
+
+
+class ProgressReporter:
+    """
+    Throttled progress output for a single download.
+
+    Modes: "line" rewrites one status line, "json" prints one JSON object per
+    update and "none" stays silent. `on_progress`, when given, replaces the
+    printed output. Updates closer together than `interval` are dropped,
+    so the per-chunk cost is one clock read.
+    """
+
+    MODES = ("none", "line", "json")
+
+    def __init__(
+        self,
+        mode: str = "line",
+        *,
+        on_progress: Optional[Callable[[int, Optional[int]], None]] = None,
+        label: Optional[str] = None,
+        total: Optional[int] = None,
+        interval: Optional[float] = None,
+    ) -> None:
+        if mode not in self.MODES:
+            raise ValueError(f"progress must be one of {self.MODES}, got {mode!r}")
+        self.mode = mode
+        self.on_progress = on_progress
+        self.label = label
+        self.total = total
+        self.interval = NBrouser.PROGRESS_INTERVAL if interval is None else interval
+        self._start = time.monotonic()
+        self._next = 0.0
+        self._printed = False
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self._start
+
+    def update(self, written: int) -> None:
+        if self.mode == "none" and not self.on_progress:
+            return
+        now = time.monotonic()
+        if now < self._next:
+            return
+        self._next = now + self.interval
+        self._emit(written, now - self._start, "progress")
+
+    def finish(self, written: int) -> None:
+        """Emit the final state, whatever the throttle says."""
+        if self.mode == "none" and not self.on_progress:
+            return
+        self._emit(written, self.elapsed(), "done")
+        if self._printed and self.mode == "line":
+            print()
+
+    def _emit(self, written: int, elapsed: float, event: str) -> None:
+        if self.on_progress:
+            self.on_progress(written, self.total)
+            return
+
+        speed = written / elapsed if elapsed > 0 else 0
+        self._printed = True
+
+        if self.mode == "json":
+            print(json.dumps({
+                "event": event,
+                "file": self.label,
+                "written": written,
+                "total": self.total,
+                "speed": round(speed),
+                "elapsed": round(elapsed, 3),
+            }), flush=True)
+            return
+
+        w_str = NBrouser.format_size_str(written)
+        s_str = NBrouser.format_size_str(speed) + "/s"
+        if self.total:
+            t_str = NBrouser.format_size_str(self.total)
+            percent = written * 100 / self.total
+            line = f"Downloading {w_str}/{t_str} ({percent:5.1f}%) @ {s_str}"
+        else:
+            line = f"Downloading {w_str} @ {s_str}"
+        print("\r" + line, end="", flush=True)
+
+
+class MultiProgress:
+    """
+    Combined progress line for several downloads running at once.
+
+    Every download reports through its own `callback(name)`; the board keeps
+    one status line and prints finished files above it, so threads never
+    interleave their `\\r` output.
+    """
+
+    REFRESH_INTERVAL = 0.2  # seconds
+
+    def __init__(self, total_files: int, *, stream=None) -> None:
+        self._lock = threading.Lock()
+        self._stream = stream or sys.stdout
+        self._total_files = total_files
+        self._done_files = 0
+        self._done_bytes = 0
+        self._progress: Dict[str, tuple[int, Optional[int]]] = {}
+        self._last_render = 0.0
+        self._start_time = time.time()
+
+    def callback(self, name: str) -> Callable[[int, Optional[int]], None]:
+        """Return an `on_progress` callback bound to `name`."""
+
+        def _on_progress(written: int, total: Optional[int]) -> None:
+            with self._lock:
+                self._progress[name] = (written, total)
+                now = time.time()
+                if now - self._last_render >= self.REFRESH_INTERVAL:
+                    self._last_render = now
+                    self._render()
+
+        return _on_progress
+
+    def finish(self, name: str, error: Optional[BaseException] = None) -> None:
+        """Mark `name` as finished and print its result line."""
+        with self._lock:
+            self._done_files += 1
+            written, _ = self._progress.pop(name, (0, None))
+            self._done_bytes += written
+            if error is None:
+                line = f"✔ {name} ({NBrouser.format_size_str(written)})"
+            else:
+                line = f"✖ {name}: {error}"
+            self._stream.write("\r\033[K" + line + "\n")
+            self._render()
+
+    def close(self) -> None:
+        with self._lock:
+            self._stream.write("\r\033[K")
+            self._stream.flush()
+
+    def _render(self) -> None:
+        written = self._done_bytes + sum(w for w, _ in self._progress.values())
+        elapsed = time.time() - self._start_time
+        speed = written / elapsed if elapsed > 0 else 0
+
+        line = (
+            f"Downloading {self._done_files}/{self._total_files} files | "
+            f"{len(self._progress)} active | {NBrouser.format_size_str(written)}"
+            f" @ {NBrouser.format_size_str(speed)}/s"
+        )
+
+        self._stream.write("\r\033[K" + line)
+        self._stream.flush()
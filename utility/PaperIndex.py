@@ -0,0 +1,109 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+Local index of PaperMC projects, versions and builds.
+
+Answers come from a JSON file while it is younger than `ttl`, so provisioning
+many worlds asks the PaperMC API once. When the API is unreachable the last
+known data is used, and `offline=True` never touches the network at all.
+"""
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from utility.Trace import TRACER
+
+
+class PaperIndexError(RuntimeError):
+    pass
+
+
+class PaperIndex:
+    API_BASE = "https://api.papermc.io/v2/projects"
+    DEFAULT_TTL = 6 * 60 * 60  # 6 hours
+
+    def __init__(
+        self,
+        browser,
+        path: os.PathLike | str = "versions/paper_index.json",
+        *,
+        ttl: float = DEFAULT_TTL,
+        offline: bool = False,
+    ) -> None:
+        self.browser = browser
+        self.path = pathlib.Path(path)
+        self.ttl = ttl
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    # --- Queries ---
+
+    def projects(self) -> List[str]:
+        return self._query("projects", self.API_BASE, "projects")
+
+    def versions(self, project: str = "paper") -> List[str]:
+        return self._query(f"versions/{project}", f"{self.API_BASE}/{project}", "versions")
+
+    def builds(self, version: str, project: str = "paper") -> List[int]:
+        return self._query(
+            f"builds/{project}/{version}",
+            f"{self.API_BASE}/{project}/versions/{version}",
+            "builds",
+        )
+
+    def latest_build(self, version: str, project: str = "paper") -> int:
+        builds = self.builds(version, project)
+        if not builds:
+            raise PaperIndexError(f"No {project} builds published for {version}")
+        return builds[-1]
+
+    def download(self, version: str, build: Optional[int] = None, project: str = "paper") -> Tuple[str, str]:
+        """(download URL, jar file name) for `version`, latest build by default."""
+        build = build if build is not None else self.latest_build(version, project)
+        jar_name = f"{project}-{version}-{build}.jar"
+        url = f"{self.API_BASE}/{project}/versions/{version}/builds/{build}/downloads/{jar_name}"
+        return url, jar_name
+
+    # --- Cache ---
+
+    def _query(self, key: str, url: str, field: str) -> Any:
+        with self._lock, TRACER.span("paper_index", key=key, cache="hit") as span:
+            entry = self._data.get(key)
+            if entry and (self.offline or time.time() - entry["fetched"] <= self.ttl):
+                return entry["value"]
+
+            span.set(cache="miss")
+
+            if self.offline:
+                raise PaperIndexError(f"Offline mode: nothing cached for {key}")
+
+            try:
+                value = self.browser.get_json(url)[field]
+            except Exception as e:
+                if entry:
+                    print(f"⚠ PaperMC API unreachable ({e}); using cached {key}")
+                    return entry["value"]
+                raise PaperIndexError(f"Failed to fetch PaperMC {key}: {e}") from e
+
+            self._data[key] = {"fetched": time.time(), "value": value}
+            self._save()
+            return value
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self._data, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
@@ -0,0 +1,186 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+Shared Paperclip patch output, so each Paper build is patched once.
+
+A Paper `server.jar` is a Paperclip launcher: on first boot it downloads the
+Mojang jar, patches it and unpacks `libraries/` into the world folder. Here
+that work happens once per build, in `artifacts/paperclip/<digest>/`:
+
+    java -DbundlerRepoDir=<dir> -Dpaperclip.patchonly=true -jar server.jar
+
+The jar's own `META-INF/versions.list`, `libraries.list` and `main-class`
+then give the classpath and main class, and worlds launch the patched
+server directly with `-cp ... <main class>`, skipping Paperclip entirely.
+Pre-1.18 jars (no bundler metadata) return None and keep using `-jar`.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+import subprocess
+import zipfile
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from utility.FileLock import FileLock
+from utility.Trace import TRACER, traced
+
+
+@dataclass
+class LaunchSpec:
+    main_class: str
+    classpath: List[pathlib.Path]
+
+    def args(self) -> List[str]:
+        return ["-cp", os.pathsep.join(str(p) for p in self.classpath), self.main_class]
+
+
+class PaperclipCache:
+    SPEC_NAME = "launch.json"
+    DIGEST_INDEX = "digests.json"
+    HASH_CHUNK = 1024 * 1024  # 1 MB
+    PATCH_TIMEOUT = 600  # seconds; patching downloads the Mojang jar
+
+    def __init__(self, root: os.PathLike | str = "artifacts/paperclip") -> None:
+        self.root = pathlib.Path(root)
+
+    @traced("paperclip.prepare")
+    def prepare(self, java_bin: os.PathLike | str, jar: os.PathLike | str) -> Optional[LaunchSpec]:
+        """
+        LaunchSpec for the patched server inside `jar`, patching it into the
+        shared cache on first use. None if `jar` is not a bundler jar or
+        patching failed; the caller then falls back to `-jar`.
+        """
+        jar = pathlib.Path(jar)
+        if not jar.is_file():
+            return None
+
+        meta = self._bundler_metadata(jar)
+        if meta is None:
+            return None
+
+        repo = self.root / self._jar_digest(jar)
+        spec = self._load_spec(repo)
+        if spec:
+            TRACER.annotate(cache="hit")
+            return spec
+
+        TRACER.annotate(cache="miss")
+        with FileLock(self.root / ".locks" / f"{repo.name}.lock", description="the Paperclip patch"):
+            # Another world may have finished patching while we waited
+            return self._load_spec(repo) or self._patch(java_bin, jar, meta, repo)
+
+    def _patch(self, java_bin: os.PathLike | str, jar: pathlib.Path, meta: Dict[str, object], repo: pathlib.Path) -> Optional[LaunchSpec]:
+        print("⚙ Patching Paper once for all worlds on this build...")
+        staging = repo.with_name(repo.name + ".partial")
+        if staging.exists():
+            shutil.rmtree(staging)
+        staging.mkdir(parents=True)
+        # Patching runs inside `staging`, so a relative java path must be pinned
+        java = os.path.abspath(java_bin) if os.path.dirname(str(java_bin)) else str(java_bin)
+
+        try:
+            result = subprocess.run(
+                [
+                    java,
+                    f"-DbundlerRepoDir={staging.absolute()}",
+                    "-Dpaperclip.patchonly=true",
+                    "-jar",
+                    str(jar.absolute()),
+                ],
+                cwd=str(staging),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                timeout=self.PATCH_TIMEOUT,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            shutil.rmtree(staging, ignore_errors=True)
+            print(f"⚠ Paperclip patching failed ({e}); using the jar directly")
+            return None
+
+        classpath = [
+            pathlib.Path("versions") / path for path in meta["versions"]
+        ] + [
+            pathlib.Path("libraries") / path for path in meta["libraries"]
+        ]
+        missing = [p for p in classpath if not (staging / p).is_file()]
+        if result.returncode != 0 or missing:
+            shutil.rmtree(staging, ignore_errors=True)
+            print(f"⚠ Paperclip patching failed (exit {result.returncode}); using the jar directly")
+            return None
+
+        spec_data = {"main_class": meta["main_class"], "classpath": [p.as_posix() for p in classpath]}
+        (staging / self.SPEC_NAME).write_text(json.dumps(spec_data, indent=1), encoding="utf-8")
+
+        if repo.exists():
+            shutil.rmtree(repo)
+        os.replace(staging, repo)
+        return self._load_spec(repo)
+
+    # --- Bundler metadata ---
+
+    @staticmethod
+    def _bundler_metadata(jar: pathlib.Path) -> Optional[Dict[str, object]]:
+        try:
+            with zipfile.ZipFile(jar) as archive:
+                names = set(archive.namelist())
+                required = ("META-INF/main-class", "META-INF/versions.list", "META-INF/libraries.list")
+                if not all(name in names for name in required):
+                    return None
+
+                def _paths(name: str) -> List[str]:
+                    # Each line: <sha256>\t<id>\t<path under versions/ or libraries/>
+                    text = archive.read(name).decode("utf-8")
+                    return [line.split("\t")[2] for line in text.splitlines() if line.strip()]
+
+                return {
+                    "main_class": archive.read("META-INF/main-class").decode("utf-8").strip(),
+                    "versions": _paths("META-INF/versions.list"),
+                    "libraries": _paths("META-INF/libraries.list"),
+                }
+        except (OSError, zipfile.BadZipFile, IndexError, KeyError):
+            return None
+
+    def _load_spec(self, repo: pathlib.Path) -> Optional[LaunchSpec]:
+        try:
+            data = json.loads((repo / self.SPEC_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        classpath = [(repo / p).absolute() for p in data["classpath"]]
+        if not all(p.is_file() for p in classpath):
+            return None
+        return LaunchSpec(data["main_class"], classpath)
+
+    # --- Jar identity ---
+
+    def _jar_digest(self, jar: pathlib.Path) -> str:
+        """SHA-256 of `jar`, memoized by (size, mtime) so boots skip re-hashing."""
+        index_path = self.root / self.DIGEST_INDEX
+        try:
+            index = json.loads(index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            index = {}
+
+        st = jar.stat()
+        key = str(jar.absolute())
+        cached = index.get(key)
+        if cached and cached[:2] == [st.st_size, st.st_mtime_ns]:
+            return cached[2]
+
+        digest = hashlib.sha256()
+        with open(jar, "rb") as stream:
+            for chunk in iter(lambda: stream.read(self.HASH_CHUNK), b""):
+                digest.update(chunk)
+
+        index[key] = [st.st_size, st.st_mtime_ns, digest.hexdigest()]
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(index, indent=1), encoding="utf-8")
+        os.replace(tmp, index_path)
+        return index[key][2]
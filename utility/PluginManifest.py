@@ -0,0 +1,132 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+Record of the plugins NHostAPI installed into a world.
+
+`servers/<world>/plugins/.nhost-plugins.json` maps each plugin file name to
+the URL it came from and the SHA-256 of the installed jar. Comparing that
+with the wanted plugin list gives the add / update / remove diff, so a sync
+only touches jars that actually changed. Jars the user dropped in by hand
+are not in the manifest and are never removed.
+
+It also keeps the extra plugins chosen at Full Setup (`extras`) and the
+Minecraft version their releases were resolved for (`mc_version`), so a
+sync that is not given a new choice (Quick Start, --supervise) reinstalls
+the same plugins instead of removing or re-resolving them.
+"""
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class PluginDiff:
+    add: List[str] = field(default_factory=list)
+    update: List[str] = field(default_factory=list)
+    remove: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.add or self.update or self.remove)
+
+    def summary(self) -> str:
+        return (
+            f"+{len(self.add)} added, ~{len(self.update)} updated, "
+            f"-{len(self.remove)} removed, {len(self.unchanged)} unchanged"
+        )
+
+
+class PluginManifest:
+    FILE_NAME = ".nhost-plugins.json"
+
+    def __init__(self, plugins_dir: os.PathLike | str) -> None:
+        self.plugins_dir = pathlib.Path(plugins_dir)
+        self.path = self.plugins_dir / self.FILE_NAME
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        # (name, url) of the chosen extras; None in manifests written before they were kept
+        self.extras: Optional[List[Tuple[str, str]]] = None
+        self.mc_version: Optional[str] = None
+        self._load()
+
+    def diff(
+        self,
+        wanted: Dict[str, Dict[str, Any]],
+        *,
+        keep: Iterable[str] = (),
+    ) -> PluginDiff:
+        """
+        wanted: {file name: {"url": ..., "digest": ..., "size": ...}}
+        keep: names to leave alone even if not wanted (e.g. failed downloads)
+        """
+        keep = set(keep)
+        result = PluginDiff()
+
+        for name, want in wanted.items():
+            have = self.entries.get(name)
+            installed = self.plugins_dir / name
+            if have is None:
+                result.add.append(name)
+            elif (
+                have.get("digest") != want.get("digest")
+                or not installed.is_file()
+                or installed.stat().st_size != want.get("size")
+            ):
+                result.update.append(name)
+            else:
+                result.unchanged.append(name)
+
+        for name in self.entries:
+            if name not in wanted and name not in keep:
+                result.remove.append(name)
+
+        return result
+
+    def record(
+        self,
+        wanted: Dict[str, Dict[str, Any]],
+        diff: PluginDiff,
+        *,
+        extras: Optional[Iterable[Tuple[str, str]]] = None,
+        mc_version: Optional[str] = None,
+    ) -> None:
+        """Apply `diff` to the entries, replace `extras` / `mc_version` if given, and write the manifest."""
+        now = time.time()
+        for name in diff.add + diff.update:
+            self.entries[name] = {**wanted[name], "installed": now}
+        for name in diff.remove:
+            self.entries.pop(name, None)
+        if extras is not None:
+            self.extras = [(name, url) for name, url in extras]
+        if mc_version is not None:
+            self.mc_version = mc_version
+        self._save()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+        self.entries = data.get("plugins", {})
+        if data.get("extras") is not None:
+            self.extras = [(name, url) for name, url in data["extras"]]
+        self.mc_version = data.get("mc_version")
+
+    def _save(self) -> None:
+        self.plugins_dir.mkdir(parents=True, exist_ok=True)
+        data: Dict[str, Any] = {"plugins": self.entries}
+        if self.extras is not None:
+            data["extras"] = self.extras
+        if self.mc_version is not None:
+            data["mc_version"] = self.mc_version
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(data, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
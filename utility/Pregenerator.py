@@ -0,0 +1,231 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+Chunk pre-generation with Chunky before a world goes public.
+
+The server is booted headless and private (localhost only, on a spare
+port, with no player slots), Chunky is driven through its stdin
+(`chunky world/radius/spawn/start`), progress is read back from the console
+by `LogEventParser`, and the server is stopped cleanly once the task
+finishes. State lives in `servers/<world>/.nhost-pregen.json`, so an
+interrupted run resumes with `chunky continue` (Chunky saves its own task
+progress on shutdown) and a finished radius is never generated twice.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import pathlib
+import socket
+import time
+from typing import Any, Dict, List, Optional
+
+from utility.ConsolePipeline import ConsolePipeline
+from utility.ServerMetrics import LogEventParser, MetricsRegistry
+from utility.Supervisor import LOG_DIR
+
+
+class PregenError(RuntimeError):
+    pass
+
+
+class Pregenerator:
+    STATE_NAME = ".nhost-pregen.json"
+    BOOT_TIMEOUT = 600  # seconds until "Done (...)"
+    RESUME_GRACE = 30  # seconds to see progress after `chunky continue`
+    REPORT_INTERVAL = 10  # seconds between progress lines and state saves
+    STOP_TIMEOUT = 120
+    PRIVATE_HOST = "127.0.0.1"
+
+    def __init__(self, server, radius: int, *, world: str = "world") -> None:
+        self.server = server
+        self.radius = int(radius)
+        self.world = world
+        self.name = str(server.config["world_name"])
+        self.state_path = pathlib.Path(server.world_dir) / self.STATE_NAME
+        self.state: Dict[str, Any] = self._load()
+
+    @classmethod
+    def pending(cls, world_dir: os.PathLike | str) -> Optional[Dict[str, Any]]:
+        """Saved state of an unfinished pre-generation in `world_dir`, if any."""
+        try:
+            state = json.loads((pathlib.Path(world_dir) / cls.STATE_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return state if state.get("status") != "done" else None
+
+    @property
+    def done(self) -> bool:
+        return (
+            self.state.get("status") == "done"
+            and self.state.get("radius") == self.radius
+            and self.state.get("world") == self.world
+        )
+
+    def run(self) -> Dict[str, Any]:
+        """Generate (or resume) and return the final state as a report."""
+        if self.done:
+            print(f"✔ {self.name}: radius {self.radius} already pre-generated")
+            return self.state
+        return asyncio.run(self._run())
+
+    # --- Driver ---
+
+    async def _run(self) -> Dict[str, Any]:
+        resume = (
+            self.state.get("status") == "running"
+            and self.state.get("radius") == self.radius
+            and self.state.get("world") == self.world
+        )
+        if not resume:
+            self.state = {
+                "world": self.world,
+                "radius": self.radius,
+                "status": "running",
+                "percent": 0.0,
+                "chunks": 0,
+                "elapsed": 0.0,
+                "runs": 0,
+            }
+        self.state["runs"] = self.state.get("runs", 0) + 1
+        self._save()
+
+        metrics = MetricsRegistry()
+        console = ConsolePipeline(self.name, log_path=LOG_DIR / self.name / "pregen.log")
+        console.add_listener(LogEventParser(metrics, self.name))
+        lines = console.subscribe(maxsize=10000)
+
+        process = await asyncio.create_subprocess_exec(
+            *self.server.build_command(self._private_args()),
+            cwd=str(self.server.world_dir),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+        pump = asyncio.create_task(console.run(process.stdout))
+
+        async def send(command: str) -> None:
+            process.stdin.write((command + "\n").encode())
+            await process.stdin.drain()
+
+        async def start_fresh() -> None:
+            await send("chunky start")
+            await send("chunky confirm")  # overwrite a stale saved task, if asked
+
+        started = time.monotonic()
+        base_elapsed = self.state.get("elapsed", 0.0)
+        print(f"⛏ {self.name}: pre-generating radius {self.radius} "
+              f"({'resuming at %.1f%%' % self.state['percent'] if resume else 'new task'})")
+
+        try:
+            await asyncio.wait_for(self._wait_for(lines, "Done ("), self.BOOT_TIMEOUT)
+
+            for command in (f"chunky world {self.world}", f"chunky radius {self.radius}", "chunky spawn"):
+                await send(command)
+            if resume:
+                await send("chunky continue")
+            else:
+                await start_fresh()
+
+            last_report = time.monotonic()
+            last_progress = time.monotonic()
+            while True:
+                try:
+                    line = await asyncio.wait_for(lines.get(), self.REPORT_INTERVAL)
+                except asyncio.TimeoutError:
+                    line = ""
+                if line is None:
+                    raise PregenError("server exited during pre-generation")
+
+                if "[Chunky]" in line:
+                    if "Processed:" in line:
+                        last_progress = time.monotonic()
+                    if "Task finished" in line:
+                        break
+
+                now = time.monotonic()
+                lost = resume and (
+                    "no tasks" in line.lower()
+                    or now - last_progress > self.RESUME_GRACE
+                )
+                if lost:
+                    # Chunky has no saved task to continue; start over for this radius
+                    resume = False
+                    last_progress = now
+                    await start_fresh()
+
+                if now - last_report >= self.REPORT_INTERVAL:
+                    last_report = now
+                    self._update(metrics, base_elapsed + now - started)
+                    self._save()
+                    print(f"⛏ {self.name}: {self.state['percent']:.1f}% "
+                          f"({self.state['chunks']} chunks, {self.state['rate']:.0f} cps)")
+
+            self._update(metrics, base_elapsed + time.monotonic() - started)
+            self.state["status"] = "done"
+            self.state["percent"] = 100.0
+            self.state["finished"] = time.time()
+        finally:
+            if process.returncode is None:
+                await send("stop")
+                try:
+                    await asyncio.wait_for(process.wait(), self.STOP_TIMEOUT)
+                except asyncio.TimeoutError:
+                    process.kill()
+            code = await process.wait()
+            await pump
+            after_exit = getattr(self.server, "after_exit", None)
+            if after_exit:
+                after_exit(code)
+            if self.state["status"] == "running":
+                self._update(metrics, base_elapsed + time.monotonic() - started)
+            self._save()
+
+        minutes, seconds = divmod(int(self.state["elapsed"]), 60)
+        print(f"✔ {self.name}: radius {self.radius} pre-generated, "
+              f"{self.state['chunks']} chunks in {minutes}m{seconds:02d}s")
+        return self.state
+
+    @classmethod
+    def _private_args(cls) -> List[str]:
+        """
+        Server options that keep the world closed while it generates: bound
+        to localhost on a free port, and no player slots (which also turns
+        away Bedrock players coming in through Geyser).
+        """
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+            probe.bind((cls.PRIVATE_HOST, 0))
+            port = probe.getsockname()[1]
+        return ["--host", cls.PRIVATE_HOST, "--port", str(port), "--max-players", "0"]
+
+    @staticmethod
+    async def _wait_for(lines, needle: str) -> None:
+        while True:
+            line = await lines.get()
+            if line is None:
+                raise PregenError(f"server exited before '{needle}'")
+            if needle in line:
+                return
+
+    def _update(self, metrics: MetricsRegistry, elapsed: float) -> None:
+        chunks = int(metrics.chunky_chunks.get(world=self.name))
+        if chunks:
+            self.state["chunks"] = chunks
+            self.state["percent"] = metrics.chunky_percent.get(world=self.name)
+        self.state["rate"] = metrics.chunky_rate.get(world=self.name)
+        self.state["elapsed"] = round(elapsed, 1)
+
+    # --- State ---
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+        tmp.write_text(json.dumps(self.state, indent=1), encoding="utf-8")
+        os.replace(tmp, self.state_path)
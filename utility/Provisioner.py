@@ -0,0 +1,243 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+Cheap placement of cached files (server.jar, plugins) into world folders.
+
+Each file is placed with the cheapest method that works:
+
+    skip      the destination already matches (size + mtime)
+    reflink   copy-on-write clone (btrfs, XFS, APFS...), no data written
+    hardlink  second name for the same inode; only for `hardlink_names`
+              (server.jar by default) or with allow_hardlink=True
+    copy      full copy, when none of the above applies
+
+Cached files are hardlinked into the artifact store's blobs, so a world
+file sharing that inode lets anything that rewrites it in place corrupt
+the cache for every world. The JVM only ever reads server.jar, which is
+why it alone is hardlinked by default (no reflink on ext4, and it is the
+big one); plugin jars and configs that updaters may rewrite are copied.
+
+The destination is written through a temporary name and renamed, so a world
+never sees a half-copied jar.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import pathlib
+import shutil
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Collection, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl(dest_fd, FICLONE, src_fd) from <linux/fs.h>
+FICLONE = 0x40049409
+
+
+@dataclass
+class Placement:
+    path: pathlib.Path
+    method: str  # "skip" | "reflink" | "hardlink" | "copy"
+    size: int
+    staged: Optional[pathlib.Path] = None  # temp file waiting for commit()
+
+    @property
+    def bytes_saved(self) -> int:
+        return 0 if self.method == "copy" else self.size
+
+
+class Provisioner:
+    METHODS = ("skip", "reflink", "hardlink", "copy")
+    HASH_CHUNK = 1024 * 1024  # 1 MB
+    LOCK_RETRIES = 8  # Windows: a running server may hold the old file open
+    READ_ONLY_NAMES = ("server.jar",)  # only ever read, safe to share with the cache
+
+    def __init__(
+        self,
+        *,
+        allow_hardlink: bool = False,
+        hardlink_names: Collection[str] = READ_ONLY_NAMES,
+        verify_digest: bool = False,
+    ) -> None:
+        """
+        allow_hardlink: hardlink every file. Hardlinks share the inode with
+        the cache, so a tool that rewrites the file in place would change
+        the cached copy too.
+        hardlink_names: destination file names hardlinked even without it.
+        verify_digest: compare SHA-256 instead of trusting size + mtime.
+        """
+        self.allow_hardlink = allow_hardlink
+        self.hardlink_names = frozenset(hardlink_names)
+        self.verify_digest = verify_digest
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    # --- Public API ---
+
+    def place(self, src: os.PathLike | str, dst: os.PathLike | str, *, overwrite: bool = True) -> Placement:
+        """
+        Make `dst` hold the content of `src`. An existing `dst` that differs
+        is replaced unless `overwrite` is False.
+        """
+        return self.commit(self.stage(src, dst, overwrite=overwrite))
+
+    def stage(self, src: os.PathLike | str, dst: os.PathLike | str, *, overwrite: bool = True) -> Placement:
+        """
+        First half of `place`: materialize `src` next to `dst` without
+        touching `dst`. Staging a batch before committing any of it keeps a
+        failure from leaving the batch half applied.
+        """
+        src = pathlib.Path(src)
+        dst = pathlib.Path(dst)
+
+        if not src.is_file():
+            raise FileNotFoundError(src)
+
+        size = src.stat().st_size
+
+        if dst.exists() and (not overwrite or self.matches(src, dst)):
+            return Placement(dst, "skip", size)
+
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dst.with_name(f".{dst.name}.provision")
+        tmp.unlink(missing_ok=True)
+
+        try:
+            method = self._materialize(src, tmp, hardlink=self._may_hardlink(dst))
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+        return Placement(dst, method, size, staged=tmp)
+
+    def commit(self, placement: Placement) -> Placement:
+        """Rename a staged file over its destination."""
+        if placement.staged is not None:
+            try:
+                self._replace(placement.staged, placement.path)
+            except BaseException:
+                self.discard(placement)
+                raise
+            placement.staged = None
+        return self._record(placement)
+
+    @staticmethod
+    def discard(placement: Placement) -> None:
+        if placement.staged is not None:
+            placement.staged.unlink(missing_ok=True)
+            placement.staged = None
+
+    def matches(self, src: pathlib.Path, dst: pathlib.Path) -> bool:
+        """True when `dst` already has the content of `src`."""
+        try:
+            if os.path.samefile(src, dst):
+                # A hardlink into the cache is replaced unless links are allowed here
+                return self._may_hardlink(dst)
+            a, b = src.stat(), dst.stat()
+        except OSError:
+            return False
+
+        if a.st_size != b.st_size:
+            return False
+        if self.verify_digest:
+            return self._digest(src) == self._digest(dst)
+        return a.st_mtime_ns == b.st_mtime_ns
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats: Dict[str, int] = {m: 0 for m in self.METHODS}
+            self.bytes_saved = 0
+            self.bytes_copied = 0
+
+    def summary(self) -> str:
+        placed = ", ".join(f"{self.stats[m]} {m}" for m in self.METHODS if self.stats[m])
+        return (
+            f"{placed or 'nothing placed'} | "
+            f"{self.bytes_saved / 1024 / 1024:.1f} MB saved, "
+            f"{self.bytes_copied / 1024 / 1024:.1f} MB copied"
+        )
+
+    # --- Placement methods ---
+
+    def _may_hardlink(self, dst: pathlib.Path) -> bool:
+        return self.allow_hardlink or dst.name in self.hardlink_names
+
+    def _materialize(self, src: pathlib.Path, tmp: pathlib.Path, *, hardlink: bool) -> str:
+        if self._reflink(src, tmp):
+            return "reflink"
+
+        if hardlink:
+            try:
+                os.link(src, tmp)
+                return "hardlink"
+            except OSError:
+                pass
+
+        # copy2 keeps the mtime, so the next run sees a match and skips
+        shutil.copy2(src, tmp)
+        return "copy"
+
+    @staticmethod
+    def _reflink(src: pathlib.Path, tmp: pathlib.Path) -> bool:
+        if sys.platform == "darwin":
+            return Provisioner._clonefile(src, tmp)
+        if fcntl is None or not sys.platform.startswith("linux"):
+            return False
+
+        try:
+            with open(src, "rb") as s, open(tmp, "wb") as d:
+                fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return False
+
+        shutil.copystat(src, tmp)
+        return True
+
+    @staticmethod
+    def _clonefile(src: pathlib.Path, tmp: pathlib.Path) -> bool:
+        try:
+            import ctypes
+
+            libc = ctypes.CDLL("libc.dylib", use_errno=True)
+            # clonefile() also copies mode and timestamps
+            return libc.clonefile(os.fsencode(src), os.fsencode(tmp), 0) == 0
+        except (OSError, AttributeError):
+            return False
+
+    def _replace(self, tmp: pathlib.Path, dst: pathlib.Path) -> None:
+        for _ in range(self.LOCK_RETRIES):
+            try:
+                os.replace(tmp, dst)
+                return
+            except PermissionError:
+                time.sleep(0.25)
+        os.replace(tmp, dst)
+
+    # --- Helpers ---
+
+    def _digest(self, path: pathlib.Path) -> Optional[str]:
+        digest = hashlib.sha256()
+        try:
+            with open(path, "rb") as stream:
+                for chunk in iter(lambda: stream.read(self.HASH_CHUNK), b""):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def _record(self, placement: Placement) -> Placement:
+        with self._lock:
+            self.stats[placement.method] += 1
+            self.bytes_saved += placement.bytes_saved
+            if placement.method == "copy":
+                self.bytes_copied += placement.size
+        return placement
@@ -0,0 +1,185 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+Warm starts for worlds that are already provisioned.
+
+`servers/<world>/.nhost-ready.json` is written once a server has booted
+("Done (") from a fully provisioned world. It holds the launch command and
+what that command depends on: the server jar (SHA-256 plus size/mtime), the
+Java binary, the classpath and CDS archive named on the command line, and
+every jar in `plugins/` together with the plugin manifest.
+
+Quick Start checks the stamp with a handful of `stat` calls. While it holds,
+`WarmServer` spawns the JVM from the recorded command without importing the
+provisioning code, opening a network session or rewriting any file. When
+anything changed, the normal provisioning path runs instead and writes a
+fresh stamp on the next boot; a warm run that exits with an error drops the
+stamp for the same reason.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from utility.ConsolePipeline import ConsolePipeline
+from utility.Supervisor import Supervisor
+
+
+class ReadyStamp:
+    FILE_NAME = ".nhost-ready.json"
+    FORMAT = 1
+    HASH_CHUNK = 1024 * 1024  # 1 MB
+
+    def __init__(self, world_dir: os.PathLike | str) -> None:
+        self.world_dir = pathlib.Path(world_dir)
+        self.path = self.world_dir / self.FILE_NAME
+
+    def check(self) -> Optional[List[str]]:
+        """The recorded command if everything it depends on is unchanged, else None."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if data.get("format") != self.FORMAT:
+            return None
+
+        for path, signature in data["files"].items():
+            if self._stat(path) != signature:
+                return None
+        if not all(os.path.exists(path) for path in data["exists"]):
+            return None
+        if self._plugins() != data["plugins"]:
+            return None
+        return data["command"]
+
+    def write(self, command: Sequence[str], jar: os.PathLike | str, **extra: Any) -> None:
+        """
+        Record `command` (without per-run arguments such as --port) as ready.
+        `jar` is the world's server jar; `extra` is stored as-is.
+        """
+        jar = self._resolve(jar)
+        files = {str(self._resolve(command[0])): None, str(jar): None}
+        exists: List[str] = []
+
+        for i, arg in enumerate(command):
+            if arg in ("-cp", "-classpath") and i + 1 < len(command):
+                exists.extend(str(self._resolve(p)) for p in command[i + 1].split(os.pathsep) if p)
+            elif arg.startswith("-XX:SharedArchiveFile=") and "-XX:+AutoCreateSharedArchive" not in command:
+                # An auto-created archive may not be dumped until the JVM exits
+                exists.append(str(self._resolve(arg.split("=", 1)[1])))
+
+        for path in files:
+            files[path] = self._stat(path)
+
+        data = {
+            "format": self.FORMAT,
+            "created": time.time(),
+            "command": list(command),
+            "jar_sha256": self._digest(jar),
+            "files": files,
+            "exists": exists,
+            "plugins": self._plugins(),
+            **extra,
+        }
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def load(self) -> Dict[str, Any]:
+        return json.loads(self.path.read_text(encoding="utf-8"))
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+    # --- Helpers ---
+
+    def _plugins(self) -> Dict[str, Optional[List[int]]]:
+        """Size and mtime of every top-level file in plugins/ (jars and manifest)."""
+        plugins = self.world_dir / "plugins"
+        try:
+            entries = list(os.scandir(plugins))
+        except OSError:
+            return {}
+        return {
+            entry.name: self._stat(entry.path)
+            for entry in entries
+            if entry.is_file() and (entry.name.endswith(".jar") or entry.name.startswith(".nhost"))
+        }
+
+    def _resolve(self, path: os.PathLike | str) -> pathlib.Path:
+        # The JVM runs with the world folder as its working directory
+        path = pathlib.Path(path)
+        return path if path.is_absolute() else (self.world_dir / path).absolute()
+
+    @staticmethod
+    def _stat(path: os.PathLike | str) -> Optional[List[int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_size, st.st_mtime_ns]
+
+    def _digest(self, path: pathlib.Path) -> Optional[str]:
+        h = hashlib.sha256()
+        try:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(self.HASH_CHUNK), b""):
+                    h.update(block)
+        except OSError:
+            return None
+        return h.hexdigest()
+
+
+class WarmServer:
+    """
+    The part of MinecraftServer the Supervisor needs, launched from a valid
+    ReadyStamp. Nothing is resolved, downloaded or rewritten.
+    """
+
+    def __init__(self, world_dir: os.PathLike | str, stamp: ReadyStamp, command: List[str], config: dict) -> None:
+        self.world_dir = pathlib.Path(world_dir)
+        self.stamp = stamp
+        self.command = command
+        self.config = config
+        self.process = None
+        self.console: Optional[ConsolePipeline] = None
+        self._snapshots = None
+
+    @property
+    def snapshots(self):
+        """Imported on first use; only `:snapshot` needs it."""
+        if self._snapshots is None:
+            from utility.WorldSnapshot import SnapshotStore
+
+            root = self.stamp.load().get("snapshots") or pathlib.Path("snapshots") / self.world_dir.name
+            self._snapshots = SnapshotStore(root, self.world_dir)
+        return self._snapshots
+
+    def build_command(self, extra_args: Sequence[str] = ()) -> List[str]:
+        for arg in self.command:
+            if arg.startswith("-XX:SharedArchiveFile="):
+                # mtime doubles as "last used" for CDSCache.prune()
+                try:
+                    os.utime(arg.split("=", 1)[1])
+                except OSError:
+                    pass
+        return self.command + list(extra_args)
+
+    def after_exit(self, exit_code: int) -> None:
+        """A failed warm run re-provisions next time."""
+        if exit_code != 0:
+            self.stamp.clear()
+
+    def start(self) -> None:
+        supervisor = Supervisor(metrics_port=self.config.get("metrics_port"))
+        supervisor.add(self, assign_port=False)
+        try:
+            supervisor.run()
+        except KeyboardInterrupt:
+            # serve() already sent "stop" and waited for the world to save
+            pass
@@ -0,0 +1,249 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+Live server metrics parsed from console output, served in Prometheus format.
+
+`LogEventParser` is a `ConsolePipeline` listener that recognizes:
+
+    Done (12.345s)! For help, type "help"          startup time
+    Can't keep up! ... Running 2500ms or 50 ticks behind    lag warnings
+    <player> joined the game / left the game       player counts
+    [Chunky] Task running ... Processed: N chunks (x%) ... Rate: y cps
+
+and feeds a `MetricsRegistry`. `MetricsServer` exposes the registry on
+`http://127.0.0.1:<port>/metrics`, so lag can be alerted on across worlds
+without anything installed inside the JVM.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Metric:
+    def __init__(self, name: str, help_text: str, kind: str) -> None:
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+
+    @staticmethod
+    def _labels(labels: Dict[str, str]) -> Labels:
+        return tuple(sorted(labels.items()))
+
+    @staticmethod
+    def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(labels) + ([extra] if extra else [])
+        if not pairs:
+            return ""
+        body = ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+        return "{" + body + "}"
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    def __init__(self, name: str, help_text: str) -> None:
+        super().__init__(name, help_text, "counter")
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._labels(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{self._format_labels(k)} {v}" for k, v in self._values.items()
+        ]
+
+
+class Gauge(_Metric):
+    def __init__(self, name: str, help_text: str) -> None:
+        super().__init__(name, help_text, "gauge")
+        self._values: Dict[Labels, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._labels(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._labels(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._labels(labels), 0)
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{self._format_labels(k)} {v}" for k, v in self._values.items()
+        ]
+
+
+class Histogram(_Metric):
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float]) -> None:
+        super().__init__(name, help_text, "histogram")
+        self.buckets = sorted(buckets)
+        # labels -> (per-bucket counts, sum, count)
+        self._values: Dict[Labels, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._labels(labels)
+        counts, total, count = self._values.get(key, ([0] * len(self.buckets), 0.0, 0))
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(counts):
+            counts[index] += 1
+        self._values[key] = (counts, total + value, count + 1)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{self._format_labels(key, ('le', str(bound)))} {cumulative}")
+            lines.append(f"{self.name}_bucket{self._format_labels(key, ('le', '+Inf'))} {count}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {total}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """The metric set NHostAPI exports, shared by every supervised world."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.startup_seconds = Gauge("nhost_startup_seconds", "Time the server reported until Done")
+        self.startup_histogram = Histogram(
+            "nhost_startup_duration_seconds", "Reported startup times",
+            [5, 10, 20, 30, 60, 120, 300],
+        )
+        self.lag_warnings = Counter("nhost_lag_warnings_total", "Can't keep up! warnings")
+        self.lag_ticks = Counter("nhost_lag_ticks_behind_total", "Ticks skipped according to lag warnings")
+        self.lag_ms = Histogram(
+            "nhost_lag_behind_milliseconds", "Time behind per lag warning",
+            [500, 1000, 2000, 5000, 10000, 30000, 60000],
+        )
+        self.players_online = Gauge("nhost_players_online", "Players currently online")
+        self.player_joins = Counter("nhost_player_joins_total", "Player joins")
+        self.player_leaves = Counter("nhost_player_leaves_total", "Player leaves")
+        self.chunky_percent = Gauge("nhost_chunky_progress_percent", "Chunky pregeneration progress")
+        self.chunky_chunks = Gauge("nhost_chunky_chunks_processed", "Chunks processed by the current Chunky task")
+        self.chunky_rate = Gauge("nhost_chunky_chunks_per_second", "Chunky generation rate")
+        self.console_lines = Counter("nhost_console_lines_total", "Console lines read from the server")
+        self.last_event = Gauge("nhost_last_console_line_timestamp_seconds", "Unix time of the last console line")
+
+    @property
+    def metrics(self) -> List[_Metric]:
+        return [m for m in vars(self).values() if isinstance(m, _Metric)]
+
+    def render(self) -> str:
+        with self._lock:
+            lines: List[str] = []
+            for metric in self.metrics:
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class LogEventParser:
+    DONE = re.compile(r"Done \((\d+(?:\.\d+)?)s\)!")
+    LAG = re.compile(r"Can't keep up!.*?Running (\d+)ms or (\d+) ticks behind")
+    JOIN = re.compile(r"\]: ([A-Za-z0-9_]{1,16}) joined the game$")
+    LEAVE = re.compile(r"\]: ([A-Za-z0-9_]{1,16}) left the game$")
+    CHUNKY = re.compile(
+        r"\[Chunky\] Task (?:running|finished) for \S+?\.? Processed: (\d+) chunks \((\d+(?:\.\d+)?)%\)"
+        r"(?:.*?Rate: (\d+(?:\.\d+)?) cps)?"
+    )
+
+    def __init__(self, registry: MetricsRegistry, world: str) -> None:
+        self.registry = registry
+        self.world = world
+
+    def __call__(self, lines: List[str]) -> None:
+        r, world = self.registry, self.world
+        with r._lock:
+            r.console_lines.inc(len(lines), world=world)
+            r.last_event.set(time.time(), world=world)
+
+            for line in lines:
+                # Cheap substring checks first; most lines match nothing
+                if "Done (" in line:
+                    m = self.DONE.search(line)
+                    if m:
+                        seconds = float(m.group(1))
+                        r.startup_seconds.set(seconds, world=world)
+                        r.startup_histogram.observe(seconds, world=world)
+                        r.players_online.set(0, world=world)
+                elif "Can't keep up!" in line:
+                    m = self.LAG.search(line)
+                    r.lag_warnings.inc(world=world)
+                    if m:
+                        r.lag_ticks.inc(int(m.group(2)), world=world)
+                        r.lag_ms.observe(int(m.group(1)), world=world)
+                elif "the game" in line:
+                    # Anchored to a bare username so chat like "<x> y joined the game" is not counted
+                    line = line.rstrip()
+                    if self.JOIN.search(line):
+                        r.player_joins.inc(world=world)
+                        r.players_online.inc(world=world)
+                    elif self.LEAVE.search(line):
+                        r.player_leaves.inc(world=world)
+                        r.players_online.set(max(0, r.players_online.get(world=world) - 1), world=world)
+                elif "[Chunky]" in line:
+                    m = self.CHUNKY.search(line)
+                    if m:
+                        r.chunky_chunks.set(int(m.group(1)), world=world)
+                        r.chunky_percent.set(float(m.group(2)), world=world)
+                        if m.group(3):
+                            r.chunky_rate.set(float(m.group(3)), world=world)
+
+
+class MetricsServer:
+    """Minimal asyncio HTTP endpoint serving `registry.render()` at /metrics."""
+
+    def __init__(self, registry: MetricsRegistry, port: int = 9225, host: str = "127.0.0.1") -> None:
+        self.registry = registry
+        self.port = port
+        self.host = host
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        print(f"📈 Metrics on http://{self.host}:{self.port}/metrics")
+
+    async def close(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readline(), 5)
+            while (await asyncio.wait_for(reader.readline(), 5)) not in (b"\r\n", b"\n", b""):
+                pass
+
+            parts = request.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, body = "200 OK", self.registry.render().encode()
+                ctype = "text/plain; version=0.0.4; charset=utf-8"
+            else:
+                status, body, ctype = "404 Not Found", b"not found\n", "text/plain"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {ctype}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
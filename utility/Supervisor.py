@@ -0,0 +1,377 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+Run several Minecraft servers from one Python process.
+
+One asyncio loop owns every Java process: their output is multiplexed onto
+the terminal with a `[world]` prefix, and console input is routed by a small
+command language:
+
+    <command>            send to the current target server
+    @<world> <command>   send to one server
+    @all <command>       send to every running server
+    :use <world>         change the current target
+    :list                show servers, ports and state
+    :snapshot <world|all> take a live world snapshot
+    :stopall             stop everything and exit
+
+Ports are handed out by `PortAllocator`, so worlds never fight over 25565
+or Geyser's 19132. Each server's output runs through a `ConsolePipeline`
+(ring buffer, rotating log under `.logs/servers/<world>/`, subscribers)
+and a `LogEventParser`, whose metrics are served in Prometheus format when
+`metrics_port` is set.
+"""
+from __future__ import annotations
+
+import asyncio
+import pathlib
+import socket
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from utility.ConsolePipeline import ConsolePipeline, Subscription
+from utility.ServerMetrics import LogEventParser, MetricsRegistry, MetricsServer
+from utility.Trace import TRACER
+
+LOG_DIR = pathlib.Path(".logs") / "servers"
+
+
+class PortAllocator:
+    """Hands out free Java (TCP) and Bedrock (UDP) ports, never the same twice."""
+
+    def __init__(self, java_base: int = 25565, bedrock_base: int = 19132, *, host: str = "0.0.0.0") -> None:
+        self.java_base = java_base
+        self.bedrock_base = bedrock_base
+        self.host = host
+        self._taken: Set[int] = set()
+
+    def allocate(self, config: dict) -> dict:
+        """
+        Fill `port`, `java_port` and `bedrock_port` in `config` with free
+        ports. Geyser's remote port follows the Java port.
+        """
+        port = self._next(config.get("port", self.java_base), socket.SOCK_STREAM)
+        bedrock = self._next(config.get("bedrock_port", self.bedrock_base), socket.SOCK_DGRAM)
+        config.update({"port": port, "java_port": port, "bedrock_port": bedrock})
+        return config
+
+    def release(self, *ports: int) -> None:
+        self._taken.difference_update(ports)
+
+    def _next(self, start: int, kind: int) -> int:
+        port = start
+        while port < 65536:
+            if port not in self._taken and self._is_free(port, kind):
+                self._taken.add(port)
+                return port
+            port += 1
+        raise RuntimeError(f"No free port at or above {start}")
+
+    def _is_free(self, port: int, kind: int) -> bool:
+        with socket.socket(socket.AF_INET, kind) as probe:
+            try:
+                probe.bind((self.host, port))
+            except OSError:
+                return False
+        return True
+
+
+@dataclass
+class SupervisedServer:
+    name: str
+    server: object  # MinecraftServer
+    command: List[str]
+    console: ConsolePipeline
+    process: Optional[asyncio.subprocess.Process] = None
+    pump: Optional[asyncio.Task] = field(default=None, repr=False)
+    echo: Optional[asyncio.Task] = field(default=None, repr=False)
+    snapshotting: bool = False
+
+    @property
+    def running(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+
+class Supervisor:
+    STOP_TIMEOUT = 60  # seconds a server gets to save and exit after "stop"
+    ECHO_BUFFER = 10000  # lines held for a slow terminal before the oldest are dropped
+    ECHO_DRAIN_TIMEOUT = 5  # seconds to finish echoing after a server exits
+
+    def __init__(self, ports: Optional[PortAllocator] = None, *, metrics_port: Optional[int] = None) -> None:
+        self.ports = ports or PortAllocator()
+        self.metrics = MetricsRegistry()
+        self.metrics_port = metrics_port
+        self.servers: Dict[str, SupervisedServer] = {}
+        self.target: Optional[str] = None
+        self._input: Optional[asyncio.Queue] = None
+        self._booting: Dict[str, object] = {}  # name -> open "jvm.boot" span
+        # One writer thread keeps terminal output ordered and off the event loop
+        self._terminal = ThreadPoolExecutor(max_workers=1, thread_name_prefix="echo")
+
+    # --- Setup ---
+
+    def allocate(self, config: dict) -> dict:
+        """Assign ports to a world config before its MinecraftServer is built."""
+        return self.ports.allocate(config)
+
+    def add(self, server, *, assign_port: bool = True) -> None:
+        """
+        Register a provisioned MinecraftServer. With `assign_port` its Java
+        port (from `allocate`) is passed to the server as --port.
+        """
+        name = str(server.config["world_name"])
+        if name in self.servers:
+            raise ValueError(f"{name} is already supervised")
+
+        # The --port flag overrides server-port without rewriting server.properties
+        extra = ["--port", str(server.config["port"])] if assign_port else []
+        command = server.build_command(extra)
+
+        console = ConsolePipeline(name, log_path=LOG_DIR / name / "console.log")
+        console.add_listener(LogEventParser(self.metrics, name))
+        server.console = console
+        self.servers[name] = SupervisedServer(name, server, command, console)
+        self.target = self.target or name
+
+    # --- Running ---
+
+    def run(self) -> None:
+        asyncio.run(self.serve())
+
+    async def serve(self) -> None:
+        """Start every server and route console input until all have exited."""
+        self._input = asyncio.Queue()
+        self._start_stdin_reader(asyncio.get_running_loop())
+
+        endpoint = None
+        if self.metrics_port:
+            endpoint = MetricsServer(self.metrics, self.metrics_port)
+            await endpoint.start()
+
+        for entry in self.servers.values():
+            await self._launch(entry)
+
+        console = asyncio.create_task(self._console())
+        try:
+            await asyncio.gather(*(entry.pump for entry in self.servers.values()))
+        except asyncio.CancelledError:
+            await self.stop_all()
+            raise
+        finally:
+            console.cancel()
+            if endpoint:
+                await endpoint.close()
+
+        print("✔ All servers stopped")
+
+    async def _launch(self, entry: SupervisedServer) -> None:
+        with TRACER.span("jvm.spawn", world=entry.name):
+            entry.process = await asyncio.create_subprocess_exec(
+                *entry.command,
+                cwd=str(entry.server.world_dir),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+            )
+        entry.server.process = entry.process
+        print(f"▶ {entry.name} started (pid {entry.process.pid}{self._ports_label(entry)})")
+
+        entry.echo = asyncio.create_task(self._echo(entry, entry.console.subscribe(self.ECHO_BUFFER)))
+        self._watch_boot(entry)
+        entry.pump = asyncio.create_task(self._pump(entry))
+
+        interval = entry.server.config.get("snapshot_interval")
+        if interval:
+            asyncio.create_task(self._snapshot_every(entry, int(interval)))
+
+    async def _echo(self, entry: SupervisedServer, lines: Subscription) -> None:
+        """
+        Copy the console to the terminal. Lines come from a bounded
+        subscription and are written on the terminal thread, so a slow or
+        blocked terminal loses lines instead of stalling the reader.
+        """
+        # A lone server prints its console as-is, like a plain `java -jar`
+        prefix = f"[{entry.name}] " if len(self.servers) > 1 else ""
+        loop = asyncio.get_running_loop()
+        dropped = 0
+
+        def _write(text: str) -> None:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+        while True:
+            batch = [await lines.get()] + lines.drain()
+            ended = None in batch
+            text = "".join(f"{prefix}{line}\n" for line in batch if line is not None)
+            if lines.dropped > dropped:
+                text = f"{prefix}... {lines.dropped - dropped} console lines not shown\n" + text
+                dropped = lines.dropped
+            if text:
+                await loop.run_in_executor(self._terminal, _write, text)
+            if ended:
+                return
+
+    def _watch_boot(self, entry: SupervisedServer) -> None:
+        """
+        Wait for "Done (" from `entry`: ends its boot trace (flushed once all
+        have booted) and runs the server's `on_ready` hook on a worker thread.
+        """
+        on_ready = getattr(entry.server, "on_ready", None)
+        if TRACER.enabled:
+            self._booting[entry.name] = TRACER.span("jvm.boot", world=entry.name)
+        elif on_ready is None:
+            return
+
+        def _listen(lines: List[str]) -> None:
+            if any("Done (" in line for line in lines):
+                entry.console.remove_listener(_listen)
+                self._boot_finished(entry.name)
+                if on_ready:
+                    asyncio.get_running_loop().run_in_executor(None, on_ready)
+
+        entry.console.add_listener(_listen)
+
+    def _boot_finished(self, name: str, error: Optional[str] = None) -> None:
+        span = self._booting.pop(name, None)
+        if span is None:
+            return
+        if error:
+            span.set(error=error)
+        span.end()
+        if not self._booting:
+            TRACER.flush()
+
+    async def _pump(self, entry: SupervisedServer) -> None:
+        await entry.console.run(entry.process.stdout)
+        try:
+            # Let the tail of the output reach the terminal, unless it is stuck
+            await asyncio.wait_for(asyncio.shield(entry.echo), self.ECHO_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+
+        code = await entry.process.wait()
+        self._boot_finished(entry.name, error=f"exited with code {code}")
+        after_exit = getattr(entry.server, "after_exit", None)
+        if after_exit:
+            after_exit(code)
+        cfg = entry.server.config
+        self.ports.release(*(cfg[k] for k in ("port", "bedrock_port") if k in cfg))
+        print(f"■ {entry.name} exited with code {code}")
+
+    @staticmethod
+    def _ports_label(entry: SupervisedServer) -> str:
+        cfg = entry.server.config
+        return f", java {cfg.get('port', 25565)}, bedrock {cfg.get('bedrock_port', 19132)}"
+
+    # --- Snapshots ---
+
+    async def snapshot(self, name: str, label: str = "") -> None:
+        """Live snapshot of one server (save-off, freeze changed files, save-on)."""
+        entry = self.servers[name]
+        store = getattr(entry.server, "snapshots", None)
+        if store is None or not entry.running or entry.snapshotting:
+            print(f"⚠ Cannot snapshot {name} right now")
+            return
+
+        entry.snapshotting = True
+        try:
+            report = await store.snapshot_live(
+                lambda command: self.send(name, command), entry.console, label=label
+            )
+            keep = int(entry.server.config.get("snapshot_keep", 24))
+            await asyncio.get_running_loop().run_in_executor(None, store.prune, keep)
+            print(f"📸 {name}: snapshot {report['id']} | {report['changed']}/{report['files']} files changed, "
+                  f"{report['new_bytes'] / 1024 / 1024:.1f} MB new, saving paused {report['save_off_seconds']}s")
+        except Exception as e:
+            print(f"⚠ Snapshot of {name} failed: {e}")
+        finally:
+            entry.snapshotting = False
+
+    async def _snapshot_every(self, entry: SupervisedServer, interval: int) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            if not entry.running:
+                return
+            await self.snapshot(entry.name, label="scheduled")
+
+    # --- Console routing ---
+
+    def _start_stdin_reader(self, loop: asyncio.AbstractEventLoop) -> None:
+        # A daemon thread, so a blocked readline() never holds up shutdown
+        # (connect_read_pipe does not work on Windows consoles)
+        def _reader() -> None:
+            for line in sys.stdin:
+                loop.call_soon_threadsafe(self._input.put_nowait, line.rstrip("\r\n"))
+            loop.call_soon_threadsafe(self._input.put_nowait, None)
+
+        threading.Thread(target=_reader, daemon=True).start()
+
+    async def _console(self) -> None:
+        while True:
+            line = await self._input.get()
+            if line is None:  # EOF on stdin
+                await self.stop_all()
+                return
+            if line.strip():
+                await self.route(line)
+
+    async def route(self, line: str) -> None:
+        line = line.strip()
+
+        if line.startswith(":"):
+            verb, _, arg = line[1:].partition(" ")
+            if verb == "list":
+                self._print_list()
+            elif verb == "use" and arg in self.servers:
+                self.target = arg
+                print(f"→ Console target: {arg}")
+            elif verb == "stopall":
+                await self.stop_all()
+            elif verb == "snapshot" and (arg in self.servers or arg == "all"):
+                for name in (list(self.servers) if arg == "all" else [arg]):
+                    asyncio.create_task(self.snapshot(name))
+            else:
+                print(f"⚠ Unknown supervisor command: {line}")
+            return
+
+        if line.startswith("@"):
+            name, _, command = line[1:].partition(" ")
+            targets = list(self.servers) if name == "all" else [name]
+        else:
+            command, targets = line, [self.target]
+
+        for name in targets:
+            if name not in self.servers:
+                print(f"⚠ No server named {name}")
+                continue
+            await self.send(name, command)
+
+    async def send(self, name: str, command: str) -> None:
+        entry = self.servers[name]
+        if not entry.running or entry.process.stdin is None:
+            print(f"⚠ {name} is not running")
+            return
+        entry.process.stdin.write((command + "\n").encode())
+        await entry.process.stdin.drain()
+
+    async def stop_all(self) -> None:
+        running = [entry for entry in self.servers.values() if entry.running]
+        for entry in running:
+            await self.send(entry.name, "stop")
+
+        for entry in running:
+            try:
+                await asyncio.wait_for(entry.process.wait(), self.STOP_TIMEOUT)
+            except asyncio.TimeoutError:
+                print(f"⚠ {entry.name} did not stop in {self.STOP_TIMEOUT}s, killing it")
+                entry.process.kill()
+
+    def _print_list(self) -> None:
+        for entry in self.servers.values():
+            state = "running" if entry.running else "stopped"
+            marker = "*" if entry.name == self.target else " "
+            print(f" {marker} {entry.name:<20} {state:<8}{self._ports_label(entry)}")
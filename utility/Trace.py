@@ -0,0 +1,223 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+Phase-level tracing for provisioning and boot.
+
+    with TRACER.span("ensure_java", java=21) as s:
+        ...
+        s.set(cache="miss", bytes=n)
+
+    @traced("install_plugins")
+    def install_plugins(...): ...
+
+Spans carry free-form attributes; two are understood by the summary:
+`bytes` (transferred or written) and `cache` ("hit", "miss" or
+"revalidated"). `TRACER.annotate(...)` sets them on the innermost span
+opened with `with` or `@traced` in the current thread or task. Tracing is off until `TRACER.enable()`, and then costs one
+`perf_counter_ns` pair per span. `write_chrome` produces a trace-event file
+for chrome://tracing or Perfetto, `summary` a plain table, and `flush` both
+(to the path given to `enable`).
+"""
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import os
+import pathlib
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("nhost_span", default=None)
+
+
+class Span:
+    __slots__ = ("tracer", "name", "attrs", "start_ns", "end_ns", "tid", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self.tid = threading.get_ident()
+        self._token = None
+
+    def set(self, **attrs: Any) -> "Span":
+        self.attrs.update(attrs)
+        return self
+
+    def add_bytes(self, count: int) -> None:
+        self.attrs["bytes"] = self.attrs.get("bytes", 0) + count
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.perf_counter_ns()
+            self.tracer._record(self)
+
+    @property
+    def seconds(self) -> float:
+        return ((self.end_ns or time.perf_counter_ns()) - self.start_ns) / 1e9
+
+    def __enter__(self) -> "Span":
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        if self._token is not None:
+            _current.reset(self._token)
+        self.end()
+
+
+class _NullSpan:
+    """Stand-in handed out while tracing is off."""
+
+    def set(self, **attrs: Any) -> "_NullSpan":
+        return self
+
+    def add_bytes(self, count: int) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.enabled = False
+        self.path: Optional[pathlib.Path] = None
+        self._lock = threading.Lock()
+        self._spans: List[Span] = []
+        self._origin_ns = time.perf_counter_ns()
+        self._summarized = False
+
+    def enable(self, path: Optional[os.PathLike | str] = None) -> None:
+        self.enabled = True
+        self.path = pathlib.Path(path) if path else None
+
+    def span(self, name: str, **attrs: Any):
+        """Start a span; use as a context manager or call `.end()` yourself."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, attrs)
+
+    def annotate(self, **attrs: Any) -> None:
+        """Set attributes on the innermost open span, if any."""
+        span = _current.get() if self.enabled else None
+        if span is not None:
+            span.set(**attrs)
+
+    def traced(
+        self,
+        name: Optional[str] = None,
+        *,
+        on_result: Optional[Callable[[Span, Any], None]] = None,
+    ) -> Callable[[F], F]:
+        """
+        Decorator form of `span`, named after the function by default.
+        `on_result(span, result)` can copy attributes off the return value.
+        """
+
+        def decorate(fn: F) -> F:
+            label = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with Span(self, label, {}) as span:
+                    result = fn(*args, **kwargs)
+                    if on_result is not None:
+                        on_result(span, result)
+                    return result
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorate
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return sorted(self._spans, key=lambda s: s.start_ns)
+
+    # --- Output ---
+
+    def flush(self) -> None:
+        """Rewrite the trace file; print the summary the first time."""
+        if not self.enabled or self.path is None:
+            return
+        self.write_chrome(self.path)
+        if not self._summarized:
+            self._summarized = True
+            print(f"\n{self.summary()}\n⏱ Trace written to {self.path}")
+
+    def write_chrome(self, path: os.PathLike | str) -> pathlib.Path:
+        """Write finished spans as Chrome trace-event JSON ("X" complete events)."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": s.name,
+                "cat": "nhost",
+                "ph": "X",
+                "ts": (s.start_ns - self._origin_ns) / 1000,
+                "dur": (s.end_ns - s.start_ns) / 1000,
+                "pid": pid,
+                "tid": s.tid,
+                "args": {k: v if isinstance(v, (int, float, bool)) else str(v) for k, v in s.attrs.items()},
+            }
+            for s in self.spans()
+        ]
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+    def summary(self) -> str:
+        """One row per span name, in order of first appearance."""
+        rows: Dict[str, Dict[str, Any]] = {}
+        for s in self.spans():
+            row = rows.setdefault(s.name, {"calls": 0, "total": 0.0, "max": 0.0, "bytes": 0, "hit": 0, "miss": 0})
+            ms = (s.end_ns - s.start_ns) / 1e6
+            row["calls"] += 1
+            row["total"] += ms
+            row["max"] = max(row["max"], ms)
+            row["bytes"] += int(s.attrs.get("bytes", 0) or 0)
+            cache = s.attrs.get("cache")
+            if cache == "miss":
+                row["miss"] += 1
+            elif cache in ("hit", "revalidated"):
+                row["hit"] += 1
+
+        width = max([len(name) for name in rows] + [5])
+        lines = [f"{'phase':<{width}}  {'calls':>5}  {'total ms':>10}  {'max ms':>10}  {'bytes':>12}  {'hit/miss':>8}"]
+        for name, row in rows.items():
+            cache = f"{row['hit']}/{row['miss']}" if row["hit"] or row["miss"] else "-"
+            lines.append(
+                f"{name:<{width}}  {row['calls']:>5}  {row['total']:>10.1f}  {row['max']:>10.1f}  "
+                f"{row['bytes'] or '-':>12}  {cache:>8}"
+            )
+        return "\n".join(lines)
+
+
+TRACER = Tracer()
+traced = TRACER.traced
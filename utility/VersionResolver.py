@@ -0,0 +1,397 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+One answer per Minecraft version: Java runtime, Paper build, and which
+release of each plugin is known to work with it.
+
+Compatibility is kept as version ranges, parsed once into an `IntervalIndex`
+(sorted range starts + bisect), so a lookup never re-parses version strings.
+Two sources are merged:
+
+    built-in   ranges shipped with NHostAPI (`JAVA_MC_RANGES`, `PLUGIN_COMPAT`)
+    upstream   Paper's per-version Java minimum (PaperMC Fill API) and the
+               game versions of plugin releases on Modrinth, cached in
+               `versions/compat_index.json` and refreshed once it is older
+               than `ttl`
+
+Only plugins listed in `PLUGIN_COMPAT` or the Modrinth project map are ever
+swapped; any other URL was pinned on purpose and is installed as given. A
+swapped release is installed under a file name carrying its own version.
+A plugin candidate is used only if its range covers the server version and
+its Java floor fits the chosen runtime. Upstream releases inherit the floor
+of the built-in release from the same major line (ViaVersion 5.x needs 17),
+so an old server is never handed a jar its JVM cannot load.
+"""
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import pathlib
+import re
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass, field
+from typing import Any, Dict, Generic, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+from utility.Trace import traced
+
+T = TypeVar("T")
+
+VersionKey = Tuple[int, ...]
+
+_VERSION = re.compile(r"(\d+(?:\.\d+){0,2})(?:-(pre|rc)(\d+))?")
+_STAGES = {"pre": -2, "rc": -1}
+_MODRINTH_CDN = re.compile(r"https://cdn\.modrinth\.com/data/(\w+)/versions/(\w+)/")
+
+
+class ResolverError(RuntimeError):
+    pass
+
+
+def version_key(version: str) -> VersionKey:
+    """
+    Sortable key for a Minecraft release, so that
+    "1.21-pre1" < "1.21-rc1" < "1.21" < "1.21.1" < "1.21.10" < "26.1".
+    Snapshots such as "24w14a" are not releases and raise ValueError.
+    """
+    match = _VERSION.fullmatch(version.strip())
+    if not match:
+        raise ValueError(f"Not a Minecraft release version: {version!r}")
+    numbers = [int(part) for part in match.group(1).split(".")]
+    numbers += [0] * (3 - len(numbers))
+    return (*numbers, _STAGES.get(match.group(2), 0), int(match.group(3) or 0))
+
+
+class IntervalIndex(Generic[T]):
+    """
+    Closed version ranges mapped to values. `None` bounds are open-ended.
+    `matches` returns every value whose range covers a version, in the
+    order the ranges were given (so callers can list preferred ones first).
+    """
+
+    def __init__(self, ranges: Iterable[Tuple[Optional[str], Optional[str], T]]) -> None:
+        low = (0,)
+        items = []
+        for order, (start, end, value) in enumerate(ranges):
+            items.append((
+                version_key(start) if start else low,
+                version_key(end) if end else None,
+                order,
+                value,
+            ))
+        items.sort(key=lambda item: item[0])
+        self._starts = [item[0] for item in items]
+        self._items = items
+        self._ends = [item[1] for item in items]
+
+    def matches(self, version: str | VersionKey) -> List[T]:
+        key = version_key(version) if isinstance(version, str) else version
+        candidates = self._items[:bisect.bisect_right(self._starts, key)]
+        covering = [item for item in candidates if item[1] is None or key <= item[1]]
+        return [item[3] for item in sorted(covering, key=lambda item: item[2])]
+
+    def get(self, version: str | VersionKey) -> Optional[T]:
+        found = self.matches(version)
+        return found[0] if found else None
+
+    def highest_end(self) -> Optional[VersionKey]:
+        ends = [end for end in self._ends if end is not None]
+        return max(ends) if ends else None
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+
+@dataclass
+class Resolution:
+    mc_version: str
+    java: int
+    paper_build: Optional[int] = None
+    plugins: List[Tuple[str, str]] = field(default_factory=list)  # (file name, url)
+    skipped: Dict[str, str] = field(default_factory=dict)  # file name -> reason
+
+
+class VersionResolver:
+    DEFAULT_TTL = 24 * 60 * 60
+    PAPER_VERSIONS_URL = "https://fill.papermc.io/v3/projects/paper/versions"
+    MODRINTH_API = "https://api.modrinth.com/v2"
+    MODRINTH_LOADERS = '["paper","spigot","bukkit"]'
+    MODRINTH_RELEASES = 40  # newest releases kept per plugin
+
+    def __init__(
+        self,
+        browser,
+        path: os.PathLike | str = "versions/compat_index.json",
+        *,
+        java_ranges: Sequence[Tuple[str, str, int]],
+        available_java: Iterable[int],
+        latest_java: int,
+        plugin_compat: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        modrinth_projects: Optional[Dict[str, str]] = None,
+        paper_index=None,
+        ttl: Optional[float] = DEFAULT_TTL,
+        offline: bool = False,
+    ) -> None:
+        self.browser = browser
+        self.path = pathlib.Path(path)
+        self.available_java = sorted(available_java)
+        self.latest_java = latest_java
+        self.plugin_compat = plugin_compat or {}
+        self.modrinth_projects = modrinth_projects or {}
+        self.paper_index = paper_index
+        self.ttl = ttl
+        self.offline = offline
+
+        self._builtin_java = IntervalIndex(java_ranges)
+        self._lock = threading.Lock()
+        self._data: Optional[Dict[str, Any]] = None
+        self._paper_java: IntervalIndex[int] = IntervalIndex([])
+        self._plugins: Dict[str, IntervalIndex[Dict[str, Any]]] = {}
+
+    # --- Queries ---
+
+    def java_for(self, mc_version: str) -> int:
+        """Java major to run `mc_version` with, always one we can install."""
+        self._ensure_index()
+        try:
+            key = version_key(mc_version)
+        except ValueError as e:
+            raise ResolverError(str(e)) from None
+
+        needed = [j for j in (self._builtin_java.get(key), self._paper_java.get(key)) if j]
+        if not needed:
+            known_end = max(
+                (end for end in (self._builtin_java.highest_end(), self._paper_java.highest_end()) if end),
+                default=None,
+            )
+            if known_end is None or key <= known_end:
+                raise ResolverError(f"Minecraft {mc_version} is not a known Paper release")
+            # Newer than anything we know about: newest runtime is the safe bet
+            needed = [self.latest_java]
+
+        minimum = max(needed)
+        for java in self.available_java:
+            if java >= minimum:
+                return java
+        raise ResolverError(f"Minecraft {mc_version} needs Java {minimum}, which is not downloadable")
+
+    def resolve(self, mc_version: str, plugins: Iterable[Tuple[str, str]] = ()) -> Resolution:
+        """
+        Runtime, Paper build and plugin downloads for `mc_version`. A
+        (file name, url) whose release does not fit is swapped for a
+        compatible one, renamed after that release's version; the plugin
+        lands in `skipped` when no release fits.
+        """
+        plugins = list(plugins)
+        java = self.java_for(mc_version)
+        result = Resolution(mc_version, java, paper_build=self._paper_build(mc_version))
+
+        for name, url in plugins:
+            if name not in self._plugins and name not in self.plugin_compat:
+                result.plugins.append((name, url))
+                continue
+            pick = self._pick(mc_version, java, name, url)
+            if pick is None:
+                result.skipped[name] = f"no release known to work on {mc_version} with Java {java}"
+            elif pick["url"] == url:
+                result.plugins.append((name, url))
+            else:
+                result.plugins.append((self._release_name(name, pick), pick["url"]))
+        return result
+
+    @staticmethod
+    def _release_name(name: str, candidate: Dict[str, Any]) -> str:
+        """File name for a swapped-in release: "ViaVersion.jar" -> "ViaVersion-4.10.2.jar"."""
+        version = re.sub(r"[^\w.+-]", "_", str(candidate.get("version") or ""))
+        if version:
+            return f"{pathlib.PurePosixPath(name).stem}-{version}.jar"
+        file_name = urllib.parse.unquote(candidate["url"].rsplit("/", 1)[-1])
+        return file_name if file_name.endswith(".jar") and "/" not in file_name else name
+
+    def _pick(self, mc_version: str, java: int, name: str, url: str) -> Optional[Dict[str, Any]]:
+        self._ensure_index()
+        index = self._plugins.get(name)
+        if index is None:
+            return {"url": url}
+
+        fits = [
+            c for c in index.matches(mc_version)
+            if c.get("java") is None or c["java"] <= java
+        ]
+        known_urls = {c["url"] for c in self._all_candidates(name)}
+        if url and url not in known_urls:
+            # A URL we know nothing about (user override): trust it
+            return {"url": url}
+        for candidate in fits:
+            if candidate["url"] == url:
+                return candidate
+        return fits[0] if fits else None
+
+    def _paper_build(self, mc_version: str) -> Optional[int]:
+        if self.paper_index is None:
+            return None
+        try:
+            return self.paper_index.latest_build(mc_version)
+        except Exception:
+            return None
+
+    # --- Index ---
+
+    def refresh(self) -> None:
+        """Re-fetch upstream compatibility data now, keeping old data on failure."""
+        with self._lock:
+            self._data = self._fetch_upstream(self._load())
+            self._save()
+            self._build()
+
+    def _ensure_index(self) -> None:
+        with self._lock:
+            if self._data is not None:
+                return
+            data = self._load()
+            fetched = data.get("fetched")
+            stale = fetched is None or (self.ttl is not None and time.time() - fetched > self.ttl)
+            self._data = data
+            if stale and not self.offline:
+                self._data = self._fetch_upstream(data)
+                self._save()
+            self._build()
+
+    def _build(self) -> None:
+        data = self._data or {}
+        self._paper_java = IntervalIndex(tuple(r) for r in data.get("paper_java", []))
+
+        self._plugins = {}
+        # Upstream data for plugins no longer managed (older index files) is ignored
+        for name in set(self.plugin_compat) | set(self._modrinth_targets()):
+            self._plugins[name] = IntervalIndex(
+                (c.get("from"), c.get("to"), c) for c in self._all_candidates(name)
+            )
+
+    def _all_candidates(self, name: str) -> List[Dict[str, Any]]:
+        """Built-in candidates first, then upstream ones not already listed."""
+        builtin = list(self.plugin_compat.get(name, []))
+        upstream = (self._data or {}).get("plugins", {}).get(name, [])
+        by_url = {c["url"]: c for c in builtin}
+
+        merged = []
+        for candidate in builtin:
+            # Upstream knows the real game-version range of a pinned file
+            refined = next((u for u in upstream if u["url"] == candidate["url"]), None)
+            merged.append({**refined, **candidate} if refined else candidate)
+        for candidate in upstream:
+            if candidate["url"] not in by_url:
+                merged.append({**candidate, "java": self._java_floor(builtin, candidate)})
+        return merged
+
+    @staticmethod
+    def _java_floor(builtin: List[Dict[str, Any]], candidate: Dict[str, Any]) -> Optional[int]:
+        if candidate.get("java") is not None:
+            return candidate["java"]
+        line = str(candidate.get("version", "")).split(".")[0]
+        for known in builtin:
+            if known.get("java") is not None and str(known.get("version", "")).split(".")[0] == line:
+                return known["java"]
+        return None
+
+    # --- Upstream ---
+
+    @traced("resolver.refresh")
+    def _fetch_upstream(self, previous: Dict[str, Any]) -> Dict[str, Any]:
+        data = dict(previous)
+        self._data = data
+        failures = []
+
+        try:
+            data["paper_java"] = self._fetch_paper_java()
+        except Exception as e:
+            failures.append(f"PaperMC ({e})")
+
+        plugins = dict(data.get("plugins", {}))
+        for name, project in self._modrinth_targets().items():
+            try:
+                plugins[name] = self._fetch_modrinth(project)
+            except Exception as e:
+                failures.append(f"{name} ({e})")
+        data["plugins"] = plugins
+
+        if failures:
+            print(f"⚠ Compatibility data partly unavailable: {', '.join(failures)}")
+        data["fetched"] = time.time()
+        return data
+
+    def _fetch_paper_java(self) -> List[List[Any]]:
+        """Paper versions collapsed into [from, to, minimum Java] runs."""
+        payload = self.browser.get_json(self.PAPER_VERSIONS_URL)
+        found = []
+        for item in payload.get("versions", []):
+            info = item.get("version", item)
+            try:
+                key = version_key(info["id"])
+                minimum = int(info["java"]["version"]["minimum"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            found.append((key, info["id"], minimum))
+        found.sort()
+
+        runs: List[List[Any]] = []
+        for _, version, minimum in found:
+            if runs and runs[-1][2] == minimum:
+                runs[-1][1] = version
+            else:
+                runs.append([version, version, minimum])
+        return runs
+
+    def _modrinth_targets(self) -> Dict[str, str]:
+        """File name -> Modrinth project, from the explicit map and from CDN URLs."""
+        targets = dict(self.modrinth_projects)
+        for name, candidates in self.plugin_compat.items():
+            for candidate in candidates:
+                match = _MODRINTH_CDN.match(candidate["url"])
+                if match:
+                    targets.setdefault(name, match.group(1))
+        return targets
+
+    def _fetch_modrinth(self, project: str) -> List[Dict[str, Any]]:
+        releases = self.browser.get_json(
+            f"{self.MODRINTH_API}/project/{project}/version",
+            params={"loaders": self.MODRINTH_LOADERS},
+        )
+        candidates = []
+        for release in releases[:self.MODRINTH_RELEASES]:
+            if release.get("version_type", "release") != "release":
+                continue
+            keys = []
+            for game_version in release.get("game_versions", []):
+                try:
+                    keys.append((version_key(game_version), game_version))
+                except ValueError:
+                    continue
+            files = release.get("files", [])
+            primary = next((f for f in files if f.get("primary")), files[0] if files else None)
+            if not keys or primary is None:
+                continue
+            candidates.append({
+                "version": release.get("version_number", ""),
+                "url": primary["url"],
+                "from": min(keys)[1],
+                "to": max(keys)[1],
+            })
+        return candidates
+
+    # --- Cache ---
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self._data, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
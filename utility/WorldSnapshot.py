@@ -0,0 +1,303 @@
+#  NHostAPI - GitHub Repository Synchronization and API Tool
+#  Copyright (C) 2026 Nikhil Karmakar
+#  GNU GENERAL PUBLIC LICENSE v3
+"""
+Incremental, deduplicated snapshots of a world folder.
+
+Layout under `snapshots/<world>/`:
+    chunks/<aa>/<sha256>     compressed content pieces, shared by all snapshots
+    manifests/<id>.json      file list of one snapshot: stats + piece digests
+    .staging/                changed files frozen during the save-off window
+
+A live snapshot runs `save-off` and `save-all flush` on the server, waits
+for "Saved the game", freezes only the files whose size or mtime changed
+since the last snapshot (reflink where possible), and turns saving back on
+at once. The slow part (chunking, hashing, compressing) happens afterwards
+on a worker thread, so the JVM is never paused for it.
+
+Region files (`.mca`) are split on their own chunk-sector boundaries, so a
+Minecraft chunk that did not change dedupes even when its region file did.
+Everything else (level.dat, playerdata, data/*.dat) is gzipped NBT that
+changes as a whole, so it is cut into fixed-size pieces: no per-byte
+Python work, and the snapshot thread never starves the console reader.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+import struct
+import time
+import zlib
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from utility.Provisioner import Provisioner
+
+# Not part of the world: re-provisioned from caches, or runtime scratch
+EXCLUDED_DIRS = {"cache", "libraries", "versions", "logs", "crash-reports"}
+EXCLUDED_SUFFIXES = (".jar", ".provision", ".tmp")
+EXCLUDED_NAMES = {"session.lock"}
+
+PIECE_SIZE = 64 * 1024
+
+
+def fixed_pieces(data: bytes, size: int = PIECE_SIZE) -> Iterator[bytes]:
+    """Split `data` into `size`-byte pieces (the last one shorter)."""
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def region_pieces(data: bytes) -> Iterator[bytes]:
+    """
+    Split an Anvil region file on chunk boundaries: the 8 KB header, then
+    one piece per stored chunk (its sectors, padding included).
+    """
+    if len(data) < 8192:
+        yield from fixed_pieces(data)
+        return
+
+    starts = set()
+    for entry in struct.unpack(">1024I", data[:4096]):
+        sector = entry >> 8
+        if sector >= 2 and sector * 4096 < len(data):
+            starts.add(sector * 4096)
+
+    cuts = [8192] + sorted(starts) + [len(data)]
+    yield data[:8192]
+    for begin, end in zip(cuts, cuts[1:]):
+        if end > begin:
+            yield data[begin:end]
+
+
+class SnapshotStore:
+    SAVE_TIMEOUT = 120  # seconds to wait for "Saved the game"
+
+    def __init__(self, root: os.PathLike | str, source: os.PathLike | str, *, level: int = 6) -> None:
+        self.root = pathlib.Path(root)
+        self.source = pathlib.Path(source)
+        self.level = level
+        self.chunks_dir = self.root / "chunks"
+        self.manifests_dir = self.root / "manifests"
+        self.staging_dir = self.root / ".staging"
+        self._freezer = Provisioner(hardlink_names=())
+
+    # --- Listing ---
+
+    def list(self) -> List[str]:
+        """Snapshot ids, oldest first."""
+        return sorted((p.stem for p in self.manifests_dir.glob("*.json")), key=self._id_order)
+
+    @staticmethod
+    def _id_order(snapshot_id: str) -> Tuple[str, int]:
+        # "<timestamp>-<n>" for several in one second: "-10" comes after "-2"
+        stamp, _, suffix = snapshot_id.partition("-")
+        return stamp, int(suffix) if suffix.isdigit() else 1
+
+    def manifest(self, snapshot_id: str) -> Dict[str, Any]:
+        return json.loads((self.manifests_dir / f"{snapshot_id}.json").read_text(encoding="utf-8"))
+
+    # --- Taking snapshots ---
+
+    async def snapshot_live(
+        self,
+        send: Callable[[str], Awaitable[None]],
+        console,
+        *,
+        label: str = "",
+    ) -> Dict[str, Any]:
+        """
+        Snapshot a running server. `send` writes a console command and
+        `console` is its ConsolePipeline (used to wait for the save).
+        """
+        lines = console.subscribe(maxsize=10000)
+        paused = time.monotonic()
+        try:
+            await send("save-off")
+            await send("save-all flush")
+            await asyncio.wait_for(self._wait_saved(lines), self.SAVE_TIMEOUT)
+            # Only the freeze happens while saving is off
+            staged = await asyncio.get_running_loop().run_in_executor(None, self._freeze)
+        finally:
+            await send("save-on")
+            lines.close()
+        paused = time.monotonic() - paused
+
+        report = await asyncio.get_running_loop().run_in_executor(None, self._ingest, staged, label)
+        report["save_off_seconds"] = round(paused, 3)
+        return report
+
+    def snapshot(self, *, label: str = "") -> Dict[str, Any]:
+        """Snapshot a stopped world."""
+        return self._ingest(self._freeze(), label)
+
+    @staticmethod
+    async def _wait_saved(lines) -> None:
+        while True:
+            line = await lines.get()
+            if line is None:
+                raise RuntimeError("server exited before the save completed")
+            if "Saved the game" in line:
+                return
+
+    def _freeze(self) -> Dict[str, Any]:
+        """
+        Compare the world with the last manifest and copy changed files into
+        staging. Returns {"files": {rel: stat info}, "changed": [rel, ...]}.
+        """
+        previous = self._latest_manifest()
+        prev_files = previous["files"] if previous else {}
+
+        if self.staging_dir.exists():
+            shutil.rmtree(self.staging_dir)
+        self.staging_dir.mkdir(parents=True)
+
+        files: Dict[str, Dict[str, Any]] = {}
+        changed: List[str] = []
+        for path in self._world_files():
+            rel = path.relative_to(self.source).as_posix()
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            info = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "mode": st.st_mode & 0o777}
+            old = prev_files.get(rel)
+            if old and old["size"] == info["size"] and old["mtime_ns"] == info["mtime_ns"]:
+                info["pieces"] = old["pieces"]
+            else:
+                self._freezer.place(path, self.staging_dir / rel)
+                changed.append(rel)
+            files[rel] = info
+
+        return {"files": files, "changed": changed}
+
+    def _ingest(self, staged: Dict[str, Any], label: str) -> Dict[str, Any]:
+        started = time.monotonic()
+        files = staged["files"]
+        stored = new_bytes = 0
+
+        for rel in staged["changed"]:
+            data = (self.staging_dir / rel).read_bytes()
+            splitter = region_pieces if rel.endswith(".mca") else fixed_pieces
+            pieces = []
+            for piece in splitter(data):
+                digest, written = self._store_piece(piece)
+                pieces.append([digest, len(piece)])
+                stored += 1
+                new_bytes += written
+            files[rel]["pieces"] = pieces
+
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+        snapshot_id = time.strftime("%Y%m%dT%H%M%S")
+        existing = set(self.list())
+        suffix = 1
+        while snapshot_id in existing:
+            suffix += 1
+            snapshot_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{suffix}"
+
+        manifest = {"id": snapshot_id, "created": time.time(), "label": label, "files": files}
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+        path = self.manifests_dir / f"{snapshot_id}.json"
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(tmp, path)
+
+        return {
+            "id": snapshot_id,
+            "files": len(files),
+            "changed": len(staged["changed"]),
+            "pieces": stored,
+            "new_bytes": new_bytes,
+            "world_bytes": sum(f["size"] for f in files.values()),
+            "seconds": round(time.monotonic() - started, 3),
+        }
+
+    def _store_piece(self, piece: bytes) -> Tuple[str, int]:
+        digest = hashlib.sha256(piece).hexdigest()
+        path = self.chunks_dir / digest[:2] / digest
+        if path.exists():
+            return digest, 0
+
+        packed = zlib.compress(piece, self.level)
+        # Region chunks are already zlib data; keep them raw if that is smaller
+        blob = b"\x01" + packed if len(packed) < len(piece) else b"\x00" + piece
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(blob)
+        os.replace(tmp, path)
+        return digest, len(blob)
+
+    def _load_piece(self, digest: str) -> bytes:
+        blob = (self.chunks_dir / digest[:2] / digest).read_bytes()
+        data = zlib.decompress(blob[1:]) if blob[:1] == b"\x01" else blob[1:]
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise RuntimeError(f"Snapshot piece {digest} is corrupted")
+        return data
+
+    # --- Restore & retention ---
+
+    def restore(self, snapshot_id: str, destination: Optional[os.PathLike | str] = None) -> int:
+        """
+        Rebuild the world exactly as captured: every file is rewritten through
+        a temporary name, and world files absent from the snapshot are
+        removed. The server must be stopped. Returns the number of files.
+        """
+        destination = pathlib.Path(destination or self.source)
+        manifest = self.manifest(snapshot_id)
+        files = manifest["files"]
+
+        if destination.exists():
+            for path in self._world_files(destination):
+                if path.relative_to(destination).as_posix() not in files:
+                    path.unlink()
+
+        for rel, info in files.items():
+            target = destination / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_name(target.name + ".restore")
+            with open(tmp, "wb") as out:
+                for digest, _ in info["pieces"]:
+                    out.write(self._load_piece(digest))
+            os.chmod(tmp, info.get("mode", 0o644))
+            os.utime(tmp, ns=(info["mtime_ns"], info["mtime_ns"]))
+            os.replace(tmp, target)
+
+        return len(files)
+
+    def prune(self, keep: int = 24) -> int:
+        """Keep the newest `keep` snapshots and drop unreferenced pieces; returns bytes freed."""
+        ids = self.list()
+        for old in ids[:-keep] if keep else ids:
+            (self.manifests_dir / f"{old}.json").unlink(missing_ok=True)
+
+        live = set()
+        for snapshot_id in self.list():
+            for info in self.manifest(snapshot_id)["files"].values():
+                live.update(digest for digest, _ in info["pieces"])
+
+        freed = 0
+        for path in self.chunks_dir.glob("*/*"):
+            if path.name not in live:
+                freed += path.stat().st_size
+                path.unlink()
+        return freed
+
+    # --- Helpers ---
+
+    def _latest_manifest(self) -> Optional[Dict[str, Any]]:
+        ids = self.list()
+        return self.manifest(ids[-1]) if ids else None
+
+    def _world_files(self, base: Optional[pathlib.Path] = None) -> Iterator[pathlib.Path]:
+        base = base or self.source
+        for dirpath, dirnames, filenames in os.walk(base):
+            if pathlib.Path(dirpath) == base:
+                dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+            for name in filenames:
+                if name in EXCLUDED_NAMES or name.endswith(EXCLUDED_SUFFIXES):
+                    continue
+                yield pathlib.Path(dirpath) / name